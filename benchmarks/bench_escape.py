@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for escape_latex.
+
+Compares the previous per-character implementation against the
+str.translate version in scripts/latex_escape.py, with and without the
+memo cache, over every string in the YAML data (repeated as a batch of
+variants x candidates would repeat it).
+
+Usage:
+    python3 benchmarks/bench_escape.py [--data-dir data/] [--repeat 200]
+"""
+
+import sys
+import timeit
+import argparse
+import yaml
+from pathlib import Path
+from typing import Any, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'scripts'))
+
+import latex_escape  # noqa: E402
+
+def escape_latex_legacy(text: Any) -> str:
+    """The original per-character dict lookup from generate.py."""
+    if not isinstance(text, str):
+        text = str(text)
+    chars = {
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+        '~': r'\textasciitilde{}',
+        '^': r'\^{}',
+        '\\': r'\textbackslash{}',
+    }
+    return ''.join(chars.get(c, c) for c in text)
+
+def collect_strings(node: Any, out: List[str]) -> List[str]:
+    """Collect every string leaf of the loaded YAML data."""
+    if isinstance(node, str):
+        out.append(node)
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            collect_strings(key, out)
+            collect_strings(value, out)
+    elif isinstance(node, list):
+        for value in node:
+            collect_strings(value, out)
+    return out
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark escape_latex implementations')
+    parser.add_argument('--data-dir', type=Path, default=ROOT_DIR / 'data', help='YAML data directory')
+    parser.add_argument('--repeat', type=int, default=200, help='Passes over the corpus per timing run')
+    args = parser.parse_args()
+
+    strings = []
+    for yaml_file in sorted(args.data_dir.glob('*.yaml')):
+        with open(yaml_file) as f:
+            collect_strings(yaml.safe_load(f), strings)
+    corpus_bytes = sum(len(s.encode('utf-8')) for s in strings)
+
+    # Sanity check: all implementations must agree
+    for s in strings:
+        expected = escape_latex_legacy(s)
+        assert latex_escape.escape_latex_uncached(s) == expected, s
+        assert latex_escape.escape_latex(s) == expected, s
+
+    candidates = {
+        'legacy (per-char join)': escape_latex_legacy,
+        'str.translate': latex_escape.escape_latex_uncached,
+        'str.translate + cache': latex_escape.escape_latex,
+    }
+
+    print(f"Corpus: {len(strings)} strings, {corpus_bytes} bytes, {args.repeat} passes")
+    print(f"{'implementation':28} {'seconds':>10} {'MB/s':>10} {'speedup':>9}")
+    baseline = None
+    for name, func in candidates.items():
+        def run(func=func):
+            for s in strings:
+                func(s)
+        seconds = min(timeit.repeat(run, number=args.repeat, repeat=5))
+        baseline = baseline or seconds
+        throughput = corpus_bytes * args.repeat / seconds / 1e6
+        print(f"{name:28} {seconds:10.4f} {throughput:10.2f} {baseline / seconds:8.1f}x")
+
+    info = latex_escape.cache_info()
+    print(f"\nCache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
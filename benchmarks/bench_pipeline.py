@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark over a synthetic candidate corpus.
+
+Writes a corpus with synth_corpus.py at the chosen scale, then times each
+stage over every candidate:
+
+    yaml.parse          load_yaml_data without the snapshot cache (parse + validate)
+    yaml.snapshot       load_data_dir served from a warm snapshot
+    latex.<variant>     each LaTeX generator (generate.GENERATORS)
+    ats.<variant>       generate_ats_cv
+    check.<variant>     run_checks, with the ATS text standing in for PDF text
+    compile.<variant>   pdflatex on --compile-samples documents (skipped without pdflatex)
+    pdf.text            get_pdf_text on the compiled PDFs
+
+Each stage runs --repeat times; the best run is compared per item against a
+stored baseline for the same scale, and stages slower by more than
+--threshold are flagged as regressions (exit status 1). Baselines live in
+.cache/bench/<scale>.json and are machine-specific: record one with
+--save-baseline before an optimisation, then rerun after it.
+
+Usage:
+    python3 benchmarks/bench_pipeline.py --scale small --save-baseline
+    python3 benchmarks/bench_pipeline.py --scale small
+    python3 benchmarks/bench_pipeline.py --scale deep --stages latex,ats --repeat 10
+    python3 benchmarks/bench_pipeline.py --candidates 500 --jobs 100 --achievements 50 --output run.json
+"""
+
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / 'scripts'))
+
+from synth_corpus import write_corpus  # noqa: E402
+
+DEFAULT_BASELINE_DIR = ROOT_DIR / '.cache' / 'bench'
+DEFAULT_THRESHOLD = 0.15
+
+@dataclass(frozen=True)
+class Scale:
+    candidates: int
+    jobs: int
+    achievements: int
+
+SCALES = {
+    'small': Scale(candidates=20, jobs=3, achievements=3),
+    'medium': Scale(candidates=200, jobs=20, achievements=10),
+    'deep': Scale(candidates=20, jobs=100, achievements=50),
+    'wide': Scale(candidates=2000, jobs=6, achievements=4),
+}
+
+def measure(func: Callable[[], Any], items: int, repeat: int) -> Dict[str, float]:
+    """Time func() repeat times; report the best and median run and the best per item."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    best = min(runs)
+    return {
+        'items': items,
+        'best_s': best,
+        'median_s': statistics.median(runs),
+        'per_item_us': best / max(items, 1) * 1e6,
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(corpus: List[Path], workdir: Path, repeat: int, stages: Optional[List[str]],
+                   compile_samples: int) -> Dict[str, Dict[str, float]]:
+    """Time every selected stage over the corpus; return {stage: measurement}."""
+    from generate import GENERATORS, VALIDATOR_SOURCES, load_yaml_data, validate_data
+    from generate_ats import VARIANT_CONFIG, generate_ats_cv
+    from test_data_completeness import get_pdf_text, run_checks
+    from yaml_loader import load_data_dir
+
+    def wanted(name: str) -> bool:
+        return stages is None or any(name == s or name.startswith(s + '.') for s in stages)
+
+    results: Dict[str, Dict[str, float]] = {}
+    n = len(corpus)
+
+    def record(name: str, func: Callable[[], Any], items: int = n) -> None:
+        results[name] = measure(func, items, repeat)
+        print(f"  {name:<32} {results[name]['per_item_us']:>12.1f} us/item")
+
+    # Parsed once for the later stages, whether or not yaml.parse is timed
+    candidates = [load_yaml_data(d, use_snapshot=False) for d in corpus]
+    if wanted('yaml.parse'):
+        record('yaml.parse', lambda: [load_yaml_data(d, use_snapshot=False) for d in corpus])
+    if wanted('yaml.snapshot'):
+        snapshots = workdir / 'snapshots'
+        load = lambda: [load_data_dir(d, validate_data, VALIDATOR_SOURCES, snapshot_dir=snapshots, max_snapshots=None)
+                          for d in corpus]  # noqa: E731
+        load()
+        record('yaml.snapshot', load)
+
+    for variant, generate in GENERATORS.items():
+        if wanted(f"latex.{variant}"):
+            record(f"latex.{variant}", lambda g=generate: [''.join(g(data)) for data in candidates])
+
+    for variant in VARIANT_CONFIG:
+        if wanted(f"ats.{variant}"):
+            record(f"ats.{variant}", lambda v=variant: [generate_ats_cv(data, v) for data in candidates])
+        if wanted(f"check.{variant}"):
+            texts = [generate_ats_cv(data, variant) for data in candidates]
+            record(f"check.{variant}",
+                   lambda v=variant, t=texts: [run_checks(data, text, v) for data, text in zip(candidates, t)])
+
+    compile_wanted = [v for v in GENERATORS if wanted(f"compile.{v}")]
+    if (compile_wanted or wanted('pdf.text')) and compile_samples > 0:
+        if shutil.which('pdflatex') is None:
+            print("  compile.*, pdf.text                skipped: pdflatex not found")
+        else:
+            results.update(bench_compile(candidates[:compile_samples], workdir, repeat,
+                                         compile_wanted, wanted('pdf.text'), get_pdf_text))
+    return results
+
+def bench_compile(candidates: List[Dict[str, Any]], workdir: Path, repeat: int, variants: List[str],
+                  text: bool, get_pdf_text: Callable[[Path], str]) -> Dict[str, Dict[str, float]]:
+    """Time uncached pdflatex compiles and PDF text extraction of a few documents."""
+    from compile_latex import compile_tex
+    from generate import GENERATORS
+
+    class_dir = ROOT_DIR / 'templates' / 'altacv-class'
+    results: Dict[str, Dict[str, float]] = {}
+    pdfs: List[Path] = []
+    for variant in variants or list(GENERATORS):
+        tex_files = []
+        for i, data in enumerate(candidates):
+            tex = workdir / 'tex' / f"{variant}-{i}.tex"
+            tex.parent.mkdir(parents=True, exist_ok=True)
+            tex.write_text(''.join(GENERATORS[variant](data)), encoding='utf-8')
+            tex_files.append(tex)
+        measurement = measure(lambda: [compile_tex(t, class_dir) for t in tex_files], len(tex_files), repeat)
+        if variants:
+            results[f"compile.{variant}"] = measurement
+            print(f"  {'compile.' + variant:<32} {measurement['per_item_us']:>12.1f} us/item")
+        pdfs.extend(t.with_suffix('.pdf') for t in tex_files)
+    if text:
+        results['pdf.text'] = measure(lambda: [get_pdf_text(p) for p in pdfs], len(pdfs), repeat)
+        print(f"  {'pdf.text':<32} {results['pdf.text']['per_item_us']:>12.1f} us/item")
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> Tuple[str, List[str]]:
+    """Render the comparison table; return it with the names of regressed stages."""
+    lines = [f"{'stage':<32} {'items':>6} {'best ms':>10} {'us/item':>12} {'baseline':>12} {'change':>8}"]
+    lines.append('-' * len(lines[0]))
+    regressions = []
+    for name, r in results.items():
+        row = f"{name:<32} {r['items']:>6} {r['best_s'] * 1000:>10.2f} {r['per_item_us']:>12.1f}"
+        base = baseline.get(name)
+        if base:
+            ratio = r['per_item_us'] / base['per_item_us']
+            row += f" {base['per_item_us']:>12.1f} {ratio - 1:>+8.1%}"
+            if ratio > 1 + threshold:
+                row += '  ❌ regression'
+                regressions.append(name)
+            elif ratio < 1 - threshold:
+                row += '  ✓ faster'
+        lines.append(row)
+    return '\n'.join(lines), regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the CV pipeline on a synthetic corpus')
+    parser.add_argument('--scale', choices=list(SCALES), default='small',
+                        help='Corpus size preset (default: small)')
+    parser.add_argument('--candidates', type=int, help='Override the number of candidates')
+    parser.add_argument('--jobs', type=int, help='Override experience entries per candidate')
+    parser.add_argument('--achievements', type=int, help='Override achievements per entry')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per stage; the best counts (default: 5)')
+    parser.add_argument('--stages', metavar='LIST',
+                        help="Comma-separated stages or prefixes, e.g. 'yaml,latex.academic-researcher'")
+    parser.add_argument('--compile-samples', type=int, default=3,
+                        help='Documents per variant to compile with pdflatex, 0 to skip (default: 3)')
+    parser.add_argument('--baseline', type=Path,
+                        help=f'Baseline file (default: {DEFAULT_BASELINE_DIR.relative_to(ROOT_DIR)}/<scale>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Slowdown per item flagged as a regression (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--output', type=Path, help='Also write this run as JSON')
+    parser.add_argument('--keep-corpus', type=Path, help='Write the corpus here and keep it')
+    args = parser.parse_args()
+
+    preset = SCALES[args.scale]
+    scale = Scale(
+        candidates=args.candidates or preset.candidates,
+        jobs=args.jobs or preset.jobs,
+        achievements=args.achievements or preset.achievements,
+    )
+    label = args.scale if scale == preset else f"custom-{scale.candidates}x{scale.jobs}x{scale.achievements}"
+    baseline_path = args.baseline or DEFAULT_BASELINE_DIR / f"{label}.json"
+    stages = args.stages.split(',') if args.stages else None
+
+    with tempfile.TemporaryDirectory(prefix='cv-bench-') as tmp:
+        workdir = Path(tmp)
+        corpus_dir = args.keep_corpus or workdir / 'corpus'
+        print(f"Writing {scale.candidates} candidates ({scale.jobs} jobs x {scale.achievements} achievements)...")
+        corpus = write_corpus(corpus_dir, scale.candidates, scale.jobs, scale.achievements, args.seed)
+        print(f"Timing stages ({args.repeat} runs each, best counts):")
+        results = run_benchmarks(corpus, workdir, args.repeat, stages, args.compile_samples)
+
+    run = {
+        'meta': {
+            'scale': label,
+            **asdict(scale),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': f"{platform.system()} {platform.machine()} {platform.node()}",
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+    baseline: Dict[str, Any] = {}
+    if baseline_path.exists() and not args.save_baseline:
+        stored = json.loads(baseline_path.read_text(encoding='utf-8'))
+        keys = ('candidates', 'jobs', 'achievements', 'seed')
+        if all(stored['meta'].get(k) == run['meta'][k] for k in keys):
+            baseline = stored['results']
+            print(f"\nBaseline: {baseline_path} (commit {stored['meta'].get('commit')}, {stored['meta'].get('date')})")
+        else:
+            print(f"\n⚠️  Baseline {baseline_path} was recorded for a different corpus; not comparing")
+
+    table, regressions = compare(results, baseline, args.threshold)
+    print(f"\n{table}")
+
+    if args.output:
+        args.output.write_text(json.dumps(run, indent=2) + '\n', encoding='utf-8')
+        print(f"\n✓ Wrote {args.output}")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(run, indent=2) + '\n', encoding='utf-8')
+        print(f"\n✓ Saved baseline {baseline_path}")
+    if regressions:
+        print(f"\n❌ {len(regressions)} stages regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
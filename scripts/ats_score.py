@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Bulk ATS keyword-coverage scoring: N candidates x M job postings in one pass.
+
+Each posting is reduced to its keywords (the most frequent tailor.tokenize
+terms). The union of all posting keywords is the vocabulary, and two dense
+NumPy matrices are built over it:
+
+    postings    M x T   1 where posting m lists keyword t
+    candidates  N*V x T 1 where candidate n's ATS text for variant v uses t
+
+A single matrix product then gives every (candidate, variant, posting)
+keyword count, divided by each posting's keyword total for the coverage
+score. The best variant is an argmax over V, and missing keywords are a
+boolean mask per candidate, not a loop per pair. Candidates are scored in
+batches so memory stays bounded for large stores.
+
+Usage:
+    python3 scripts/ats_score.py --data-dir data --jobs postings/*.txt
+    python3 scripts/ats_score.py --store cv.db --candidates all --jobs postings/*.txt --output scores.jsonl
+"""
+
+import sys
+import json
+import heapq
+import argparse
+import numpy as np
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from tailor import read_job, surface_forms, tokenize
+
+DEFAULT_MAX_KEYWORDS = 40
+DEFAULT_BATCH_SIZE = 1024
+
+def extract_keywords(text: str, limit: int = DEFAULT_MAX_KEYWORDS) -> List[str]:
+    """The posting's most frequent terms, ties in order of first appearance."""
+    counts = Counter(tokenize(text))
+    return [t for t, _ in counts.most_common(limit)] if limit else list(counts)
+
+@dataclass
+class PostingMatrix:
+    """Keyword sets of M postings as an M x T indicator matrix."""
+    names: List[str]
+    keywords: List[List[str]]
+    vocab: Dict[str, int]
+    terms: np.ndarray      # T keywords as spelled in the postings, column order
+    matrix: np.ndarray     # M x T float32
+    totals: np.ndarray     # M keyword counts
+
+    @classmethod
+    def build(cls, postings: Dict[str, str], max_keywords: int = DEFAULT_MAX_KEYWORDS) -> 'PostingMatrix':
+        names = list(postings)
+        keywords = [extract_keywords(postings[name], max_keywords) for name in names]
+        vocab: Dict[str, int] = {}
+        spelling: Dict[str, str] = {}
+        for name, words in zip(names, keywords):
+            forms = surface_forms(postings[name])
+            for word in words:
+                if word not in vocab:
+                    vocab[word] = len(vocab)
+                    spelling[word] = forms[word]
+
+        matrix = np.zeros((len(names), len(vocab)), dtype=np.float32)
+        rows = [m for m, words in enumerate(keywords) for _ in words]
+        cols = [vocab[w] for words in keywords for w in words]
+        matrix[rows, cols] = 1.0
+        totals = matrix.sum(axis=1)
+        terms = np.array([spelling[w] for w in vocab], dtype=object)
+        return cls(names, keywords, vocab, terms, matrix, totals)
+
+    def indicator(self, texts: Sequence[str]) -> np.ndarray:
+        """len(texts) x T boolean matrix of which vocabulary terms each text uses."""
+        out = np.zeros((len(texts), len(self.vocab)), dtype=bool)
+        rows, cols = [], []
+        for r, text in enumerate(texts):
+            hits = {self.vocab[t] for t in tokenize(text) if t in self.vocab}
+            rows.extend([r] * len(hits))
+            cols.extend(hits)
+        out[rows, cols] = True
+        return out
+
+@dataclass
+class ScoreBatch:
+    """Scores of one batch of candidates against every posting."""
+    candidates: List[str]
+    variants: List[str]
+    postings: PostingMatrix
+    present: np.ndarray    # N x V x T bool
+    scores: np.ndarray     # N x V x M coverage in [0, 1]
+
+    @property
+    def best(self) -> np.ndarray:
+        """N x M index of the best-covering variant (first wins ties)."""
+        return self.scores.argmax(axis=1)
+
+    @property
+    def best_scores(self) -> np.ndarray:
+        return self.scores.max(axis=1)
+
+    def missing(self, n: int) -> List[List[str]]:
+        """For candidate n, each posting's keywords absent from its best variant."""
+        have = self.present[n][self.best[n]]                         # M x T
+        mask = (self.postings.matrix > 0) & ~have
+        return [self.postings.terms[row].tolist() for row in mask]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """One record per (candidate, posting) pair."""
+        best, best_scores = self.best, self.best_scores
+        for n, candidate_id in enumerate(self.candidates):
+            missing = self.missing(n)
+            for m, posting in enumerate(self.postings.names):
+                yield {
+                    'candidate': candidate_id,
+                    'posting': posting,
+                    'best_variant': self.variants[best[n, m]],
+                    'score': round(float(best_scores[n, m]), 4),
+                    'variant_scores': {v: round(float(self.scores[n, i, m]), 4)
+                                       for i, v in enumerate(self.variants)},
+                    'missing': missing[m],
+                }
+
+def score_batch(candidates: Sequence[Tuple[str, Dict[str, Any]]], postings: PostingMatrix,
+                variants: Sequence[str]) -> ScoreBatch:
+    """Score candidates' ATS texts for every variant against every posting."""
+    from generate_ats import generate_ats_cv
+
+    variants = list(variants)
+    texts = [generate_ats_cv(data, v) for _, data in candidates for v in variants]
+    present = postings.indicator(texts)                              # N*V x T
+    counts = present.astype(np.float32) @ postings.matrix.T          # N*V x M
+    scores = counts / np.maximum(postings.totals, 1.0)
+    n, v, t = len(candidates), len(variants), len(postings.vocab)
+    return ScoreBatch([c for c, _ in candidates], variants, postings,
+                      present.reshape(n, v, t), scores.reshape(n, v, -1))
+
+def score_all(candidates: Iterable[Tuple[str, Dict[str, Any]]], postings: PostingMatrix,
+              variants: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[ScoreBatch]:
+    """Score a stream of (candidate_id, data) pairs batch by batch."""
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    for item in candidates:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield score_batch(batch, postings, variants)
+            batch = []
+    if batch:
+        yield score_batch(batch, postings, variants)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Score candidates against job postings by ATS keyword coverage'
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data-dir', type=Path, help='Directory containing YAML data files')
+    source.add_argument('--store', type=Path, help='Candidate store file (see candidate_store.py)')
+    parser.add_argument('--candidates', metavar='LIST', default='all',
+                        help="Candidate IDs from --store: 'all' or a comma-separated list (default: all)")
+    parser.add_argument('--jobs', type=Path, nargs='+', required=True, help='Job description text files')
+    parser.add_argument('--variants', help='Comma-separated ATS variants to compare (default: all)')
+    parser.add_argument('--max-keywords', type=int, default=DEFAULT_MAX_KEYWORDS,
+                        help=f'Keywords taken from each posting, 0 for all (default: {DEFAULT_MAX_KEYWORDS})')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Candidates scored per matrix product (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--output', type=Path, help='Write one JSON record per candidate/posting pair')
+    parser.add_argument('--top', type=int, default=5, help='Best candidates shown per posting (default: 5)')
+    args = parser.parse_args()
+
+    from candidate_store import CandidateStore, resolve_candidates
+    from generate_ats import VARIANT_CONFIG, load_yaml_data
+    from schema import validate_batch
+
+    variants = args.variants.split(',') if args.variants else sorted(VARIANT_CONFIG)
+    unknown = [v for v in variants if v not in VARIANT_CONFIG]
+    if unknown:
+        print(f"Error: Unknown variants: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    missing = [str(job) for job in args.jobs if not job.exists()]
+    if missing:
+        print(f"Error: Job description not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    postings = PostingMatrix.build({job.stem: read_job(job) for job in args.jobs}, args.max_keywords)
+    print(f"Indexed {len(postings.names)} postings ({len(postings.vocab)} keywords)")
+
+    # Per posting: min-heap of the top (score, -arrival, candidate, variant), for the summary;
+    # -arrival keeps the earlier candidate on equal scores
+    leaders: Dict[str, List[Tuple[float, int, str, str]]] = {name: [] for name in postings.names}
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    store = None
+    try:
+        if args.store:
+            store = CandidateStore(args.store)
+            candidate_ids = resolve_candidates(store, args.candidates)
+            invalid = validate_batch(store.iter_candidates(candidate_ids))
+            for candidate_id, errors in invalid.items():
+                print(f"❌ Rejected {candidate_id}: {len(errors)} schema errors", file=sys.stderr)
+            candidates = store.iter_candidates([c for c in candidate_ids if c not in invalid])
+        else:
+            invalid = {}
+            candidates = iter([(args.data_dir.name, load_yaml_data(args.data_dir))])
+
+        scored = arrival = 0
+        for batch in score_all(candidates, postings, variants, args.batch_size):
+            scored += len(batch.candidates)
+            for row in batch.rows():
+                arrival += 1
+                heap = leaders[row['posting']]
+                entry = (row['score'], -arrival, row['candidate'], row['best_variant'])
+                if len(heap) < args.top:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heappushpop(heap, entry)
+                if out:
+                    out.write(json.dumps(row, ensure_ascii=False) + '\n')
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out:
+            out.close()
+        if store:
+            store.close()
+
+    print(f"✓ Scored {scored} candidates x {len(postings.names)} postings x {len(variants)} variants")
+    for name, keywords in zip(postings.names, postings.keywords):
+        ranked = sorted(leaders[name], reverse=True)
+        print(f"\n{name} ({len(keywords)} keywords)")
+        for score, _, candidate_id, variant in ranked:
+            print(f"  {score:6.1%}  {candidate_id:<20} {variant}")
+    if args.output:
+        print(f"\n✓ Wrote {args.output}")
+    if invalid:
+        print(f"❌ {len(invalid)} candidates rejected", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
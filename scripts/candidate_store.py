@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Candidate store - many candidates' CV data in one indexed SQLite file.
+
+Each candidate is stored as one row per YAML section (personal, experience,
+skills, ...) holding the section as JSON. Loading a candidate is a primary-key
+lookup, so selecting one candidate out of thousands never touches the others.
+
+Usage:
+    python3 scripts/candidate_store.py import --store cv.db data/ --id mark
+    python3 scripts/candidate_store.py import --store cv.db candidates/*/
+    python3 scripts/candidate_store.py list --store cv.db
+    python3 scripts/candidate_store.py export --store cv.db --id mark --output-dir out/
+"""
+
+import sys
+import json
+import sqlite3
+import argparse
+import yaml
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Tuple, Optional
+
+from yaml_loader import safe_load
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS candidates (
+    id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS sections (
+    candidate_id TEXT NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, name)
+) WITHOUT ROWID;
+'''
+
+class CandidateStore:
+    """SQLite-backed store of candidate data dicts keyed by candidate ID."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> 'CandidateStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def candidate_ids(self) -> List[str]:
+        """Return all candidate IDs in sorted order."""
+        return [row[0] for row in self.conn.execute('SELECT id FROM candidates ORDER BY id')]
+
+    def __contains__(self, candidate_id: str) -> bool:
+        row = self.conn.execute('SELECT 1 FROM candidates WHERE id = ?', (candidate_id,)).fetchone()
+        return row is not None
+
+    def load(self, candidate_id: str) -> Dict[str, Any]:
+        """Load one candidate's data dict (same shape as load_yaml_data)."""
+        if candidate_id not in self:
+            raise ValueError(f"Unknown candidate: {candidate_id}")
+        rows = self.conn.execute(
+            'SELECT name, body FROM sections WHERE candidate_id = ?', (candidate_id,)
+        )
+        return {name: json.loads(body) for name, body in rows}
+
+    def iter_candidates(self, candidate_ids: Optional[List[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (candidate_id, data) pairs one at a time."""
+        for candidate_id in candidate_ids if candidate_ids is not None else self.candidate_ids():
+            yield candidate_id, self.load(candidate_id)
+
+    def put(self, candidate_id: str, data: Dict[str, Any]) -> None:
+        """Insert or replace all sections of a candidate."""
+        with self.conn:
+            self.conn.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,))
+            self.conn.execute('INSERT INTO candidates (id) VALUES (?)', (candidate_id,))
+            self.conn.executemany(
+                'INSERT INTO sections (candidate_id, name, body) VALUES (?, ?, ?)',
+                [(candidate_id, name, json.dumps(body, ensure_ascii=False, default=str))
+                 for name, body in data.items()]
+            )
+
+    def remove(self, candidate_id: str) -> None:
+        with self.conn:
+            self.conn.execute('DELETE FROM candidates WHERE id = ?', (candidate_id,))
+
+    def import_directory(self, candidate_id: str, data_dir: Path) -> Dict[str, Any]:
+        """Read every *.yaml file in data_dir and store it as one candidate."""
+        data = {}
+        for yaml_file in sorted(Path(data_dir).glob('*.yaml')):
+            with open(yaml_file) as f:
+                data[yaml_file.stem] = safe_load(f)
+        if not data:
+            raise ValueError(f"No YAML files found in {data_dir}")
+        self.put(candidate_id, data)
+        return data
+
+def resolve_candidates(store: CandidateStore, spec: str) -> List[str]:
+    """Expand a --candidates value ('all' or a comma-separated list of IDs)."""
+    if spec == 'all':
+        return store.candidate_ids()
+    candidate_ids = [c.strip() for c in spec.split(',') if c.strip()]
+    unknown = [c for c in candidate_ids if c not in store]
+    if unknown:
+        raise ValueError(f"Unknown candidates in {store.path}: {', '.join(unknown)}")
+    return candidate_ids
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Candidate store - manage many candidates in one SQLite file'
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_import = sub.add_parser('import', help='Import YAML data directories')
+    p_import.add_argument('--store', required=True, type=Path, help='Store file (created if missing)')
+    p_import.add_argument('--id', help='Candidate ID (single directory only; default: directory name)')
+    p_import.add_argument('data_dirs', nargs='+', type=Path, help='Directories containing YAML data files')
+
+    p_list = sub.add_parser('list', help='List candidate IDs')
+    p_list.add_argument('--store', required=True, type=Path, help='Store file')
+
+    p_export = sub.add_parser('export', help='Write a candidate back out as YAML files')
+    p_export.add_argument('--store', required=True, type=Path, help='Store file')
+    p_export.add_argument('--id', required=True, help='Candidate ID')
+    p_export.add_argument('--output-dir', required=True, type=Path, help='Directory for <section>.yaml files')
+
+    p_remove = sub.add_parser('remove', help='Remove a candidate')
+    p_remove.add_argument('--store', required=True, type=Path, help='Store file')
+    p_remove.add_argument('--id', required=True, help='Candidate ID')
+
+    args = parser.parse_args()
+
+    if args.command != 'import' and not args.store.exists():
+        print(f"Error: Store not found: {args.store}", file=sys.stderr)
+        return 1
+
+    try:
+        with CandidateStore(args.store) as store:
+            if args.command == 'import':
+                if args.id and len(args.data_dirs) > 1:
+                    parser.error('--id can only be used with a single data directory')
+                for data_dir in args.data_dirs:
+                    candidate_id = args.id or data_dir.resolve().name
+                    data = store.import_directory(candidate_id, data_dir)
+                    print(f"✓ Imported {candidate_id} ({', '.join(sorted(data))})")
+            elif args.command == 'list':
+                for candidate_id in store.candidate_ids():
+                    print(candidate_id)
+            elif args.command == 'export':
+                data = store.load(args.id)
+                args.output_dir.mkdir(parents=True, exist_ok=True)
+                for name, body in data.items():
+                    with open(args.output_dir / f"{name}.yaml", 'w', encoding='utf-8') as f:
+                        yaml.safe_dump(body, f, allow_unicode=True, sort_keys=False)
+                print(f"✓ Exported {args.id} to {args.output_dir}")
+            elif args.command == 'remove':
+                store.remove(args.id)
+                print(f"✓ Removed {args.id}")
+        return 0
+
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
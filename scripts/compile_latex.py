@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Compile generated .tex files to PDF, reusing cached PDFs when the LaTeX is unchanged.
+
+The cache key covers the .tex bytes plus the altacv class and .cfg files, so
+regenerating a .tex with identical content (e.g. after editing a YAML field
+that the variant does not print) skips pdflatex entirely.
+
+Jobs run on a process pool. Each job compiles in its own temporary working
+directory (so .aux/.log files never collide) and finds altacv.cls and the
+.cfg files through TEXINPUTS pointing at the shared, read-only class
+directory instead of copying them next to every document.
+
+With --preload, each distinct preamble is first dumped into a precompiled
+format (see latex_format.py) and documents are compiled with -fmt, so TeX
+start-up and class/font loading are paid once per variant instead of once
+per CV. Documents fall back to a normal compile if the format cannot be used.
+
+Usage:
+    python3 scripts/compile_latex.py output/generated/*.tex \\
+        --class-dir templates/altacv-class --cache-dir .cache/pdf --jobs 8 --preload
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from instrument import count, span
+from pdf_cache import PdfCache, cache_key, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from latex_format import (
+    FormatError, DEFAULT_FORMAT_DIR, ensure_format, format_env, format_name, preamble_of,
+)
+
+PDFLATEX_CMD = ['pdflatex', '-interaction=nonstopmode', '-halt-on-error']
+
+def support_files(class_dir: Path) -> List[Path]:
+    """LaTeX class and config files a generated .tex is compiled against."""
+    return sorted(list(class_dir.glob('*.cls')) + list(class_dir.glob('*.cfg')))
+
+class CompileError(Exception):
+    """pdflatex failed; carries the tail of the LaTeX log."""
+
+    def __init__(self, tex_path: Path, returncode: int, log_tail: str):
+        # Keep all fields in args so the exception pickles back from pool workers
+        super().__init__(tex_path, returncode, log_tail)
+        self.tex_path = tex_path
+        self.returncode = returncode
+        self.log_tail = log_tail
+
+    def __str__(self) -> str:
+        return f"pdflatex failed for {self.tex_path} (exit code {self.returncode})"
+
+def latex_env(class_dir: Path) -> Dict[str, str]:
+    """Environment that puts class_dir first on the TeX search path."""
+    env = dict(os.environ)
+    # The trailing separator keeps the TeX distribution's default search path
+    env['TEXINPUTS'] = str(Path(class_dir).resolve()) + os.pathsep + env.get('TEXINPUTS', '')
+    return env
+
+def run_pdflatex(args: List[str], workdir: str, env: Dict[str, str]) -> subprocess.CompletedProcess:
+    with span('pdflatex', args=' '.join(args)):
+        return subprocess.run(
+            PDFLATEX_CMD + args,
+            cwd=workdir,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace',
+        )
+
+def compile_tex(tex_path: Path, class_dir: Path, cache: Optional[PdfCache] = None,
+                fmt_dir: Optional[Path] = None) -> str:
+    """Compile tex_path to a PDF next to it.
+
+    Returns 'cached', 'preloaded' (compiled with a precompiled format from
+    fmt_dir) or 'compiled'.
+    """
+    tex_path = Path(tex_path)
+    pdf_path = tex_path.with_suffix('.pdf')
+    files = support_files(class_dir)
+
+    key = None
+    if cache is not None:
+        key = cache_key(tex_path, files, ' '.join(PDFLATEX_CMD))
+        if cache.get(key, pdf_path):
+            count('pdf.cached')
+            return 'cached'
+
+    env = latex_env(class_dir)
+    fmt_name = None
+    if fmt_dir is not None:
+        preamble = preamble_of(tex_path)
+        if preamble is not None:
+            name = format_name(preamble, files)
+            if (Path(fmt_dir) / f"{name}.fmt").exists():
+                fmt_name = name
+
+    with tempfile.TemporaryDirectory(prefix='cv-latex-') as workdir:
+        work_tex = Path(workdir) / tex_path.name
+        shutil.copyfile(tex_path, work_tex)
+        status = 'compiled'
+        result = None
+        if fmt_name is not None:
+            result = run_pdflatex([f"-fmt={fmt_name}", work_tex.name], workdir, format_env(fmt_dir, env))
+            status = 'preloaded'
+        if result is None or result.returncode != 0:
+            # No usable format: full compile, preamble included
+            result = run_pdflatex([work_tex.name], workdir, env)
+            status = 'compiled'
+        if result.returncode != 0:
+            raise CompileError(tex_path, result.returncode, '\n'.join(result.stdout.splitlines()[-20:]))
+        shutil.move(str(work_tex.with_suffix('.pdf')), str(pdf_path))
+
+    if cache is not None:
+        cache.put(key, pdf_path)
+    count(f"pdf.{status}")
+    return status
+
+def prepare_formats(tex_files: List[Path], class_dir: Path, fmt_dir: Path) -> int:
+    """Build one precompiled format per distinct preamble; return how many are usable."""
+    files = support_files(class_dir)
+    env = latex_env(class_dir)
+    preambles = {}
+    for tex_path in tex_files:
+        preamble = preamble_of(tex_path)
+        if preamble is not None:
+            preambles.setdefault(format_name(preamble, files), preamble)
+
+    ready = 0
+    for name, preamble in preambles.items():
+        try:
+            ensure_format(preamble, fmt_dir, class_dir, files, env)
+            ready += 1
+        except FormatError as e:
+            print(f"⚠️  {e}", file=sys.stderr)
+            print(f"   Documents using format {name} will be compiled without it", file=sys.stderr)
+    return ready
+
+def compile_many(tex_files: List[Path], class_dir: Path, cache: Optional[PdfCache] = None,
+                 jobs: Optional[int] = None, fmt_dir: Optional[Path] = None) -> Dict[Path, str]:
+    """Compile many .tex files on a process pool.
+
+    Returns {tex_path: 'cached' | 'preloaded' | 'compiled' | 'failed'};
+    failures are reported as they complete without stopping the remaining jobs.
+    Formats are built up front in this process, so workers never race to
+    dump the same preamble. Workers store into the cache without evicting;
+    it is trimmed to its size limit once, after the batch.
+    """
+    if fmt_dir is not None:
+        ready = prepare_formats(tex_files, class_dir, fmt_dir)
+        print(f"Preloaded {ready} preamble format(s) in {fmt_dir}")
+
+    results = {}
+    worker_cache = cache.unbounded() if cache is not None else None
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(compile_tex, tex, class_dir, worker_cache, fmt_dir): tex for tex in tex_files}
+        for future in as_completed(futures):
+            tex_path = futures[future]
+            try:
+                status = future.result()
+            except CompileError as e:
+                print(f"❌ {e}", file=sys.stderr)
+                print(e.log_tail, file=sys.stderr)
+                results[tex_path] = 'failed'
+                continue
+            if status == 'cached':
+                print(f"✓ {tex_path.with_suffix('.pdf')} (cached, LaTeX unchanged)")
+            else:
+                print(f"✓ {tex_path.with_suffix('.pdf')} ({status})")
+            results[tex_path] = status
+    if cache is not None:
+        cache.evict()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compile .tex to PDF with a content-addressed PDF cache'
+    )
+    parser.add_argument('tex_files', nargs='+', type=Path, help='.tex files to compile')
+    parser.add_argument('--class-dir', type=Path, default=Path('templates/altacv-class'),
+                        help='Directory with altacv.cls and .cfg files')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help='PDF cache directory')
+    parser.add_argument('--cache-size-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Maximum cache size before LRU eviction (MB)')
+    parser.add_argument('--no-cache', action='store_true', help='Always run pdflatex')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Parallel pdflatex workers (default: number of CPUs)')
+    parser.add_argument('--preload', action='store_true',
+                        help='Compile against precompiled per-preamble formats (needs mylatexformat)')
+    parser.add_argument('--format-dir', type=Path, default=DEFAULT_FORMAT_DIR,
+                        help='Directory for precompiled .fmt files')
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else PdfCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+
+    missing = [tex for tex in args.tex_files if not tex.exists()]
+    if missing:
+        print(f"Error: LaTeX file not found: {', '.join(map(str, missing))}", file=sys.stderr)
+        return 1
+
+    fmt_dir = args.format_dir if args.preload else None
+    try:
+        results = compile_many(args.tex_files, args.class_dir, cache, args.jobs or None, fmt_dir)
+    except FileNotFoundError as e:
+        print(f"Error: {e.filename or 'pdflatex'} not found - is TeX Live installed?", file=sys.stderr)
+        return 1
+
+    failed = [tex for tex, status in results.items() if status == 'failed']
+    cached = sum(1 for status in results.values() if status == 'cached')
+    print(f"Compiled {len(results) - cached - len(failed)}, cached {cached}, failed {len(failed)}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Cover letter generator over data/cover-letter-template.yaml.
+
+The template file holds the building blocks of the four-paragraph letter
+described in docs/COVER_LETTER_GUIDE.md: hook, fit highlights, interest and
+close, keyed by variant, plus a call to action. Each block is compiled once
+into two str.format templates: a plain-text one and a LaTeX one whose
+literal text is already escaped. A letter is then a handful of format_map
+calls over the posting's fields, each escaped once.
+
+Postings come from a CSV or JSONL file, one per row. The reserved columns
+are id, variant, interest (a key under 'interest', or 'none'), cta,
+recipient and date. Every other column fills the placeholder of the same
+name in upper case, e.g. role -> {ROLE}, company -> {COMPANY}. A row that
+lacks a placeholder its blocks need is reported and skipped. Rows without
+a date get --date, which defaults to today; pass it explicitly to rebuild
+identical letters (and hit the PDF cache) on a later day.
+
+LaTeX letters use their variant's CV preamble, so --pdf compiles them
+through compile_latex.compile_many with the same PDF cache and
+precompiled formats as the CV build.
+
+Usage:
+    python3 scripts/cover_letter.py --data-dir data --postings postings.csv --output-dir output/letters
+    python3 scripts/cover_letter.py --data-dir data --postings postings.jsonl --output-dir output/letters \\
+        --formats text,latex --pdf --jobs 8 --preload
+"""
+
+import re
+import csv
+import sys
+import json
+import argparse
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cv_engine import personal_header
+from latex_escape import escape_latex
+from variants import VARIANTS
+
+PLACEHOLDER_RE = re.compile(r'\{([A-Z][A-Z0-9_]*)\}')
+
+RESERVED_COLUMNS = {'id', 'variant', 'interest', 'cta', 'recipient', 'date'}
+
+# Interest paragraph used when a posting does not name one
+DEFAULT_INTEREST = {
+    'academic-researcher': 'research_institute',
+    'industrial-scientist': 'deep_tech',
+}
+DEFAULT_CTA = 'direct'
+DEFAULT_RECIPIENT = 'Hiring Committee'
+
+FORMATS = {'text': 'txt', 'latex': 'tex'}
+
+class TemplateError(ValueError):
+    """A posting cannot be rendered (unknown block or missing placeholder)."""
+
+@dataclass(frozen=True)
+class Block:
+    """One text block compiled for plain-text and LaTeX substitution."""
+    text: str
+    latex: str
+    fields: frozenset
+
+    @classmethod
+    def compile(cls, source: str) -> 'Block':
+        source = ' '.join(str(source).split())
+        literals = PLACEHOLDER_RE.split(source)   # literal, field, literal, field, ...
+
+        def build(escape) -> str:
+            parts = []
+            for i, part in enumerate(literals):
+                if i % 2:
+                    parts.append(f"{{{part}}}")
+                else:
+                    parts.append(escape(part).replace('{', '{{').replace('}', '}}'))
+            return ''.join(parts)
+
+        return cls(build(str), build(escape_latex), frozenset(literals[1::2]))
+
+    def render(self, values: Dict[str, str]) -> str:
+        return self.text.format_map(values)
+
+    def render_latex(self, escaped: Dict[str, str]) -> str:
+        return self.latex.format_map(escaped)
+
+@dataclass(frozen=True)
+class VariantBlocks:
+    """The compiled blocks of one variant."""
+    hook: Block
+    highlights: Tuple[Block, ...]
+    close: Block
+
+def _variant_key(variant: str) -> str:
+    return variant.replace('-', '_')
+
+class LetterTemplates:
+    """All blocks of a cover-letter-template.yaml, compiled once."""
+
+    def __init__(self, blocks: Dict[str, Any]):
+        self.variants: Dict[str, VariantBlocks] = {}
+        for variant in VARIANTS:
+            key = _variant_key(variant)
+            if key in blocks.get('hook', {}) and key in blocks.get('close', {}):
+                fit = blocks.get('fit', {}).get(key, {})
+                self.variants[variant] = VariantBlocks(
+                    hook=Block.compile(blocks['hook'][key]),
+                    highlights=tuple(Block.compile(h) for h in fit.get('highlights', [])),
+                    close=Block.compile(blocks['close'][key]),
+                )
+        self.interest = {name: Block.compile(text) for name, text in blocks.get('interest', {}).items()}
+        self.cta = {name: Block.compile(text) for name, text in blocks.get('cta', {}).items()}
+
+    def blocks_for(self, posting: Dict[str, str]) -> List[Tuple[str, Any]]:
+        """The letter's (kind, block) sequence for a posting."""
+        variant = posting['variant']
+        if variant not in self.variants:
+            raise TemplateError(f"no hook/close blocks for variant '{variant}'")
+        blocks = self.variants[variant]
+
+        sequence: List[Tuple[str, Any]] = [('paragraph', blocks.hook)]
+        if blocks.highlights:
+            sequence.append(('highlights', blocks.highlights))
+        interest = posting.get('interest') or DEFAULT_INTEREST.get(variant)
+        if interest and interest != 'none':
+            if interest not in self.interest:
+                raise TemplateError(f"unknown interest block '{interest}' (choose from: {', '.join(self.interest)}, none)")
+            sequence.append(('paragraph', self.interest[interest]))
+        cta = posting.get('cta') or DEFAULT_CTA
+        if cta not in self.cta:
+            raise TemplateError(f"unknown cta '{cta}' (choose from: {', '.join(self.cta)})")
+        sequence.append(('closing', (blocks.close, self.cta[cta])))
+
+        needed = set()
+        for kind, block in sequence:
+            for b in (block if isinstance(block, tuple) else (block,)):
+                needed |= b.fields
+        missing = sorted(f for f in needed if f not in posting['fields'])
+        if missing:
+            raise TemplateError(f"missing placeholder(s): {', '.join(missing)}")
+        return sequence
+
+@lru_cache(maxsize=16)
+def _compiled(source: str) -> LetterTemplates:
+    return LetterTemplates(json.loads(source))
+
+def letter_templates(data: Dict[str, Any]) -> LetterTemplates:
+    """Compiled templates for a candidate's cover-letter-template section."""
+    blocks = data.get('cover-letter-template')
+    if not blocks:
+        raise ValueError("No cover-letter-template data (data/cover-letter-template.yaml)")
+    return _compiled(json.dumps(blocks, sort_keys=True, default=str))
+
+def normalize_posting(row: Dict[str, Any], number: int, default_variant: Optional[str],
+                      default_date: str) -> Dict[str, Any]:
+    """Split a CSV/JSONL row into reserved settings and placeholder fields."""
+    row = {str(k).strip().lower(): ('' if v is None else str(v).strip()) for k, v in row.items() if k}
+    fields = {k.upper(): v for k, v in row.items() if k not in RESERVED_COLUMNS and v}
+    variant = row.get('variant') or default_variant or ''
+    name = row.get('id') or '-'.join(
+        p for p in (fields.get('COMPANY') or fields.get('INSTITUTE'), fields.get('ROLE')) if p
+    ) or f"posting-{number}"
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or f"posting-{number}"
+    return {
+        'id': slug,
+        'variant': variant,
+        'interest': row.get('interest'),
+        'cta': row.get('cta'),
+        'recipient': row.get('recipient') or DEFAULT_RECIPIENT,
+        'date': row.get('date') or default_date,
+        'fields': fields,
+    }
+
+def read_postings(path: Path, default_variant: Optional[str], default_date: str) -> Iterator[Dict[str, Any]]:
+    """Stream postings from a .csv or .jsonl file."""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.suffix == '.csv':
+            rows: Iterator[Dict[str, Any]] = csv.DictReader(f)
+        elif path.suffix in ('.jsonl', '.ndjson'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            raise ValueError(f"Unsupported postings file {path} (use .csv or .jsonl)")
+        for number, row in enumerate(rows, 1):
+            yield normalize_posting(row, number, default_variant, default_date)
+
+def render_text(personal: Dict[str, Any], posting: Dict[str, Any], sequence: List[Tuple[str, Any]]) -> str:
+    values = posting['fields']
+    name = f"{personal['first_name']} {personal['last_name']}"
+    contact = ' | '.join(str(personal[k]) for k in ('email', 'phone', 'location') if personal.get(k))
+    parts = [name, contact, '', posting['date'], '', f"Dear {posting['recipient']},", '']
+    for kind, block in sequence:
+        if kind == 'highlights':
+            parts += [f"• {h.render(values)}" for h in block]
+        elif kind == 'closing':
+            parts.append(' '.join(b.render(values) for b in block))
+        else:
+            parts.append(block.render(values))
+        parts.append('')
+    parts += ['Sincerely,', name, '']
+    return '\n'.join(parts)
+
+def render_latex(personal: Dict[str, Any], posting: Dict[str, Any], sequence: List[Tuple[str, Any]]) -> str:
+    escaped = {k: escape_latex(v) for k, v in posting['fields'].items()}
+    variant = posting['variant']
+    spec = VARIANTS[variant]
+    parts = [spec.theme.preamble()]
+    parts += personal_header(personal, spec.tagline or variant)
+    parts.append(f"\\bigskip\n\n{escape_latex(posting['date'])}\n\n")
+    parts.append(f"Dear {escape_latex(posting['recipient'])},\n\n")
+    for kind, block in sequence:
+        if kind == 'highlights':
+            parts.append("\\begin{itemize}\n")
+            parts += [f"\\item {h.render_latex(escaped)}\n" for h in block]
+            parts.append("\\end{itemize}\n\n")
+        elif kind == 'closing':
+            parts.append(' '.join(b.render_latex(escaped) for b in block) + "\n\n")
+        else:
+            parts.append(block.render_latex(escaped) + "\n\n")
+    parts.append("\\bigskip\nSincerely,\n\n")
+    parts.append(f"{escape_latex(personal['first_name'])} {escape_latex(personal['last_name'])}\n\n")
+    parts.append("\\end{document}\n")
+    return ''.join(parts)
+
+RENDERERS = {'text': render_text, 'latex': render_latex}
+
+def generate_letters(data: Dict[str, Any], postings: Iterator[Dict[str, Any]], output_dir: Path,
+                     formats: List[str]) -> Tuple[int, List[Path], Dict[str, str]]:
+    """Write every posting's letter.
+
+    Returns the number of letters written, the .tex paths among them and
+    {id: error} for skipped rows.
+    """
+    templates = letter_templates(data)
+    personal = data['personal']
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tex_files: List[Path] = []
+    rejected: Dict[str, str] = {}
+    seen: Dict[str, int] = {}
+    written = 0
+    for posting in postings:
+        # Keep ids unique so two postings never overwrite one letter
+        count = seen.get(posting['id'], 0)
+        seen[posting['id']] = count + 1
+        letter_id = posting['id'] if not count else f"{posting['id']}-{count + 1}"
+        try:
+            sequence = templates.blocks_for(posting)
+        except TemplateError as e:
+            rejected[letter_id] = str(e)
+            continue
+        for fmt in formats:
+            path = output_dir / f"{letter_id}.{FORMATS[fmt]}"
+            path.write_text(RENDERERS[fmt](personal, posting, sequence), encoding='utf-8')
+            if fmt == 'latex':
+                tex_files.append(path)
+        written += 1
+    return written, tex_files, rejected
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate cover letters for many postings from cover-letter-template.yaml'
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data-dir', type=Path, help='Directory containing YAML data files')
+    source.add_argument('--store', type=Path, help='Candidate store file (see candidate_store.py)')
+    parser.add_argument('--candidate', help='Candidate ID to load from --store')
+    parser.add_argument('--postings', type=Path, required=True,
+                        help='Target postings (.csv or .jsonl; columns: variant, role, company/institute, ...)')
+    parser.add_argument('--variant', choices=list(VARIANTS),
+                        help='Variant for postings without a variant column')
+    parser.add_argument('--date', default=date.today().strftime('%d %B %Y'),
+                        help='Letter date for postings without a date column (default: today, %(default)s)')
+    parser.add_argument('--output-dir', type=Path, required=True, help='Directory for <id>.txt/.tex/.pdf letters')
+    parser.add_argument('--formats', default='text,latex',
+                        help="Comma-separated formats: text, latex (default: text,latex)")
+    parser.add_argument('--pdf', action='store_true', help='Compile the LaTeX letters to PDF')
+    parser.add_argument('--class-dir', type=Path, default=Path('templates/altacv-class'),
+                        help='Directory with altacv.cls and .cfg files')
+    parser.add_argument('--cache-dir', type=Path, help='PDF cache directory (default: the CV build cache)')
+    parser.add_argument('--no-cache', action='store_true', help='Always run pdflatex')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Parallel pdflatex workers (default: number of CPUs)')
+    parser.add_argument('--preload', action='store_true',
+                        help='Compile against the precompiled per-variant formats shared with the CVs')
+    parser.add_argument('--format-dir', type=Path, help='Directory for precompiled .fmt files')
+    args = parser.parse_args()
+
+    if bool(args.store) != bool(args.candidate):
+        parser.error('--store and --candidate must be used together')
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(unknown)} (choose from: {', '.join(FORMATS)})")
+    if args.pdf and 'latex' not in formats:
+        formats.append('latex')
+    if not args.postings.exists():
+        print(f"Error: Postings file not found: {args.postings}", file=sys.stderr)
+        return 1
+
+    from candidate_store import CandidateStore
+    from generate import load_yaml_data, validate_data
+
+    try:
+        if args.store:
+            with CandidateStore(args.store) as store:
+                data = store.load(args.candidate)
+            validate_data(data)
+        else:
+            data = load_yaml_data(args.data_dir)
+        postings = read_postings(args.postings, args.variant, args.date)
+        written, tex_files, rejected = generate_letters(data, postings, args.output_dir, formats)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for letter_id, error in rejected.items():
+        print(f"❌ Skipped {letter_id}: {error}", file=sys.stderr)
+    print(f"✓ Generated {written} letters in {args.output_dir} ({', '.join(formats)})")
+
+    failed = []
+    if args.pdf and tex_files:
+        from compile_latex import compile_many
+        from latex_format import DEFAULT_FORMAT_DIR
+        from pdf_cache import DEFAULT_CACHE_DIR, PdfCache
+
+        cache = None if args.no_cache else PdfCache(args.cache_dir or DEFAULT_CACHE_DIR)
+        fmt_dir = (args.format_dir or DEFAULT_FORMAT_DIR) if args.preload else None
+        try:
+            results = compile_many(tex_files, args.class_dir, cache, args.jobs, fmt_dir)
+        except FileNotFoundError as e:
+            print(f"Error: {e.filename or 'pdflatex'} not found - is TeX Live installed?", file=sys.stderr)
+            return 1
+        failed = [tex for tex, status in results.items() if status == 'failed']
+        cached = sum(1 for status in results.values() if status == 'cached')
+        print(f"Compiled {len(results) - cached - len(failed)}, cached {cached}, failed {len(failed)}")
+
+    return 1 if rejected or failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
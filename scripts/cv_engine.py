@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Rendering engine for declarative CV variants.
+
+A variant is a VariantSpec: a Theme (fonts, colours, font sizes) plus the
+elements of the main column and the sidebar (headings, experience events,
+strengths, skill tags, education, ...). compile_variant() turns a spec into
+a render function once - constant LaTeX is formatted and escaped up front,
+tag queries are parsed - and that function is reused for every candidate.
+
+Element titles are plain text; they are escaped when the spec is compiled.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from instrument import iter_span
+from latex_escape import escape_latex
+from tag_index import compile_query, tag_index
+
+# A compiled element: data -> LaTeX fragments
+Renderer = Callable[[Dict[str, Any]], Iterator[str]]
+
+@dataclass(frozen=True)
+class Heading:
+    """\\cvsection{title}"""
+    title: str
+
+    def compile(self) -> Renderer:
+        text = f"\\cvsection{{{escape_latex(self.title)}}}\n\n"
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            yield text
+        return render
+
+@dataclass(frozen=True)
+class Subheading:
+    """A bold run-in heading inside a section."""
+    title: str
+
+    def compile(self) -> Renderer:
+        text = f"\\textbf{{{escape_latex(self.title)}}}\n\n"
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            yield text
+        return render
+
+@dataclass(frozen=True)
+class Spacer:
+    """Vertical space, e.g. \\medskip."""
+    command: str = 'medskip'
+
+    def compile(self) -> Renderer:
+        text = f"\\{self.command}\n\n"
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            yield text
+        return render
+
+@dataclass(frozen=True)
+class Divider:
+    """\\divider, optionally followed by a skip (\\divider\\smallskip)."""
+    skip: Optional[str] = None
+
+    def compile(self) -> Renderer:
+        text = "\\divider" + (f"\\{self.skip}" if self.skip else '') + "\n\n"
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            yield text
+        return render
+
+@dataclass(frozen=True)
+class Profile:
+    """One strength as a profile paragraph (optionally with its title)."""
+    index: int = 0
+    show_title: bool = False
+
+    def compile(self) -> Renderer:
+        index, show_title = self.index, self.show_title
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            strength = data['strengths'][index]
+            if show_title:
+                yield f"\\textbf{{{escape_latex(strength['title'])}}}\n\n"
+            yield f"{escape_latex(strength['description'])}\n\n"
+        return render
+
+def _dividers(entries: Any, divider: str) -> Iterator[Tuple[Any, bool]]:
+    """Yield (entry, divider_after) for divider='always' or 'between'."""
+    last = len(entries) - 1
+    for i, entry in enumerate(entries):
+        yield entry, divider == 'always' or (divider == 'between' and i != last)
+
+@dataclass(frozen=True)
+class Events:
+    """Experience entries matching a tag query, as \\cvevent blocks.
+
+    achievements caps the bullets of every entry, or of each entry in turn
+    when given as a tuple (as page_fit.py does).
+    """
+    query: str
+    limit: int
+    achievements: Union[int, Tuple[int, ...]]
+    divider: str = 'always'
+
+    def compile(self) -> Renderer:
+        query = compile_query(self.query)
+        limit, divider = self.limit, self.divider
+        counts = self.achievements if isinstance(self.achievements, tuple) else (self.achievements,) * limit
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            index = tag_index(data['experience'])
+            for (job, divide), count in zip(_dividers(index.entries(query(index))[:limit], divider), counts):
+                yield f"\\cvevent{{{escape_latex(job['title'])}}}{{{escape_latex(job['company'])}}}"
+                yield f"{{{job['start_date']}--{job['end_date']}}}{{{escape_latex(job['location'])}}}\n"
+                yield "\\begin{itemize}\n"
+                for achievement in job['achievements'][:count]:
+                    yield f"\\item {escape_latex(achievement)}\n"
+                yield "\\end{itemize}\n\n"
+                if divide:
+                    yield "\\divider\n\n"
+        return render
+
+@dataclass(frozen=True)
+class Achievements:
+    """The first strengths as \\cvachievement entries with an icon."""
+    limit: int
+    icon: str
+    divider: str = 'between'
+
+    def compile(self) -> Renderer:
+        limit, divider = self.limit, self.divider
+        icon = f"\\{self.icon}"
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            for strength, divide in _dividers(data['strengths'][:limit], divider):
+                yield f"\\cvachievement{{{icon}}}{{{escape_latex(strength['title'])}}}{{{escape_latex(strength['description'])}}}\n\n"
+                if divide:
+                    yield "\\divider\n\n"
+        return render
+
+@dataclass(frozen=True)
+class Tags:
+    """A run of \\cvtag entries, closed by a blank line.
+
+    Reads data[section], narrowed to [key] for mappings (skills) and to each
+    entry's [field] for lists of records (certifications).
+    """
+    section: str
+    key: Optional[str] = None
+    field: Optional[str] = None
+    limit: Optional[int] = None
+
+    def compile(self) -> Renderer:
+        section, key, field, limit = self.section, self.key, self.field, self.limit
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            items = data[section]
+            if key is not None:
+                items = items[key]
+            if limit is not None:
+                items = items[:limit]
+            for item in items:
+                yield f"\\cvtag{{{escape_latex(item[field] if field else item)}}}\n"
+            yield "\n"
+        return render
+
+@dataclass(frozen=True)
+class Education:
+    """Every education entry as a \\cvevent with optional notes."""
+    show_specialization: bool = True
+
+    def compile(self) -> Renderer:
+        show_specialization = self.show_specialization
+
+        def render(data: Dict[str, Any]) -> Iterator[str]:
+            for edu in data['education']:
+                degree = escape_latex(edu['degree'])
+                if show_specialization and edu.get('specialization'):
+                    degree += f" ({escape_latex(edu['specialization'])})"
+                yield f"\\cvevent{{{degree}}}{{{escape_latex(edu['institution'])}}}"
+                yield f"{{{edu['start_date']}--{edu['end_date']}}}{{{escape_latex(edu['location'])}}}\n\n"
+                if edu.get('notes'):
+                    yield f"{escape_latex(edu['notes'])}\n\n"
+        return render
+
+@dataclass(frozen=True)
+class Theme:
+    """Preamble settings: fonts, colours and font sizes."""
+    comment: str
+    # Font setup for XeLaTeX/LuaLaTeX (\iftutex) and for pdfLaTeX
+    unicode_fonts: Tuple[str, ...]
+    pdftex_fonts: Tuple[str, ...]
+    # (name, HTML hex) pairs, then (altacv colour role, colour name) pairs
+    colors: Tuple[Tuple[str, str], ...]
+    roles: Tuple[Tuple[str, str], ...]
+    namefont: str
+    personalinfofont: str
+    cvsectionfont: str
+    cvsubsectionfont: str
+    linkedin_note: str = ''
+
+    def preamble(self) -> str:
+        lines = [
+            r'\documentclass[10pt,a4paper,withhyper]{altacv}',
+            '',
+            r'\geometry{left=1cm,right=1cm,top=1.5cm,bottom=1.5cm,columnsep=1.5cm}',
+            '',
+            r'\usepackage{paracol}',
+            '',
+            r'\iftutex',
+            *(f"  {line}" for line in self.unicode_fonts),
+            r'  \renewcommand{\familydefault}{\sfdefault}',
+            r'\else',
+            *(f"  {line}" for line in self.pdftex_fonts),
+            r'  \renewcommand{\familydefault}{\sfdefault}',
+            r'\fi',
+            '',
+            f"% {self.comment}",
+            *(f"\\definecolor{{{name}}}{{HTML}}{{{value}}}" for name, value in self.colors),
+            *(f"\\colorlet{{{role}}}{{{name}}}" for role, name in self.roles),
+            '',
+            f"\\renewcommand{{\\namefont}}{{{self.namefont}}}",
+            f"\\renewcommand{{\\personalinfofont}}{{{self.personalinfofont}}}",
+            f"\\renewcommand{{\\cvsectionfont}}{{{self.cvsectionfont}}}",
+            f"\\renewcommand{{\\cvsubsectionfont}}{{{self.cvsubsectionfont}}}",
+            '',
+            r'\renewcommand{\cvItemMarker}{{\small\textbullet}}',
+            r'\renewcommand{\cvRatingMarker}{\faCircle}',
+            '',
+            *([f"% {self.linkedin_note}"] if self.linkedin_note else []),
+            r'\renewcommand{\linkedin}[1]{%',
+            r'  \printinfo{\faLinkedin}{LinkedIn}[https://linkedin.com/in/#1]%',
+            '}',
+            '',
+            r'\begin{document}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+@dataclass(frozen=True)
+class VariantSpec:
+    """A complete two-column CV variant."""
+    name: str
+    theme: Theme
+    main: Tuple[Any, ...]
+    sidebar: Tuple[Any, ...]
+    # Key into personal.taglines (defaults to the variant name)
+    tagline: Optional[str] = None
+
+def personal_header(personal: Dict[str, Any], tagline_key: str) -> Iterator[str]:
+    """Stream the name, tagline and contact header (shared with cover letters)."""
+    # Personal info
+    yield f"\\name{{{escape_latex(personal['first_name'])} {escape_latex(personal['last_name'])}}}\n"
+    yield f"\\tagline{{{escape_latex(personal['taglines'][tagline_key])}}}\n\n"
+
+    yield "\\personalinfo{%\n"
+    yield f"  \\email{{{escape_latex(personal['email'])}}}\n"
+    yield f"  \\phone{{{escape_latex(personal['phone'])}}}\n"
+    yield f"  \\location{{{escape_latex(personal['location'])}}}\n"
+
+    website = personal['website'].replace('https://', '').replace('http://', '')
+    yield f"  \\homepage{{{escape_latex(website)}}}\n"
+
+    linkedin_id = personal['linkedin'].replace('https://www.linkedin.com/in/', '').replace('https://linkedin.com/in/', '').replace('/', '')
+    yield f"  \\linkedin{{{escape_latex(linkedin_id)}}}\n"
+
+    github_user = personal['github'].replace('https://github.com/', '').replace('/', '')
+    yield f"  \\github{{{escape_latex(github_user)}}}\n"
+    yield "}\n\n"
+
+    yield "\\makecvheader\n\n"
+
+def header_section(personal: Dict[str, Any], tagline_key: str) -> Iterator[str]:
+    """Stream the name, tagline and contact header, then open the two-column body."""
+    yield from personal_header(personal, tagline_key)
+    yield "\\columnratio{0.6}\n\n"
+    yield "\\begin{paracol}{2}\n\n"
+
+def span_name(element: Any) -> str:
+    """Trace span name of an element, e.g. 'latex.Tags:skills'."""
+    detail = getattr(element, 'title', None) or getattr(element, 'section', None) or getattr(element, 'query', None)
+    name = f"latex.{type(element).__name__}"
+    return f"{name}:{detail}" if detail else name
+
+@lru_cache(maxsize=64)
+def compile_variant(spec: VariantSpec) -> Renderer:
+    """Compile a spec once into a function streaming its LaTeX for any candidate."""
+    preamble = spec.theme.preamble()
+    tagline = spec.tagline or spec.name
+    main = [(span_name(element), element.compile()) for element in spec.main]
+    sidebar = [(span_name(element), element.compile()) for element in spec.sidebar]
+
+    def render(data: Dict[str, Any]) -> Iterator[str]:
+        yield preamble
+        yield from iter_span('latex.header', header_section(data['personal'], tagline), variant=spec.name)
+        for name, element in main:
+            yield from iter_span(name, element(data), variant=spec.name)
+        yield "\\switchcolumn\n\n"
+        for name, element in sidebar:
+            yield from iter_span(name, element(data), variant=spec.name)
+        yield "\\end{paracol}\n\n"
+        yield "\\end{document}\n"
+    return render
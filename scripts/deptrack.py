@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Record which parts of the YAML data a generator actually reads.
+
+track(data) wraps the loaded data in read-only proxies that log every access
+by path: scalar values read, list lengths and slices taken, membership tests,
+key lookups. The log is turned into a manifest of (path, kind, digest)
+entries and saved next to the generated .tex. A later build re-resolves each
+recorded path on the new data; if every digest still matches, the variant's
+output cannot have changed and regeneration (and recompilation) is skipped.
+
+For example, a variant that renders strengths[:3] records the length of that
+slice and the fields it printed from those three entries, so editing
+strengths[4] or cover-letter-template.yaml leaves it up to date.
+"""
+
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+
+Path_ = Tuple[Any, ...]
+
+class AccessLog:
+    """The set of reads made through a tracked data tree."""
+
+    def __init__(self):
+        self.reads: Set[Tuple[Path_, str, Any]] = set()
+
+    def record(self, path: Path_, kind: str, arg: Any = None) -> None:
+        self.reads.add((path, kind, arg))
+
+def _wrap(value: Any, path: Path_, log: AccessLog) -> Any:
+    if isinstance(value, dict):
+        return TrackedDict(value, path, log)
+    if isinstance(value, list):
+        return TrackedList(value, path, log, range(len(value)))
+    log.record(path, 'value')
+    return value
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, (TrackedDict, TrackedList)):
+        return value.raw()
+    return value
+
+class TrackedDict:
+    """Read-only dict proxy that records key lookups."""
+
+    __slots__ = ('_data', '_path', '_log')
+
+    def __init__(self, data: Dict[str, Any], path: Path_, log: AccessLog):
+        self._data = data
+        self._path = path
+        self._log = log
+
+    def raw(self) -> Dict[str, Any]:
+        self._log.record(self._path, 'value')
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        self._log.record(self._path, 'has', key)
+        return _wrap(self._data[key], self._path + (key,), self._log)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._log.record(self._path, 'has', key)
+        if key not in self._data:
+            return default
+        return _wrap(self._data[key], self._path + (key,), self._log)
+
+    def __contains__(self, key: str) -> bool:
+        self._log.record(self._path, 'has', key)
+        return key in self._data
+
+    def keys(self) -> List[str]:
+        self._log.record(self._path, 'keys')
+        return list(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        self._log.record(self._path, 'keys')
+        return len(self._data)
+
+    def values(self) -> List[Any]:
+        return [self[key] for key in self.keys()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, TrackedDict) and other._log is self._log:
+            # Only the outcome matters (e.g. "is this the last entry?")
+            self._log.record(self._path, 'eq', other._path)
+            return self._data == other._data
+        return self.raw() == _unwrap(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+class TrackedList:
+    """Read-only list proxy (or view of a slice of one) that records reads.
+
+    indices maps positions in this view to positions in the underlying list,
+    so elements of a slice are recorded under their real paths. origin is the
+    (start, stop, step) of the slice the view came from, or None for the
+    whole list; the view's length is recorded through it, since the clamped
+    range would miss a list growing past its old length.
+    """
+
+    __slots__ = ('_data', '_path', '_log', '_indices', '_origin')
+
+    def __init__(self, data: List[Any], path: Path_, log: AccessLog, indices: range,
+                 origin: Optional[Tuple[Any, Any, Any]] = None):
+        self._data = data
+        self._path = path
+        self._log = log
+        self._indices = indices
+        self._origin = origin
+
+    def _record_len(self) -> None:
+        if self._origin is None:
+            self._log.record(self._path, 'len')
+        else:
+            self._log.record(self._path, 'slice', self._origin)
+
+    def raw(self) -> List[Any]:
+        if self._origin is None:
+            self._log.record(self._path, 'value')
+        else:
+            for i in self._indices:
+                self._log.record(self._path + (i,), 'value')
+            self._record_len()
+        return [self._data[i] for i in self._indices]
+
+    def __len__(self) -> int:
+        self._record_len()
+        return len(self._indices)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        self._record_len()
+        for i in self._indices:
+            yield _wrap(self._data[i], self._path + (i,), self._log)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            if self._origin is None:
+                origin = (index.start, index.stop, index.step)
+            else:
+                # A slice of a slice: its length follows from the outer view's
+                origin = self._origin
+            self._log.record(self._path, 'slice', origin)
+            return TrackedList(self._data, self._path, self._log, self._indices[index], origin)
+        if index < 0 or index >= len(self._indices):
+            self._record_len()
+        i = self._indices[index]
+        return _wrap(self._data[i], self._path + (i,), self._log)
+
+    def __contains__(self, item: Any) -> bool:
+        return _unwrap(item) in self.raw()
+
+    def __eq__(self, other: Any) -> bool:
+        return self.raw() == _unwrap(other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+def track(data: Dict[str, Any]) -> Tuple[TrackedDict, AccessLog]:
+    """Wrap data for tracking; returns (proxy, log)."""
+    log = AccessLog()
+    return TrackedDict(data, (), log), log
+
+_MISSING = '<missing>'
+
+def _resolve(data: Any, path: Path_) -> Any:
+    for part in path:
+        try:
+            data = data[part]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+    return data
+
+def _digest_read(data: Dict[str, Any], path: Path_, kind: str, arg: Any) -> str:
+    target = _resolve(data, path)
+    if target is _MISSING:
+        value = _MISSING
+    elif kind == 'value':
+        value = target
+    elif kind == 'len':
+        value = len(target) if isinstance(target, list) else _MISSING
+    elif kind == 'slice':
+        value = len(target[slice(*arg)]) if isinstance(target, list) else _MISSING
+    elif kind == 'has':
+        value = isinstance(target, dict) and arg in target
+    elif kind == 'keys':
+        value = list(target) if isinstance(target, dict) else _MISSING
+    elif kind == 'eq':
+        value = target == _resolve(data, tuple(arg))
+    else:
+        raise ValueError(f"Unknown read kind: {kind}")
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+def build_manifest(log: AccessLog, data: Dict[str, Any], code_digest: str) -> Dict[str, Any]:
+    """Turn an access log into a manifest of reads with their current digests."""
+    reads = sorted(log.reads, key=lambda r: json.dumps(r, default=str))
+    return {
+        'version': MANIFEST_VERSION,
+        'code': code_digest,
+        'reads': [[list(path), kind, arg, _digest_read(data, path, kind, arg)] for path, kind, arg in reads],
+    }
+
+def manifest_path(output: Path) -> Path:
+    """Manifest location for a generated file: <output>.deps.json alongside it."""
+    return output.with_name(output.name + '.deps.json')
+
+def save_manifest(manifest: Dict[str, Any], output: Path) -> None:
+    with open(manifest_path(output), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+def load_manifest(output: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path(output), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def changed_reads(manifest: Dict[str, Any], data: Dict[str, Any]) -> List[str]:
+    """Return human-readable paths whose recorded digest no longer matches data."""
+    changed = []
+    for path, kind, arg, digest in manifest['reads']:
+        arg = tuple(arg) if isinstance(arg, list) else arg  # JSON turns tuples into lists
+        if _digest_read(data, tuple(path), kind, arg) != digest:
+            changed.append(format_read(path, kind, arg))
+    return changed
+
+def format_read(path: List[Any], kind: str, arg: Any) -> str:
+    text = ''.join(f"[{p}]" if isinstance(p, int) else (f".{p}" if i else p) for i, p in enumerate(path))
+    if kind == 'slice':
+        start, stop, _ = arg
+        return f"len({text}[{start}:{stop}])"
+    if kind == 'len':
+        return f"len({text})"
+    if kind == 'has':
+        return f"{text}.{arg}?" if text else f"{arg}?"
+    if kind == 'keys':
+        return f"keys({text})"
+    if kind == 'eq':
+        return f"{text} == {format_read(list(arg), 'value', None)}"
+    return text
+
+def is_up_to_date(output: Path, data: Dict[str, Any], code_digest: str) -> Tuple[bool, List[str]]:
+    """Check whether output is current for data; returns (up_to_date, reasons)."""
+    if not output.exists():
+        return False, ['output missing']
+    manifest = load_manifest(output)
+    if manifest is None or manifest.get('version') != MANIFEST_VERSION:
+        return False, ['no dependency manifest']
+    if manifest.get('code') != code_digest:
+        return False, ['generator code changed']
+    changed = changed_reads(manifest, data)
+    return not changed, changed
+
+def code_digest(paths: List[Path]) -> str:
+    """Fingerprint of the generator sources, so code edits invalidate every manifest."""
+    h = hashlib.sha256()
+    for path in sorted(paths):
+        h.update(path.name.encode('utf-8') + b'\0')
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
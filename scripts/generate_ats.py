@@ -8,220 +8,626 @@ ATS systems parse text-based content and look for keywords. This generator:
 - Includes all keywords prominently
 - Avoids complex formatting that confuses parsers
 - Structures data in a way ATS systems expect
+
+The data is traversed once per CV (iter_sections); every requested output
+format (plain text, Markdown, JSON Resume, HR-XML) renders each section as
+it is produced, so all formats come from the same selection of content.
+Bulk exports stream one candidate at a time into a JSONL file or a tar
+archive, so a whole store is never held in memory.
 """
 
-import yaml
+import io
+import sys
+import json
+import time
+import tarfile
 import argparse
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+
+from candidate_store import CandidateStore, resolve_candidates
+from instrument import iter_span, span
+from latex_writer import SectionWriter
+from schema import validate_candidate
+from tag_index import tag_index
+from tailor import read_job, tailor_data
+from yaml_loader import load_data_dir
+
+# Sources validate_data depends on; editing either invalidates the snapshots.
+VALIDATOR_SOURCES = tuple(Path(__file__).resolve().parent / name for name in ('schema.py', 'generate_ats.py'))
 
 def load_yaml_data(data_dir: Path) -> Dict[str, Any]:
-    """Load all YAML files."""
-    data = {}
-    required_files = ['personal', 'experience', 'skills', 'strengths', 'education', 'certifications']
-
-    for yaml_file in data_dir.glob('*.yaml'):
-        with open(yaml_file) as f:
-            data[yaml_file.stem] = yaml.safe_load(f)
-
-    missing = [f for f in required_files if f not in data]
-    if missing:
-        raise ValueError(f"Missing required YAML files: {', '.join(missing)}.yaml")
-
-    return data
-
-def generate_header(personal: Dict[str, Any], tagline_key: str) -> str:
-    """Generate header section with contact info."""
-    lines = []
-
-    # Name - centered, all caps for ATS visibility
-    name = f"{personal['first_name']} {personal['last_name']}".upper()
-    lines.append(name)
-    lines.append(personal['taglines'][tagline_key])
-    lines.append("")
-
-    # Contact info - one item per line for ATS parsing
-    lines.append("CONTACT INFORMATION")
-    lines.append("-" * 50)
-    lines.append(f"Email: {personal['email']}")
-    lines.append(f"Phone: {personal['phone']}")
-    lines.append(f"Location: {personal['location']}")
-    lines.append(f"LinkedIn: {personal['linkedin']}")
-    lines.append(f"GitHub: {personal['github']}")
-    lines.append(f"Website: {personal['website']}")
-    lines.append("")
-
-    return "\n".join(lines)
-
-def generate_summary(strengths: List[Dict[str, Any]], role_tags: List[str]) -> str:
-    """Generate professional summary optimized for ATS keywords."""
-    lines = []
-    lines.append("PROFESSIONAL SUMMARY")
-    lines.append("-" * 50)
+    """Load all YAML files (served from the snapshot cache when unchanged)."""
+    return load_data_dir(data_dir, validate_data, VALIDATOR_SOURCES)
+
+def validate_data(data: Dict[str, Any]) -> None:
+    """Check the data against the schema (see schema.py)."""
+    errors = validate_candidate(data)
+    if errors:
+        raise ValueError(f"{len(errors)} schema errors:\n  " + '\n  '.join(errors))
+
+# Map variants to tagline keys and role tags
+VARIANT_CONFIG = {
+    'industrial-scientist': {
+        'tagline_key': 'industrial-scientist',
+        'role_tags': ['industrial-scientist', 'nanoscience', 'leadership']
+    },
+    'academic-researcher': {
+        'tagline_key': 'academic-researcher',
+        'role_tags': ['academic-researcher', 'scattering-physics', 'trust']
+    }
+}
+
+@dataclass(frozen=True)
+class Section:
+    """One CV section with its content already selected for the variant."""
+    name: str
+    body: Any
+
+def iter_sections(data: Dict[str, Any], variant: str) -> Iterator[Section]:
+    """Select each section's content for a variant, in document order."""
+    config = VARIANT_CONFIG[variant]
+    role_tags = config['role_tags']
+
+    personal = data['personal']
+    yield Section('header', {'personal': personal, 'tagline': personal['taglines'][config['tagline_key']]})
 
     # Use the first matching strength's description
-    relevant_strengths = [s for s in strengths if any(tag in s.get('tags', []) for tag in role_tags)]
+    strengths = data['strengths']
+    relevant_strengths = tag_index(strengths).any_of(role_tags)
     if relevant_strengths:
-        lines.append(relevant_strengths[0]['description'])
-    elif strengths:
-        lines.append(strengths[0]['description'])
-
-    lines.append("")
-    return "\n".join(lines)
-
-def generate_skills(skills: Dict[str, List[str]]) -> str:
-    """Generate skills section with clear categorization for ATS."""
-    lines = []
-    lines.append("TECHNICAL SKILLS")
-    lines.append("-" * 50)
-
-    for category, items in skills.items():
-        lines.append(f"\n{category}:")
-        # List all skills on separate lines OR comma-separated
-        # Different ATS systems prefer different formats, so we use both:
-        skills_line = ", ".join(items)
-        lines.append(skills_line)
-
-    lines.append("")
-    return "\n".join(lines)
-
-def generate_experience(experience: List[Dict[str, Any]], role_tags: List[str]) -> str:
-    """Generate experience section."""
-    lines = []
-    lines.append("PROFESSIONAL EXPERIENCE")
-    lines.append("-" * 50)
+        yield Section('summary', relevant_strengths[0]['description'])
+    else:
+        yield Section('summary', strengths[0]['description'] if strengths else None)
+
+    yield Section('skills', data['skills'])
 
     # Filter experience by tags
-    relevant_exp = [e for e in experience if any(tag in e.get('tags', []) for tag in role_tags)]
-    if not relevant_exp:
-        relevant_exp = experience  # Fall back to all experience
+    experience = data['experience']
+    yield Section('experience', tag_index(experience).any_of(role_tags) or experience)  # Fall back to all experience
+
+    yield Section('education', data['education'])
+
+    if data['certifications']:
+        # Filter certifications by tags
+        certifications = data['certifications']
+        yield Section('certifications', tag_index(certifications).any_of(role_tags) or certifications[:5])  # Limit to top 5 if no filtering
+
+class TextFormat:
+    """Plain text: simple, linear and parseable by any ATS."""
+    extension = 'txt'
+
+    def begin(self) -> str:
+        return ""
 
-    for job in relevant_exp:
+    def header(self, body: Dict[str, Any]) -> str:
+        personal = body['personal']
+        lines = []
+
+        # Name - centered, all caps for ATS visibility
+        name = f"{personal['first_name']} {personal['last_name']}".upper()
+        lines.append(name)
+        lines.append(body['tagline'])
         lines.append("")
-        lines.append(f"{job['title']}")
-        lines.append(f"{job['company']} | {job['location']}")
-        lines.append(f"{job['start_date']} - {job['end_date']}")
+
+        # Contact info - one item per line for ATS parsing
+        lines.append("CONTACT INFORMATION")
+        lines.append("-" * 50)
+        lines.append(f"Email: {personal['email']}")
+        lines.append(f"Phone: {personal['phone']}")
+        lines.append(f"Location: {personal['location']}")
+        lines.append(f"LinkedIn: {personal['linkedin']}")
+        lines.append(f"GitHub: {personal['github']}")
+        lines.append(f"Website: {personal['website']}")
         lines.append("")
 
-        for achievement in job['achievements']:
-            lines.append(f"• {achievement}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, description: Optional[str]) -> str:
+        lines = []
+        lines.append("PROFESSIONAL SUMMARY")
+        lines.append("-" * 50)
+        if description is not None:
+            lines.append(description)
+        lines.append("")
+        return "\n".join(lines) + "\n"
 
-    lines.append("")
-    return "\n".join(lines)
+    def skills(self, skills: Dict[str, List[str]]) -> str:
+        lines = []
+        lines.append("TECHNICAL SKILLS")
+        lines.append("-" * 50)
 
-def generate_education(education: List[Dict[str, Any]]) -> str:
-    """Generate education section."""
-    lines = []
-    lines.append("EDUCATION")
-    lines.append("-" * 50)
+        for category, items in skills.items():
+            lines.append(f"\n{category}:")
+            # List all skills on separate lines OR comma-separated
+            # Different ATS systems prefer different formats, so we use both:
+            skills_line = ", ".join(items)
+            lines.append(skills_line)
 
-    for edu in education:
         lines.append("")
-        lines.append(edu['degree'])
-        if edu.get('specialization'):
-            lines.append(f"Specialization: {edu['specialization']}")
-        lines.append(f"{edu['institution']} | {edu['location']}")
-        lines.append(f"{edu['start_date']} - {edu['end_date']}")
-
-    lines.append("")
-    return "\n".join(lines)
-
-def generate_certifications(certifications: List[Dict[str, Any]], role_tags: List[str]) -> str:
-    """Generate certifications section."""
-    lines = []
-    lines.append("CERTIFICATIONS")
-    lines.append("-" * 50)
-
-    # Filter certifications by tags
-    relevant_certs = [c for c in certifications if any(tag in c.get('tags', []) for tag in role_tags)]
-    if not relevant_certs:
-        relevant_certs = certifications[:5]  # Limit to top 5 if no filtering
-
-    for cert in relevant_certs:
-        lines.append(f"• {cert['name']}")
-        if cert.get('issuer'):
-            lines.append(f"  Issued by: {cert['issuer']}")
-        if cert.get('date'):
-            lines.append(f"  Date: {cert['date']}")
-
-    lines.append("")
-    return "\n".join(lines)
+        return "\n".join(lines) + "\n"
 
-def generate_ats_cv(data: Dict[str, Any], variant: str) -> str:
-    """Generate complete ATS-friendly CV."""
+    def experience(self, jobs: List[Dict[str, Any]]) -> str:
+        lines = []
+        lines.append("PROFESSIONAL EXPERIENCE")
+        lines.append("-" * 50)
+
+        for job in jobs:
+            lines.append("")
+            lines.append(f"{job['title']}")
+            lines.append(f"{job['company']} | {job['location']}")
+            lines.append(f"{job['start_date']} - {job['end_date']}")
+            lines.append("")
 
-    # Map variants to tagline keys and role tags
-    variant_config = {
-        'industrial-scientist': {
-            'tagline_key': 'industrial-scientist',
-            'role_tags': ['industrial-scientist', 'nanoscience', 'leadership']
-        },
-        'academic-researcher': {
-            'tagline_key': 'academic-researcher',
-            'role_tags': ['academic-researcher', 'scattering-physics', 'trust']
+            for achievement in job['achievements']:
+                lines.append(f"• {achievement}")
+
+        lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def education(self, education: List[Dict[str, Any]]) -> str:
+        lines = []
+        lines.append("EDUCATION")
+        lines.append("-" * 50)
+
+        for edu in education:
+            lines.append("")
+            lines.append(edu['degree'])
+            if edu.get('specialization'):
+                lines.append(f"Specialization: {edu['specialization']}")
+            lines.append(f"{edu['institution']} | {edu['location']}")
+            lines.append(f"{edu['start_date']} - {edu['end_date']}")
+
+        lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def certifications(self, certifications: List[Dict[str, Any]]) -> str:
+        lines = []
+        lines.append("CERTIFICATIONS")
+        lines.append("-" * 50)
+
+        for cert in certifications:
+            lines.append(f"• {cert['name']}")
+            if cert.get('issuer'):
+                lines.append(f"  Issued by: {cert['issuer']}")
+            if cert.get('date'):
+                lines.append(f"  Date: {cert['date']}")
+
+        lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def end(self) -> str:
+        # Add footer note
+        return "\n".join([
+            "",
+            "-" * 50,
+            "This is an ATS-optimized version of my CV.",
+            "For a formatted PDF version, please visit my website or LinkedIn profile.",
+            "",
+        ])
+
+CONTACT_FIELDS = [('Email', 'email'), ('Phone', 'phone'), ('Location', 'location'),
+                  ('LinkedIn', 'linkedin'), ('GitHub', 'github'), ('Website', 'website')]
+
+class MarkdownFormat:
+    """Markdown, for job boards and portals that accept formatted text."""
+    extension = 'md'
+
+    def begin(self) -> str:
+        return ""
+
+    def header(self, body: Dict[str, Any]) -> str:
+        personal = body['personal']
+        lines = [f"# {personal['first_name']} {personal['last_name']}", "", f"*{body['tagline']}*", ""]
+        lines += [f"- **{label}:** {personal[key]}" for label, key in CONTACT_FIELDS if personal.get(key)]
+        return "\n".join(lines) + "\n"
+
+    def summary(self, description: Optional[str]) -> str:
+        return f"\n## Professional Summary\n\n{description.strip()}\n" if description else ""
+
+    def skills(self, skills: Dict[str, List[str]]) -> str:
+        lines = ["", "## Technical Skills", ""]
+        lines += [f"- **{category}:** {', '.join(items)}" for category, items in skills.items()]
+        return "\n".join(lines) + "\n"
+
+    def experience(self, jobs: List[Dict[str, Any]]) -> str:
+        lines = ["", "## Professional Experience"]
+        for job in jobs:
+            lines += ["", f"### {job['title']}, {job['company']}", "",
+                      f"{job['location']} | {job['start_date']} - {job['end_date']}", ""]
+            lines += [f"- {achievement}" for achievement in job['achievements']]
+        return "\n".join(lines) + "\n"
+
+    def education(self, education: List[Dict[str, Any]]) -> str:
+        lines = ["", "## Education"]
+        for edu in education:
+            lines += ["", f"### {edu['degree']}", ""]
+            if edu.get('specialization'):
+                lines.append(f"Specialization: {edu['specialization']}  ")
+            lines.append(f"{edu['institution']}, {edu['location']} | {edu['start_date']} - {edu['end_date']}")
+        return "\n".join(lines) + "\n"
+
+    def certifications(self, certifications: List[Dict[str, Any]]) -> str:
+        lines = ["", "## Certifications", ""]
+        for cert in certifications:
+            details = [f"issued by {cert['issuer']}" if cert.get('issuer') else '', str(cert.get('date') or '')]
+            details = [d for d in details if d]
+            lines.append(f"- {cert['name']}" + (f" ({', '.join(details)})" if details else ""))
+        return "\n".join(lines) + "\n"
+
+    def end(self) -> str:
+        return ""
+
+def _split_degree(degree: str) -> Tuple[str, str]:
+    """'MSc in Nanoscience' -> ('MSc', 'Nanoscience')."""
+    study_type, sep, area = degree.partition(' in ')
+    return (study_type, area) if sep else (degree, '')
+
+class JsonResumeFormat:
+    """JSON Resume (https://jsonresume.org/schema), written one top-level key at a time."""
+    extension = 'json'
+
+    def __init__(self):
+        self.basics: Dict[str, Any] = {}
+        self.keys = 0
+
+    def _field(self, key: str, value: Any) -> str:
+        prefix = ', ' if self.keys else ''
+        self.keys += 1
+        return f"{prefix}{json.dumps(key)}: {json.dumps(value, ensure_ascii=False, default=str)}"
+
+    def begin(self) -> str:
+        return "{"
+
+    def header(self, body: Dict[str, Any]) -> str:
+        personal = body['personal']
+        basics = {
+            'name': f"{personal['first_name']} {personal['last_name']}",
+            'label': body['tagline'],
+            'email': personal.get('email'),
+            'phone': personal.get('phone'),
+            'url': personal.get('website'),
+            'location': {'city': personal['location']} if personal.get('location') else None,
+            'profiles': [{'network': network, 'url': personal[key]}
+                         for network, key in (('LinkedIn', 'linkedin'), ('GitHub', 'github')) if personal.get(key)],
         }
-    }
+        # Held back until the summary section, which belongs in basics
+        self.basics = {k: v for k, v in basics.items() if v}
+        return ""
+
+    def summary(self, description: Optional[str]) -> str:
+        basics = dict(self.basics, summary=description.strip()) if description else self.basics
+        return self._field('basics', basics)
+
+    def skills(self, skills: Dict[str, List[str]]) -> str:
+        return self._field('skills', [{'name': category, 'keywords': list(items)}
+                                      for category, items in skills.items()])
+
+    def experience(self, jobs: List[Dict[str, Any]]) -> str:
+        return self._field('work', [{
+            'name': job['company'],
+            'position': job['title'],
+            'location': job['location'],
+            'startDate': job['start_date'],
+            'endDate': job['end_date'],
+            'highlights': list(job['achievements']),
+        } for job in jobs])
+
+    def education(self, education: List[Dict[str, Any]]) -> str:
+        entries = []
+        for edu in education:
+            study_type, area = _split_degree(edu['degree'])
+            if edu.get('specialization'):
+                area = f"{area} ({edu['specialization']})" if area else edu['specialization']
+            entries.append({'institution': edu['institution'], 'area': area, 'studyType': study_type,
+                            'startDate': edu['start_date'], 'endDate': edu['end_date']})
+        return self._field('education', entries)
+
+    def certifications(self, certifications: List[Dict[str, Any]]) -> str:
+        return self._field('certificates', [
+            {k: v for k, v in (('name', cert['name']), ('issuer', cert.get('issuer')), ('date', cert.get('date'))) if v}
+            for cert in certifications
+        ])
+
+    def end(self) -> str:
+        return "}\n"
+
+def _element(tag: str, text: Any) -> str:
+    return f"<{tag}>{xml_escape(str(text))}</{tag}>"
+
+def _any_date(tag: str, value: Any) -> str:
+    return f"<{tag}>{_element('AnyDate', value)}</{tag}>"
+
+class HrXmlFormat:
+    """HR-XML style StructuredXMLResume, for ATS imports that take XML."""
+    extension = 'xml'
+
+    def begin(self) -> str:
+        return '<?xml version="1.0" encoding="UTF-8"?>\n<Resume>\n  <StructuredXMLResume>\n'
+
+    def header(self, body: Dict[str, Any]) -> str:
+        personal = body['personal']
+        contact = [
+            _element('InternetEmailAddress', personal['email']) if personal.get('email') else '',
+            f"<Telephone>{_element('FormattedNumber', personal['phone'])}</Telephone>" if personal.get('phone') else '',
+        ]
+        contact += [_element('InternetWebAddress', personal[key])
+                    for key in ('website', 'linkedin', 'github') if personal.get(key)]
+        if personal.get('location'):
+            contact.append(f"<PostalAddress>{_element('Municipality', personal['location'])}</PostalAddress>")
+        return (
+            "    <ContactInfo>\n"
+            f"      <PersonName>{_element('GivenName', personal['first_name'])}"
+            f"{_element('FamilyName', personal['last_name'])}</PersonName>\n"
+            f"      <ContactMethod>{''.join(contact)}</ContactMethod>\n"
+            "    </ContactInfo>\n"
+            f"    {_element('Objective', body['tagline'])}\n"
+        )
+
+    def summary(self, description: Optional[str]) -> str:
+        return f"    {_element('ExecutiveSummary', description.strip())}\n" if description else ""
+
+    def skills(self, skills: Dict[str, List[str]]) -> str:
+        competencies = [
+            f'      <Competency name={quoteattr(skill)}>'
+            f'<TaxonomyId idOwner="cv-pipeline" description={quoteattr(category)}/></Competency>\n'
+            for category, items in skills.items() for skill in items
+        ]
+        return "    <Qualifications>\n" + ''.join(competencies) + "    </Qualifications>\n"
+
+    def experience(self, jobs: List[Dict[str, Any]]) -> str:
+        parts = ["    <EmploymentHistory>\n"]
+        for job in jobs:
+            parts.append(
+                f"      <EmployerOrg>{_element('EmployerOrgName', job['company'])}<PositionHistory>"
+                f"{_element('Title', job['title'])}"
+                f"<OrgInfo><PositionLocation>{_element('Municipality', job['location'])}</PositionLocation></OrgInfo>"
+                f"{_element('Description', chr(10).join(job['achievements']))}"
+                f"{_any_date('StartDate', job['start_date'])}{_any_date('EndDate', job['end_date'])}"
+                "</PositionHistory></EmployerOrg>\n"
+            )
+        parts.append("    </EmploymentHistory>\n")
+        return ''.join(parts)
+
+    def education(self, education: List[Dict[str, Any]]) -> str:
+        parts = ["    <EducationHistory>\n"]
+        for edu in education:
+            major = f"<DegreeMajor>{_element('Name', edu['specialization'])}</DegreeMajor>" if edu.get('specialization') else ''
+            parts.append(
+                f"      <SchoolOrInstitution><School>{_element('SchoolName', edu['institution'])}</School>"
+                f"<PostalAddress>{_element('Municipality', edu['location'])}</PostalAddress>"
+                f"<Degree>{_element('DegreeName', edu['degree'])}{major}"
+                f"<DatesOfAttendance>{_any_date('StartDate', edu['start_date'])}{_any_date('EndDate', edu['end_date'])}"
+                "</DatesOfAttendance></Degree></SchoolOrInstitution>\n"
+            )
+        parts.append("    </EducationHistory>\n")
+        return ''.join(parts)
+
+    def certifications(self, certifications: List[Dict[str, Any]]) -> str:
+        parts = ["    <LicensesAndCertifications>\n"]
+        for cert in certifications:
+            issuer = _element('IssuingAuthority', cert['issuer']) if cert.get('issuer') else ''
+            date = f"<EffectiveDate>{_any_date('ValidFrom', cert['date'])}</EffectiveDate>" if cert.get('date') else ''
+            parts.append(f"      <LicenseOrCertification>{_element('Name', cert['name'])}{issuer}{date}"
+                         "</LicenseOrCertification>\n")
+        parts.append("    </LicensesAndCertifications>\n")
+        return ''.join(parts)
+
+    def end(self) -> str:
+        return "  </StructuredXMLResume>\n</Resume>\n"
+
+# Format name -> writer class (one instance per document)
+FORMATS = {
+    'text': TextFormat,
+    'markdown': MarkdownFormat,
+    'json-resume': JsonResumeFormat,
+    'hr-xml': HrXmlFormat,
+}
+
+def stream_formats(data: Dict[str, Any], variant: str,
+                   formats: Sequence[str] = ('text',)) -> Iterator[Tuple[str, str]]:
+    """Yield (format, chunk) pairs from a single traversal of the data."""
+    writers = [(fmt, FORMATS[fmt]()) for fmt in formats]
+    for fmt, writer in writers:
+        yield fmt, writer.begin()
+    for section in iter_span('ats.select', iter_sections(data, variant), variant=variant):
+        with span(f"ats.{section.name}", variant=variant):
+            chunks = [(fmt, getattr(writer, section.name)(section.body)) for fmt, writer in writers]
+        yield from chunks
+    for fmt, writer in writers:
+        yield fmt, writer.end()
+
+def stream_cv(data: Dict[str, Any], variant: str, fmt: str = 'text') -> Iterator[str]:
+    """Yield one format's output section by section."""
+    for _, chunk in stream_formats(data, variant, (fmt,)):
+        yield chunk
+
+def render_formats(data: Dict[str, Any], variant: str, formats: Sequence[str]) -> Dict[str, str]:
+    """Render several formats of one CV at once."""
+    chunks: Dict[str, List[str]] = {fmt: [] for fmt in formats}
+    for fmt, chunk in stream_formats(data, variant, formats):
+        chunks[fmt].append(chunk)
+    return {fmt: ''.join(parts) for fmt, parts in chunks.items()}
 
-    config = variant_config[variant]
+def generate_ats_cv(data: Dict[str, Any], variant: str) -> str:
+    """Generate complete ATS-friendly CV."""
+    return ''.join(stream_cv(data, variant))
+
+class JsonlExport:
+    """One JSON object per candidate and variant, one format per key."""
+
+    def __init__(self, output: Path):
+        self.f = open(output, 'w', encoding='utf-8')
+
+    def add(self, candidate_id: str, variant: str, documents: Dict[str, str]) -> None:
+        fields = [f'"candidate": {json.dumps(candidate_id)}', f'"variant": {json.dumps(variant)}']
+        for fmt, document in documents.items():
+            # JSON Resume is already JSON; embed it as an object rather than a string
+            value = document.strip() if fmt == 'json-resume' else json.dumps(document, ensure_ascii=False)
+            fields.append(f'{json.dumps(fmt)}: {value}')
+        self.f.write('{' + ', '.join(fields) + '}\n')
+
+    def close(self) -> None:
+        self.f.close()
+
+class TarExport:
+    """<candidate>/<variant>.<ext> members in a streamed (optionally gzipped) tar."""
+
+    def __init__(self, output: Path):
+        mode = 'w|gz' if output.name.endswith(('.tar.gz', '.tgz')) else 'w|'
+        self.tar = tarfile.open(str(output), mode)
+
+    def add(self, candidate_id: str, variant: str, documents: Dict[str, str]) -> None:
+        for fmt, document in documents.items():
+            payload = document.encode('utf-8')
+            info = tarfile.TarInfo(f"{candidate_id}/{variant}.{FORMATS[fmt].extension}")
+            info.size = len(payload)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            self.tar.addfile(info, io.BytesIO(payload))
+
+    def close(self) -> None:
+        self.tar.close()
+
+def export_writer(output: Path):
+    """The bulk writer class for an output path, or None for a single document."""
+    if output.suffix == '.jsonl':
+        return JsonlExport
+    if output.name.endswith(('.tar', '.tar.gz', '.tgz')):
+        return TarExport
+    return None
+
+def resolve_list(spec: str, known: Sequence[str], what: str) -> List[str]:
+    """Expand 'all' or a comma-separated list, rejecting unknown names."""
+    if spec == 'all':
+        return list(known)
+    names = [s.strip() for s in spec.split(',') if s.strip()]
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise ValueError(f"Unknown {what}: {', '.join(unknown)}")
+    return names
+
+def iter_export_candidates(args) -> Iterator[Tuple[str, Any]]:
+    """Yield (candidate_id, data) one candidate at a time; invalid data is yielded as its ValueError."""
+    if args.data_dir:
+        print(f"Loading YAML data from {args.data_dir}...")
+        yield args.data_dir.resolve().name, load_yaml_data(args.data_dir)
+        return
+    with CandidateStore(args.store) as store:
+        candidate_ids = [args.candidate] if args.candidate else resolve_candidates(store, args.candidates)
+        for candidate_id, data in store.iter_candidates(candidate_ids):
+            try:
+                validate_data(data)
+            except ValueError as e:
+                yield candidate_id, e
+                continue
+            yield candidate_id, data
+
+def write_single(args) -> int:
+    """Write one candidate's CV for one variant in one format."""
+    # Load data
+    if args.store:
+        print(f"Loading candidate {args.candidate} from {args.store}...")
+        with CandidateStore(args.store) as store:
+            data = store.load(args.candidate)
+        validate_data(data)
+    else:
+        print(f"Loading YAML data from {args.data_dir}...")
+        data = load_yaml_data(args.data_dir)
 
-    # Build CV sections
-    sections = []
-    sections.append(generate_header(data['personal'], config['tagline_key']))
-    sections.append(generate_summary(data['strengths'], config['role_tags']))
-    sections.append(generate_skills(data['skills']))
-    sections.append(generate_experience(data['experience'], config['role_tags']))
-    sections.append(generate_education(data['education']))
+    if args.job:
+        print(f"Tailoring content to {args.job}")
+        data = tailor_data(data, read_job(args.job))
 
-    if data['certifications']:
-        sections.append(generate_certifications(data['certifications'], config['role_tags']))
+    # Generate ATS CV, writing each section as it is produced
+    print(f"Generating ATS-friendly CV for variant: {args.variant}")
+    with open(args.output, 'w', encoding='utf-8') as f:
+        writer = SectionWriter(f).write_all(stream_cv(data, args.variant, args.format))
 
-    # Add footer note
-    sections.append("")
-    sections.append("-" * 50)
-    sections.append("This is an ATS-optimized version of my CV.")
-    sections.append("For a formatted PDF version, please visit my website or LinkedIn profile.")
-    sections.append("")
+    print(f"✓ Generated {args.output}")
+    print(f"  Lines: {writer.lines}")
+    print(f"  Size: {writer.size} bytes")
+    if args.format == 'text':
+        print(f"\nATS Optimization Tips:")
+        print("  • Use this version when applying through online forms")
+        print("  • Copy/paste into text fields or upload as .txt")
+        print("  • All keywords are included for ATS parsing")
 
-    return "\n".join(sections)
+    return 0
 
 def main():
     parser = argparse.ArgumentParser(
         description='ATS-Friendly CV Generator',
-        epilog='Generates plain text CVs optimized for Applicant Tracking Systems'
+        epilog='Generates plain text CVs optimized for Applicant Tracking Systems. '
+               'An --output ending in .jsonl, .tar, .tar.gz or .tgz writes a bulk export.'
     )
-    parser.add_argument('--variant', required=True,
-                       choices=['academic-researcher', 'industrial-scientist'],
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--variant',
+                       choices=sorted(VARIANT_CONFIG),
                        help='CV variant to generate')
-    parser.add_argument('--data-dir', required=True, type=Path,
+    target.add_argument('--variants', metavar='LIST',
+                       help="Bulk export: 'all' or a comma-separated list of variants")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data-dir', type=Path,
                        help='Directory containing YAML data files')
+    source.add_argument('--store', type=Path,
+                       help='Candidate store file (see candidate_store.py)')
+    parser.add_argument('--candidate',
+                       help='Candidate ID to load from --store')
+    parser.add_argument('--candidates', metavar='LIST',
+                       help="Bulk export from --store: 'all' or a comma-separated list of candidate IDs")
+    parser.add_argument('--format', default='text', choices=sorted(FORMATS),
+                       help='Output format of a single CV (default: text)')
+    parser.add_argument('--formats', metavar='LIST',
+                       help="Bulk export: 'all' or a comma-separated list of formats (default: text)")
     parser.add_argument('--output', required=True, type=Path,
-                       help='Output .txt file path')
+                       help='Output file path (.txt, .md, .json, .xml; or .jsonl/.tar/.tar.gz for bulk export)')
+    parser.add_argument('--job', type=Path,
+                       help='Job description text file; order content by relevance to it (see tailor.py)')
     args = parser.parse_args()
 
-    try:
-        # Load data
-        print(f"Loading YAML data from {args.data_dir}...")
-        data = load_yaml_data(args.data_dir)
-
-        # Generate ATS CV
-        print(f"Generating ATS-friendly CV for variant: {args.variant}")
-        cv_text = generate_ats_cv(data, args.variant)
+    if args.candidate and args.candidates:
+        parser.error('--candidate and --candidates are mutually exclusive')
+    if args.store and not (args.candidate or args.candidates):
+        parser.error('--store requires --candidate or --candidates')
+    if (args.candidate or args.candidates) and not args.store:
+        parser.error('--candidate/--candidates require --store')
 
-        # Write output
+    try:
         args.output.parent.mkdir(parents=True, exist_ok=True)
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(cv_text)
-
-        lines = cv_text.count('\n')
-        size = len(cv_text.encode('utf-8'))
-        print(f"✓ Generated {args.output}")
-        print(f"  Lines: {lines}")
-        print(f"  Size: {size} bytes")
-        print(f"\nATS Optimization Tips:")
-        print("  • Use this version when applying through online forms")
-        print("  • Copy/paste into text fields or upload as .txt")
-        print("  • All keywords are included for ATS parsing")
-
+        writer = export_writer(args.output)
+        if writer is None:
+            if args.variants or args.candidates or args.formats:
+                parser.error('--variants, --candidates and --formats need a .jsonl, .tar, .tar.gz or .tgz --output')
+            return write_single(args)
+
+        # Resolve every option before the export file is created
+        variants = [args.variant] if args.variant else resolve_list(args.variants, sorted(VARIANT_CONFIG), 'variants')
+        formats = resolve_list(args.formats or 'text', list(FORMATS), 'formats')
+        job_text = read_job(args.job) if args.job else None
+        exported = rejected = 0
+        export = writer(args.output)
+        try:
+            for candidate_id, data in iter_export_candidates(args):
+                if isinstance(data, ValueError):
+                    print(f"❌ Rejected {candidate_id}: {data}", file=sys.stderr)
+                    rejected += 1
+                    continue
+                if job_text is not None:
+                    data = tailor_data(data, job_text)
+                for variant in variants:
+                    export.add(candidate_id, variant, render_formats(data, variant, formats))
+                exported += 1
+        finally:
+            export.close()
+
+        print(f"✓ Exported {exported} candidates x {len(variants)} variants "
+              f"({', '.join(formats)}) to {args.output}")
+        if rejected:
+            print(f"❌ {rejected} candidates rejected", file=sys.stderr)
+            return 1
         return 0
 
     except Exception as e:
@@ -231,5 +637,4 @@ def main():
         return 1
 
 if __name__ == '__main__':
-    import sys
     sys.exit(main())
@@ -1,38 +1,18 @@
 #!/usr/bin/env python3
-"""Generate LaTeX CV from YAML data using Jinja2 templates."""
+"""Generate LaTeX CV from YAML data using Jinja2 templates.
 
+Templates are compiled once per process (and cached as bytecode under
+.cache/jinja across runs, see template_engine.py). With --store, one compiled
+template renders every selected candidate.
+"""
+
+import sys
 import argparse
-import yaml
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-
-def escape_latex(text):
-    """Escape LaTeX special characters."""
-    chars = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '_': r'\_',
-        '~': r'\textasciitilde{}',
-        '^': r'\^{}',
-        '\\': r'\textbackslash{}',
-    }
-    return ''.join(chars.get(c, c) for c in str(text))
-
-def filter_by_tags(items, tags):
-    """Filter items by tags for variant.
-
-    Args:
-        items: List of items (jobs, strengths, etc.) with 'tags' field
-        tags: List of tags to filter by
-
-    Returns:
-        List of items that have at least one matching tag
-    """
-    if not tags:
-        return items
-    return [item for item in items if any(tag in item.get('tags', []) for tag in tags)]
+
+from candidate_store import CandidateStore, resolve_candidates
+from template_engine import DEFAULT_BYTECODE_DIR, TemplateEngine, engine_for
+from yaml_loader import safe_load
 
 def load_yaml_data(data_dir):
     """Load all YAML files from data directory."""
@@ -44,24 +24,53 @@ def load_yaml_data(data_dir):
 
     for yaml_file in data_path.glob('*.yaml'):
         with open(yaml_file) as f:
-            data[yaml_file.stem] = yaml.safe_load(f)
+            data[yaml_file.stem] = safe_load(f)
 
     return data
 
+def write_output(output, path):
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(output)
+
+    print(f"✓ Generated {path}")
+    print(f"  Lines: {len(output.splitlines())}")
+    print(f"  Size: {len(output)} bytes")
+
 def main():
     parser = argparse.ArgumentParser(description='Generate LaTeX CV from YAML')
-    parser.add_argument('--variant', required=True, help='CV variant (e.g., engineering-manager)')
+    parser.add_argument('--variant', help='CV variant (e.g., engineering-manager)')
     parser.add_argument('--data-dir', default='data/', help='YAML data directory')
+    parser.add_argument('--store', type=Path, help='Candidate store file (see candidate_store.py)')
+    parser.add_argument('--candidates', metavar='LIST',
+                        help="Candidate IDs from --store: 'all' or a comma-separated list")
     parser.add_argument('--template', help='Jinja2 template path (optional, auto-detected from variant)')
-    parser.add_argument('--output', required=True, help='Output .tex file')
+    parser.add_argument('--output', help='Output .tex file')
+    parser.add_argument('--output-dir', type=Path,
+                        help='Output directory for <candidate>/<variant>.tex files (with --store)')
+    parser.add_argument('--precompile', action='store_true',
+                        help='Compile every template under templates/ into the bytecode cache and exit')
+    parser.add_argument('--no-bytecode-cache', action='store_true',
+                        help='Compile templates in memory only')
     args = parser.parse_args()
 
-    # Load YAML data
-    print(f"Loading YAML data from {args.data_dir}...")
-    data = load_yaml_data(args.data_dir)
-    data['variant'] = args.variant
+    bytecode_dir = None if args.no_bytecode_cache else DEFAULT_BYTECODE_DIR
 
-    print(f"Loaded data files: {', '.join(data.keys())}")
+    if args.precompile:
+        engine = TemplateEngine(bytecode_dir=bytecode_dir)
+        names = engine.precompile()
+        print(f"✓ Precompiled {len(names)} templates")
+        for name in names:
+            print(f"  {name}")
+        return 0
+
+    if not args.variant:
+        parser.error('--variant is required')
+    if args.store:
+        if not args.candidates or not args.output_dir:
+            parser.error('--store requires --candidates and --output-dir')
+    elif not args.output:
+        parser.error('--output is required')
 
     # Setup Jinja2
     template_path = args.template or f'templates/{args.variant}/template.tex.j2'
@@ -72,23 +81,34 @@ def main():
 
     print(f"Using template: {template_path}")
 
-    env = Environment(loader=FileSystemLoader(template_file.parent))
-    env.filters['escape_latex'] = escape_latex
-    env.filters['filter_by_tags'] = filter_by_tags
-
-    # Render template
-    print(f"Rendering template for variant: {args.variant}")
-    template = env.get_template(template_file.name)
-    output = template.render(**data)
-
-    # Write output
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(output)
-
-    print(f"✓ Generated {args.output}")
-    print(f"  Lines: {len(output.splitlines())}")
-    print(f"  Size: {len(output)} bytes")
+    engine = engine_for(template_file, bytecode_dir)
+    name = engine.name_of(template_file)
+    engine.get(name)
+
+    if not args.store:
+        # Load YAML data
+        print(f"Loading YAML data from {args.data_dir}...")
+        data = load_yaml_data(args.data_dir)
+
+        print(f"Loaded data files: {', '.join(data.keys())}")
+
+        # Render template
+        print(f"Rendering template for variant: {args.variant}")
+        write_output(engine.render(name, data, args.variant), args.output)
+        return 0
+
+    # Batch: the template compiled above renders every candidate
+    try:
+        with CandidateStore(args.store) as store:
+            candidate_ids = resolve_candidates(store, args.candidates)
+            for candidate_id, data in store.iter_candidates(candidate_ids):
+                print(f"Rendering template for {candidate_id}, variant: {args.variant}")
+                write_output(engine.render(name, data, args.variant),
+                             args.output_dir / candidate_id / f"{args.variant}.tex")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Bounded cache of values derived from objects, keyed by object identity.
+
+Loaded data is made of dicts and lists (or deptrack proxies), which are
+neither hashable nor weakly referenceable, so functools.lru_cache cannot
+key on them. IdentityCache keys on id() and keeps each recent object alive
+alongside its value, which also stops the id() from being reused while the
+entry is cached. Entries are evicted least recently used first.
+
+One cache is shared by serve.py's request threads and pipeline.py's worker
+threads, so lookups and updates take a lock. The value is built outside it;
+if two threads build the same entry at once, the first one stored wins.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Tuple, TypeVar
+
+V = TypeVar('V')
+
+class IdentityCache(Generic[V]):
+    """build(obj), remembered for the maxsize most recently used objects."""
+
+    def __init__(self, build: Callable[[Any], V], maxsize: int):
+        self.build = build
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[int, Tuple[Any, V]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, obj: Any) -> V:
+        key = id(obj)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] is obj:
+                self._entries.move_to_end(key)
+                return cached[1]
+        value = self.build(obj)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] is obj:
+                return cached[1]
+            self._entries[key] = (obj, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
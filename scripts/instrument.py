@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Timing instrumentation for the build: spans, counters, traces and profiles.
+
+Modules mark their hot paths with span() (a context manager), traced() (a
+decorator) or iter_span() (for section generators: it times only the work
+done inside the generator, not the consumer writing its output), and bump
+counters with count(). All of these cost one attribute check while tracing
+is off.
+
+Tracing is switched on by the CV_TRACE environment variable (a file path),
+so it follows a build through make, subprocesses and process-pool workers.
+Each process appends its events to the same file as they complete.
+CV_TRACE_FORMAT selects the framing:
+
+    jsonl   one JSON event per line (default)
+    chrome  a Chrome trace (chrome://tracing, https://ui.perfetto.dev)
+
+Both carry Chrome trace-event records: 'X' for spans, 'C' for counters
+(flushed when a process exits; process-pool workers exit without running
+atexit hooks, so only their spans are recorded). CV_PROFILE=<dir> also runs each process
+under cProfile and dumps <dir>/<script>-<pid>.prof at exit.
+
+Usage:
+    python3 scripts/instrument.py run --trace build.trace -- scripts/generate.py --variants all --data-dir data --output-dir out
+    python3 scripts/instrument.py run --trace build.json --format chrome --profile gen.prof -- scripts/generate.py ...
+    make all TRACE=build.trace && python3 scripts/instrument.py summary build.trace
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; appends of one short line are atomic enough there
+    fcntl = None
+
+TRACE_ENV = 'CV_TRACE'
+FORMAT_ENV = 'CV_TRACE_FORMAT'
+PROFILE_ENV = 'CV_PROFILE'
+FORMATS = ('jsonl', 'chrome')
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000.0
+
+class Tracer:
+    """Per-process event sink; disabled until enable() (or CV_TRACE) switches it on."""
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.format = 'jsonl'
+        # Events are only held in memory when there is no trace file to append them to
+        self.events: List[Dict[str, Any]] = []
+        self.counters: Counter = Counter()
+        # Counter callbacks read at exit, e.g. escape_latex's memo cache statistics
+        self.sources: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._named_pids = set()
+        self._flushed_pid = None
+        self._lock = threading.Lock()
+
+    def enable(self, path: Optional[Path] = None, fmt: str = 'jsonl') -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown trace format '{fmt}' (choose from: {', '.join(FORMATS)})")
+        self.enabled = True
+        self.path = Path(path) if path else None
+        self.format = fmt
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            if self.format == 'chrome' and f.tell() == 0:
+                f.write('[\n')
+            suffix = ',\n' if self.format == 'chrome' else '\n'
+            f.write(''.join(line + suffix for line in lines))
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        pid = os.getpid()
+        event.setdefault('pid', pid)
+        event.setdefault('tid', threading.get_ident())
+        batch = [event]
+        with self._lock:
+            if pid not in self._named_pids:
+                # Label the process in trace viewers with the script it runs
+                self._named_pids.add(pid)
+                batch.insert(0, {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                                 'args': {'name': f"{Path(sys.argv[0]).name} ({pid})"}})
+            if self.path is None:
+                self.events.extend(batch)
+            else:
+                self._write([json.dumps(e, default=str) for e in batch])
+
+    def complete(self, name: str, start_us: float, dur_us: float, args: Dict[str, Any]) -> None:
+        event = {'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X', 'ts': start_us, 'dur': dur_us}
+        if args:
+            event['args'] = args
+        self.emit(event)
+
+    def flush_counters(self) -> None:
+        """Emit every counter (and counter source) as 'C' events, once per process."""
+        if not self.enabled or self._flushed_pid == os.getpid():
+            return
+        self._flushed_pid = os.getpid()
+        values = dict(self.counters)
+        for name, source in self.sources.items():
+            for key, value in source().items():
+                values[f"{name}.{key}"] = value
+        ts = _now_us()
+        for name, value in sorted(values.items()):
+            self.emit({'name': name, 'cat': 'counter', 'ph': 'C', 'ts': ts, 'args': {'value': value}})
+
+TRACER = Tracer()
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> None:
+        self.start = _now_us()
+
+    def __exit__(self, *exc: Any) -> None:
+        TRACER.complete(self.name, self.start, _now_us() - self.start, self.args)
+
+# Returned by span() while tracing is off
+_NO_SPAN = nullcontext()
+
+def span(name: str, **args: Any) -> Any:
+    """Time the enclosed `with` block as one span."""
+    if not TRACER.enabled:
+        return _NO_SPAN
+    return _Span(name, args)
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator: time every call of the function as a span (named after it by default)."""
+    def decorate(func: Callable) -> Callable:
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            start = _now_us()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.complete(label, start, _now_us() - start, {})
+        return wrapper
+    return decorate
+
+def iter_span(name: str, iterable: Iterable[Any], **args: Any) -> Iterable[Any]:
+    """Time the work done inside a generator, excluding its consumer, as one span."""
+    if not TRACER.enabled:
+        return iterable
+    return _timed_iter(name, iter(iterable), args)
+
+def _timed_iter(name: str, iterator: Iterator[Any], args: Dict[str, Any]) -> Iterator[Any]:
+    start = _now_us()
+    busy = 0.0
+    items = 0
+    try:
+        while True:
+            t0 = _now_us()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                busy += _now_us() - t0
+                return
+            busy += _now_us() - t0
+            items += 1
+            yield item
+    finally:
+        TRACER.complete(name, start, busy, dict(args, fragments=items))
+
+def count(name: str, n: float = 1) -> None:
+    """Add n to a counter, reported when the process exits."""
+    if TRACER.enabled:
+        TRACER.counters[name] += n
+
+def counter_source(name: str, source: Callable[[], Dict[str, float]]) -> None:
+    """Register a callback whose values are reported as counters name.<key> at exit."""
+    TRACER.sources[name] = source
+
+# --- Reading traces ---------------------------------------------------------
+
+def read_trace(path: Path) -> List[Dict[str, Any]]:
+    """Events from a JSONL or (possibly unterminated) Chrome trace file."""
+    events = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        line = line.strip().rstrip(',')
+        if line and line not in ('[', ']'):
+            events.append(json.loads(line))
+    return events
+
+def summarize(events: List[Dict[str, Any]]) -> str:
+    """A table of span totals (sorted by total time) followed by counter values."""
+    spans: Dict[str, List[float]] = {}
+    counters: Dict[str, float] = {}
+    begin, end = None, None
+    for e in events:
+        if e.get('ph') == 'X':
+            spans.setdefault(e['name'], []).append(e['dur'])
+            begin = e['ts'] if begin is None else min(begin, e['ts'])
+            end = e['ts'] + e['dur'] if end is None else max(end, e['ts'] + e['dur'])
+        elif e.get('ph') == 'C':
+            counters[e['name']] = counters.get(e['name'], 0) + e['args']['value']
+
+    lines = [f"{'span':<48} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+    lines.append('-' * len(lines[0]))
+    for name, durations in sorted(spans.items(), key=lambda kv: -sum(kv[1])):
+        total = sum(durations)
+        lines.append(f"{name[:48]:<48} {len(durations):>7} {total / 1000:>10.2f} "
+                     f"{total / len(durations) / 1000:>9.3f} {max(durations) / 1000:>9.3f}")
+    if begin is not None:
+        lines.append(f"{'(first span start to last span end)':<48} {'':>7} {(end - begin) / 1000:>10.2f}")
+    if counters:
+        lines.append('')
+        lines += [f"{name:<48} {value:>10g}" for name, value in sorted(counters.items())]
+    return '\n'.join(lines)
+
+# --- Environment switch and profiling ----------------------------------------
+
+_PROFILER = None
+
+def _at_exit() -> None:
+    TRACER.flush_counters()
+    if _PROFILER is not None:
+        _PROFILER.disable()
+        profile_dir = Path(os.environ[PROFILE_ENV])
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        _PROFILER.dump_stats(str(profile_dir / f"{Path(sys.argv[0]).stem}-{os.getpid()}.prof"))
+
+if os.environ.get(TRACE_ENV):
+    TRACER.enable(Path(os.environ[TRACE_ENV]), os.environ.get(FORMAT_ENV, 'jsonl'))
+if os.environ.get(PROFILE_ENV):
+    import cProfile
+    _PROFILER = cProfile.Profile()
+    _PROFILER.enable()
+atexit.register(_at_exit)
+
+def run_script(script: Path, argv: List[str], profile: Optional[Path] = None, top: int = 20) -> int:
+    """Run a script in this process as __main__, optionally under cProfile."""
+    import runpy
+
+    sys.argv = [str(script)] + argv
+    sys.path.insert(0, str(Path(script).resolve().parent))
+
+    def target() -> int:
+        try:
+            runpy.run_path(str(script), run_name='__main__')
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        return 0
+
+    if profile is None:
+        return target()
+
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(target)
+    finally:
+        profiler.dump_stats(str(profile))
+        print(f"\n✓ Profile written to {profile}; top {top} by cumulative time:", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(top)
+
+def main():
+    parser = argparse.ArgumentParser(description='Trace and profile pipeline scripts')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run a script with tracing on, then print the summary')
+    run.add_argument('--trace', type=Path, required=True, help='Trace file to write (replaced)')
+    run.add_argument('--format', default='jsonl', choices=FORMATS, help='Trace framing (default: jsonl)')
+    run.add_argument('--profile', type=Path, help='Also run the script under cProfile and write stats here')
+    run.add_argument('--top', type=int, default=20, help='Profile rows to print (default: 20)')
+    run.add_argument('script', type=Path, help='Script to run, e.g. scripts/generate.py')
+    run.add_argument('args', nargs=argparse.REMAINDER, help='Arguments for the script (after --)')
+
+    summary = commands.add_parser('summary', help='Print the summary table of a trace file')
+    summary.add_argument('trace', type=Path, help='Trace file (JSONL or Chrome format)')
+    args = parser.parse_args()
+
+    if args.command == 'summary':
+        if not args.trace.exists():
+            print(f"Error: Trace file not found: {args.trace}", file=sys.stderr)
+            return 1
+        print(summarize(read_trace(args.trace)))
+        return 0
+
+    if not args.script.exists():
+        print(f"Error: Script not found: {args.script}", file=sys.stderr)
+        return 1
+    script_args = args.args[1:] if args.args[:1] == ['--'] else args.args
+
+    # Child processes (pool workers, pdflatex wrappers) inherit the switch
+    args.trace.write_text('', encoding='utf-8')
+    os.environ[TRACE_ENV] = str(args.trace)
+    os.environ[FORMAT_ENV] = args.format
+    TRACER.enable(args.trace, args.format)
+
+    status = run_script(args.script, script_args, args.profile, args.top)
+    TRACER.flush_counters()
+    print(f"\n✓ Trace written to {args.trace} ({args.format})")
+    print(summarize(read_trace(args.trace)))
+    return status
+
+if __name__ == '__main__':
+    # Instrumented modules import this file as 'instrument'; share one tracer with them
+    sys.modules['instrument'] = sys.modules[__name__]
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Shared LaTeX escaping used by every generator.
+
+Escaping is a single str.translate() pass over a precompiled table, and
+results are memoised in a bounded LRU cache because the same strings
+(names, companies, skills, tags) are escaped again for every variant and
+candidate in a batch.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from instrument import counter_source
+
+LATEX_SPECIAL_CHARS = {
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\^{}',
+    '\\': r'\textbackslash{}',
+}
+
+# Maximum number of distinct strings kept in the memo cache
+CACHE_SIZE = 8192
+
+_TRANSLATION_TABLE = str.maketrans(LATEX_SPECIAL_CHARS)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _escape_cached(text: str) -> str:
+    return text.translate(_TRANSLATION_TABLE)
+
+def escape_latex(text: Any) -> str:
+    """Escape LaTeX special characters."""
+    if not isinstance(text, str):
+        text = str(text)
+    return _escape_cached(text)
+
+def escape_latex_uncached(text: Any) -> str:
+    """Escape LaTeX special characters without touching the memo cache."""
+    if not isinstance(text, str):
+        text = str(text)
+    return text.translate(_TRANSLATION_TABLE)
+
+def cache_info():
+    """Return the memo cache statistics (hits, misses, maxsize, currsize)."""
+    return _escape_cached.cache_info()
+
+def clear_cache() -> None:
+    _escape_cached.cache_clear()
+
+def _call_counts():
+    # Every escape_latex call is exactly one hit or miss of the memo cache
+    info = _escape_cached.cache_info()
+    return {'calls': info.hits + info.misses, 'misses': info.misses}
+
+counter_source('escape_latex', _call_counts)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Precompiled LaTeX formats for the fixed per-variant preambles.
+
+Every CV of a variant shares the same preamble (altacv, paracol, fonts,
+fontawesome, colours). Loading it dominates pdflatex start-up, so the
+preamble is dumped once into a .fmt with mylatexformat and each document is
+then compiled with -fmt, which skips the preamble and only typesets the body.
+
+Formats are keyed by a hash of the preamble text and the class files, and
+stored in a format directory (default .cache/fmt) that is put on TEXFORMATS.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from instrument import span
+
+BEGIN_DOCUMENT = '\\begin{document}'
+DEFAULT_FORMAT_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'fmt'
+
+INI_CMD = ['pdflatex', '-ini', '-interaction=nonstopmode', '-halt-on-error']
+
+class FormatError(Exception):
+    """Building a precompiled format failed."""
+
+def split_preamble(tex: str) -> Tuple[str, str]:
+    """Split a LaTeX document into (preamble, rest starting at \\begin{document})."""
+    index = tex.find(BEGIN_DOCUMENT)
+    if index < 0:
+        raise ValueError('No \\begin{document} found')
+    return tex[:index], tex[index:]
+
+def format_name(preamble: str, support_files: Iterable[Path]) -> str:
+    """Format name derived from the preamble and the class/config files it loads."""
+    h = hashlib.sha256(preamble.encode('utf-8'))
+    for path in sorted(Path(p) for p in support_files):
+        h.update(b'\0' + path.name.encode('utf-8') + b'\0')
+        h.update(path.read_bytes())
+    return f"cv-{h.hexdigest()[:16]}"
+
+def format_env(fmt_dir: Path, env: Dict[str, str]) -> Dict[str, str]:
+    """Return env with fmt_dir first on TEXFORMATS (keeping the default path)."""
+    env = dict(env)
+    env['TEXFORMATS'] = str(Path(fmt_dir).resolve()) + os.pathsep + env.get('TEXFORMATS', '')
+    return env
+
+def ensure_format(preamble: str, fmt_dir: Path, class_dir: Path,
+                  support_files: Iterable[Path], env: Dict[str, str]) -> str:
+    """Build the format for preamble unless it already exists; return its name.
+
+    The dump runs in a scratch directory and the .fmt is moved into fmt_dir
+    atomically, so concurrent builders never expose a half-written format.
+    """
+    name = format_name(preamble, support_files)
+    fmt_dir = Path(fmt_dir)
+    target = fmt_dir / f"{name}.fmt"
+    if target.exists():
+        return name
+
+    fmt_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='cv-fmt-') as workdir:
+        source = Path(workdir) / f"{name}.tex"
+        source.write_text(preamble + BEGIN_DOCUMENT + '\n\\end{document}\n', encoding='utf-8')
+        with span('pdflatex.format', format=name):
+            result = subprocess.run(
+                INI_CMD + [f"-jobname={name}", '&pdflatex', 'mylatexformat.ltx', source.name],
+                cwd=workdir,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors='replace',
+            )
+        built = Path(workdir) / f"{name}.fmt"
+        if result.returncode != 0 or not built.exists():
+            tail = '\n'.join(result.stdout.splitlines()[-20:])
+            raise FormatError(f"Building format {name} failed (exit code {result.returncode})\n{tail}")
+        tmp = fmt_dir / f".{name}.fmt.{os.getpid()}.tmp"
+        shutil.copyfile(built, tmp)
+        os.replace(tmp, target)
+    return name
+
+def preamble_of(tex_path: Path) -> Optional[str]:
+    """Return the preamble of a .tex file, or None if it has no document body."""
+    try:
+        return split_preamble(Path(tex_path).read_text(encoding='utf-8'))[0]
+    except ValueError:
+        return None
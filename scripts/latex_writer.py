@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Streaming LaTeX writer.
+
+Generators yield LaTeX fragments section by section; SectionWriter pushes each
+fragment straight to a file-like sink (an open file, sys.stdout, io.StringIO,
+a socket file, ...) so a document is never accumulated as one growing string.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterable, TextIO
+
+BEGIN_DOCUMENT = '\\begin{document}'
+END_DOCUMENT = '\\end{document}'
+
+class SectionWriter:
+    """Write LaTeX fragments to a sink, keeping line/byte counts and document markers."""
+
+    def __init__(self, sink: TextIO):
+        self.sink = sink
+        self.lines = 0
+        self.size = 0
+        self.has_begin = False
+        self.has_end = False
+
+    def write(self, fragment: str) -> None:
+        self.sink.write(fragment)
+        self.lines += fragment.count('\n')
+        self.size += len(fragment.encode('utf-8'))
+        if not self.has_begin and BEGIN_DOCUMENT in fragment:
+            self.has_begin = True
+        if not self.has_end and END_DOCUMENT in fragment:
+            self.has_end = True
+
+    def write_all(self, fragments: Iterable[str]) -> 'SectionWriter':
+        for fragment in fragments:
+            self.write(fragment)
+        return self
+
+    def validate(self, name: str) -> None:
+        """Raise ValueError if the streamed document is empty or lacks document markers."""
+        if self.size == 0:
+            raise ValueError(f"Generated empty LaTeX output for {name}")
+        if not (self.has_begin and self.has_end):
+            raise ValueError(f"Invalid LaTeX structure for {name} - missing document markers")
+
+def write_file(fragments: Iterable[str], output: Path, name: str) -> SectionWriter:
+    """Stream fragments into output, replacing it only once the document is complete.
+
+    The document is written to a temporary sibling file first, so a failed or
+    invalid generation never leaves a truncated .tex behind for make to pick up.
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f".{output.name}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            writer = SectionWriter(f).write_all(fragments)
+        writer.validate(name)
+        os.replace(tmp, output)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return writer
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Release bundles - every PDF, .tex and ATS .txt of a build in one file.
+
+A bundle stores each distinct file content once, keyed by its SHA-256, and
+maps file names (e.g. mark/academic-researcher.pdf) to content hashes in an
+index. Unchanged CVs come out of the PDF cache byte-identical, so packing a
+new build into an existing bundle only adds the files that actually changed.
+
+Layout:
+
+    header   magic, index offset, index length (HEADER below)
+    blobs    raw file contents, back to back, uncompressed
+    index    JSON: {"blobs": [[sha256, offset, length], ...], "files": {name: blob number}}
+
+Blobs are stored uncompressed so a reader can mmap the bundle and hand out
+any file as a zero-copy memoryview without unpacking. Appending writes new
+blobs and a new index after the old index, then rewrites the header last,
+so an interrupted pack leaves the previous index in force. Each append
+leaves the previous index behind as dead bytes; once dead bytes pass
+COMPACT_RATIO of the live ones, pack() rewrites the live blobs and index
+into a new file and renames it over the bundle (gc does this on demand).
+
+Usage:
+    python3 scripts/package.py pack --bundle release.cvpack output/generated output/ats
+    python3 scripts/package.py pack --bundle release.cvpack --prefix build-42 output/generated output/ats
+    python3 scripts/package.py list --bundle release.cvpack
+    python3 scripts/package.py cat --bundle release.cvpack build-42/academic-researcher.pdf > cv.pdf
+    python3 scripts/package.py diff --bundle release.cvpack build-41 build-42
+    python3 scripts/package.py extract --bundle release.cvpack --prefix build-42 --output-dir out/
+    python3 scripts/package.py gc --bundle release.cvpack
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import difflib
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+MAGIC = b'CVPACK\x00\x01'
+# magic, index offset, index length
+HEADER = struct.Struct('<8sQQ')
+DEFAULT_EXTENSIONS = ('.pdf', '.tex', '.txt')
+TEXT_EXTENSIONS = ('.tex', '.txt', '.md', '.json', '.xml')
+# pack() compacts once superseded indexes and unreferenced blobs exceed this share of the live bytes
+COMPACT_RATIO = 0.25
+
+class BundleError(ValueError):
+    """A bundle is missing, malformed or lacks the requested file."""
+
+def collect_files(dirs: Iterable[Path], extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+                  prefix: str = '') -> Dict[str, Path]:
+    """Map bundle names (prefix/path relative to its directory) to files, in sorted order."""
+    extensions = tuple(extensions)
+    files: Dict[str, Path] = {}
+    for root in dirs:
+        root = Path(root)
+        for path in sorted(root.rglob('*')):
+            if path.is_file() and path.suffix in extensions:
+                name = path.relative_to(root).as_posix()
+                files[f"{prefix.strip('/')}/{name}" if prefix else name] = path
+    return files
+
+class Bundle:
+    """Read access to a bundle through one read-only memory map."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            raise BundleError(f"Bundle not found: {self.path}") from None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BundleError(f"Not a bundle (empty file): {self.path}") from None
+        self._view = memoryview(self._map)
+        self.blobs, self.files = self._read_index()
+
+    def _read_index(self) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, str]]:
+        if len(self._map) < HEADER.size:
+            raise BundleError(f"Not a bundle (truncated header): {self.path}")
+        magic, offset, length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise BundleError(f"Not a bundle (bad magic): {self.path}")
+        if offset + length > len(self._map):
+            raise BundleError(f"Corrupt bundle (index past end of file): {self.path}")
+        index = json.loads(bytes(self._view[offset:offset + length]))
+        digests = [digest for digest, _, _ in index['blobs']]
+        blobs = {digest: (start, size) for digest, start, size in index['blobs']}
+        return blobs, {name: digests[number] for name, number in index['files'].items()}
+
+    def __enter__(self) -> 'Bundle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the bundle; views returned by open() must be released first."""
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.files
+
+    def names(self, prefix: str = '') -> List[str]:
+        """File names in the bundle, optionally only those under prefix/."""
+        prefix = prefix.strip('/')
+        return sorted(n for n in self.files if not prefix or n.startswith(prefix + '/'))
+
+    def digest(self, name: str) -> str:
+        try:
+            return self.files[name]
+        except KeyError:
+            raise BundleError(f"No such file in {self.path}: {name}") from None
+
+    def open(self, name: str) -> memoryview:
+        """Zero-copy view of a file's contents, valid until close()."""
+        offset, length = self.blobs[self.digest(name)]
+        return self._view[offset:offset + length]
+
+    def read(self, name: str) -> bytes:
+        with self.open(name) as view:
+            return bytes(view)
+
+    def stats(self) -> Dict[str, int]:
+        """File and blob counts, logical bytes (sum of files) and stored bytes (sum of blobs)."""
+        return {
+            'files': len(self.files),
+            'blobs': len(self.blobs),
+            'logical_bytes': sum(self.blobs[h][1] for h in self.files.values()),
+            'stored_bytes': sum(length for _, length in self.blobs.values()),
+            'file_bytes': len(self._map),
+            'live_bytes': HEADER.size + sum(self.blobs[h][1] for h in set(self.files.values()))
+                          + HEADER.unpack_from(self._map, 0)[2],
+        }
+
+    def diff(self, old: str, new: str) -> Dict[str, List[str]]:
+        """Compare two prefixes (e.g. two builds) by content hash, without reading any file."""
+        old_files = {n[len(old.strip('/')) + 1:]: self.files[n] for n in self.names(old)}
+        new_files = {n[len(new.strip('/')) + 1:]: self.files[n] for n in self.names(new)}
+        return {
+            'added': sorted(new_files.keys() - old_files.keys()),
+            'removed': sorted(old_files.keys() - new_files.keys()),
+            'changed': sorted(n for n in old_files.keys() & new_files.keys() if old_files[n] != new_files[n]),
+            'unchanged': sorted(n for n in old_files.keys() & new_files.keys() if old_files[n] == new_files[n]),
+        }
+
+def _write_index(f, blobs: Dict[str, List[int]], names: Dict[str, str], offset: int) -> None:
+    """Write the index at offset, sync, then point the header at it."""
+    # Files refer to blobs by number, so each name costs a few bytes instead of a 64-digit hash
+    numbers = {digest: i for i, digest in enumerate(blobs)}
+    index = json.dumps({
+        'blobs': [[digest, start, size] for digest, (start, size) in blobs.items()],
+        'files': {name: numbers[digest] for name, digest in sorted(names.items())},
+    }, separators=(',', ':')).encode('utf-8')
+    f.seek(offset)
+    f.write(index)
+    f.flush()
+    os.fsync(f.fileno())
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, offset, len(index)))
+    f.flush()
+    os.fsync(f.fileno())
+
+def compact(bundle_path: Path) -> int:
+    """Rewrite the bundle with only referenced blobs and the current index; return bytes reclaimed.
+
+    The new bundle is built next to the old one and renamed over it, so
+    readers that already mapped the old file keep a consistent view.
+    """
+    bundle_path = Path(bundle_path)
+    before = bundle_path.stat().st_size
+    tmp = bundle_path.with_name(f".{bundle_path.name}.{os.getpid()}.tmp")
+    try:
+        with Bundle(bundle_path) as old, open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, 0, 0))
+            blobs: Dict[str, List[int]] = {}
+            for digest in sorted(set(old.files.values()), key=lambda h: old.blobs[h][0]):
+                offset, length = old.blobs[digest]
+                blobs[digest] = [f.tell(), length]
+                f.write(old._view[offset:offset + length])
+            _write_index(f, blobs, old.files, f.tell())
+        os.replace(tmp, bundle_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return before - bundle_path.stat().st_size
+
+def pack(bundle_path: Path, files: Dict[str, Path], compact_ratio: float = COMPACT_RATIO) -> Dict[str, int]:
+    """Add files ({name: path}) to the bundle, creating it if needed.
+
+    Names already in the bundle are replaced. Returns counts of files packed,
+    of new blobs and bytes written (content already present is reused) and
+    of bytes reclaimed by compaction.
+    """
+    bundle_path = Path(bundle_path)
+    blobs: Dict[str, List[int]] = {}
+    names: Dict[str, str] = {}
+    if bundle_path.exists():
+        with Bundle(bundle_path) as existing:
+            blobs = {h: list(span) for h, span in existing.blobs.items()}
+            names = dict(existing.files)
+    else:
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        empty = b'{"blobs":[],"files":{}}'
+        with open(bundle_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, HEADER.size, len(empty)) + empty)
+
+    new_blobs = new_bytes = 0
+    with open(bundle_path, 'r+b') as f:
+        # Never overwrite the live index: everything new goes after the end of the file
+        end = f.seek(0, os.SEEK_END)
+        for name, path in files.items():
+            content = Path(path).read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if digest not in blobs:
+                f.write(content)
+                blobs[digest] = [end, len(content)]
+                end += len(content)
+                new_blobs += 1
+                new_bytes += len(content)
+            names[name] = digest
+
+        _write_index(f, blobs, names, end)
+
+    with Bundle(bundle_path) as bundle:
+        stats = bundle.stats()
+    reclaimed = 0
+    if stats['file_bytes'] - stats['live_bytes'] > compact_ratio * stats['live_bytes']:
+        reclaimed = compact(bundle_path)
+    return {'files': len(files), 'new_blobs': new_blobs, 'new_bytes': new_bytes, 'reclaimed_bytes': reclaimed}
+
+def extract(bundle: Bundle, names: Iterable[str], output_dir: Path, strip: str = '') -> Iterator[Path]:
+    """Write files out under output_dir (with strip/ removed from their names)."""
+    strip = strip.strip('/')
+    for name in names:
+        relative = name[len(strip) + 1:] if strip and name.startswith(strip + '/') else name
+        dest = Path(output_dir) / relative
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with bundle.open(name) as view, open(dest, 'wb') as f:
+            f.write(view)
+        yield dest
+
+def text_diff(bundle: Bundle, old: str, new: str) -> Iterator[str]:
+    """Unified diff of two text files in the bundle (nothing if their contents are identical)."""
+    if bundle.digest(old) == bundle.digest(new):
+        return
+    yield from difflib.unified_diff(
+        bundle.read(old).decode('utf-8', errors='replace').splitlines(keepends=True),
+        bundle.read(new).decode('utf-8', errors='replace').splitlines(keepends=True),
+        fromfile=old, tofile=new,
+    )
+
+def format_size(size: int) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Release bundles - deduplicated archive of PDF, LaTeX and ATS outputs'
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_pack = sub.add_parser('pack', help='Add output directories to a bundle (created if missing)')
+    p_pack.add_argument('--bundle', required=True, type=Path, help='Bundle file')
+    p_pack.add_argument('--prefix', default='', help='Name prefix for this build, e.g. a build ID or date')
+    p_pack.add_argument('--ext', default=','.join(e.lstrip('.') for e in DEFAULT_EXTENSIONS),
+                        help='Comma-separated file extensions to pack (default: pdf,tex,txt)')
+    p_pack.add_argument('dirs', nargs='+', type=Path, help='Output directories (names are relative to each)')
+
+    p_gc = sub.add_parser('gc', help='Drop superseded indexes and unreferenced blobs')
+    p_gc.add_argument('--bundle', required=True, type=Path, help='Bundle file')
+
+    p_list = sub.add_parser('list', help='List files with sizes and content hashes')
+    p_list.add_argument('--bundle', required=True, type=Path, help='Bundle file')
+    p_list.add_argument('--prefix', default='', help='Only files under this prefix')
+
+    p_cat = sub.add_parser('cat', help='Write one file to stdout')
+    p_cat.add_argument('--bundle', required=True, type=Path, help='Bundle file')
+    p_cat.add_argument('name', help='File name in the bundle')
+
+    p_extract = sub.add_parser('extract', help='Unpack files into a directory')
+    p_extract.add_argument('--bundle', required=True, type=Path, help='Bundle file')
+    p_extract.add_argument('--prefix', default='', help='Only files under this prefix (stripped from paths)')
+    p_extract.add_argument('--output-dir', required=True, type=Path, help='Destination directory')
+
+    p_diff = sub.add_parser('diff', help='Compare two builds (prefixes) or two text files')
+    p_diff.add_argument('--bundle', required=True, type=Path, help='Bundle file')
+    p_diff.add_argument('old', help='Old prefix or file name')
+    p_diff.add_argument('new', help='New prefix or file name')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'pack':
+            missing = [str(d) for d in args.dirs if not d.is_dir()]
+            if missing:
+                print(f"Error: Directory not found: {', '.join(missing)}", file=sys.stderr)
+                return 1
+            extensions = ['.' + e.strip().lstrip('.') for e in args.ext.split(',') if e.strip()]
+            files = collect_files(args.dirs, extensions, args.prefix)
+            if not files:
+                print(f"Error: No {', '.join(extensions)} files found in {', '.join(map(str, args.dirs))}",
+                      file=sys.stderr)
+                return 1
+            added = pack(args.bundle, files)
+            with Bundle(args.bundle) as bundle:
+                stats = bundle.stats()
+            print(f"✓ Packed {added['files']} files into {args.bundle} "
+                  f"({added['new_blobs']} new, {format_size(added['new_bytes'])} written)")
+            if added['reclaimed_bytes']:
+                print(f"  Compacted: {format_size(added['reclaimed_bytes'])} reclaimed")
+            print(f"  Bundle: {stats['files']} files, {stats['blobs']} unique, "
+                  f"{format_size(stats['logical_bytes'])} stored as {format_size(stats['file_bytes'])}")
+            return 0
+
+        if args.command == 'gc':
+            if not args.bundle.exists():
+                raise BundleError(f"Bundle not found: {args.bundle}")
+            print(f"✓ Compacted {args.bundle}: {format_size(compact(args.bundle))} reclaimed")
+            return 0
+
+        with Bundle(args.bundle) as bundle:
+            if args.command == 'list':
+                for name in bundle.names(args.prefix):
+                    digest = bundle.files[name]
+                    print(f"{digest[:12]}  {bundle.blobs[digest][1]:>10}  {name}")
+            elif args.command == 'cat':
+                with bundle.open(args.name) as view:
+                    sys.stdout.buffer.write(view)
+            elif args.command == 'extract':
+                names = bundle.names(args.prefix)
+                if not names:
+                    raise BundleError(f"No files under '{args.prefix}' in {args.bundle}")
+                count = sum(1 for _ in extract(bundle, names, args.output_dir, args.prefix))
+                print(f"✓ Extracted {count} files to {args.output_dir}")
+            elif args.command == 'diff':
+                if args.old in bundle and args.new in bundle:
+                    if Path(args.old).suffix not in TEXT_EXTENSIONS:
+                        same = bundle.digest(args.old) == bundle.digest(args.new)
+                        print(f"{args.old} and {args.new} are {'identical' if same else 'different'}")
+                        return 0 if same else 1
+                    lines = list(text_diff(bundle, args.old, args.new))
+                    sys.stdout.writelines(lines)
+                    return 1 if lines else 0
+                changes = bundle.diff(args.old, args.new)
+                if not any(changes.values()):
+                    raise BundleError(f"No files under '{args.old}' or '{args.new}' in {args.bundle}")
+                for kind, mark in (('added', '+'), ('removed', '-'), ('changed', '~')):
+                    for name in changes[kind]:
+                        print(f"{mark} {name}")
+                print(f"{len(changes['added'])} added, {len(changes['removed'])} removed, "
+                      f"{len(changes['changed'])} changed, {len(changes['unchanged'])} unchanged")
+                return 1 if changes['added'] or changes['removed'] or changes['changed'] else 0
+        return 0
+
+    except BundleError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Page-fit estimator: which content of a variant fits both columns on one page.
+
+The variant specs cap their content by hand (three events of four bullets,
+four certifications, ...). Overflow only showed up after a full pdflatex
+run. This module estimates the rendered height of every block before
+compiling, from per-variant metrics: the page geometry and column widths
+come from the theme's preamble, and the font sizes from its font commands
+and altacv's defaults. It then trims each column to fit.
+
+Fitting is a greedy knapsack with precedence. Every flexible unit has a
+relevance value that decays with its position in the data: an event (with
+its first bullet), each further bullet, each strength, each tag. Data order
+is the relevance order, and tailor.py reorders it for a job posting. Units
+are taken best first while the column still fits, and a unit is only taken
+if the one before it was. The spec's caps remain the maximum, so content
+that already fits renders exactly as before.
+
+Metrics are derived once per variant and stored in .cache/fit/<variant>.json;
+the file is regenerated when the theme changes. Derived metrics overestimate
+heights, so each variant is calibrated from a compiled one-page PDF of it:
+calibrate() measures how far down the page each column's text reaches and
+stores the ratio to the estimate as the column's scale. scripts/test_page_fit.py
+does this from the PDFs make builds and checks that the repo's data is left
+unchanged. Until the estimates are trusted, generate.py has no --fit option;
+this script reports what fitting would drop.
+
+Usage:
+    python3 scripts/page_fit.py --variant academic-researcher --data-dir data
+    python3 scripts/page_fit.py --data-dir data --calibrate output/generated
+"""
+
+import re
+import sys
+import json
+import math
+import hashlib
+import argparse
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from cv_engine import (Achievements, Divider, Education, Events, Heading, Profile,
+                       Spacer, Subheading, Tags, VariantSpec)
+from tag_index import compile_query, tag_index
+
+DEFAULT_METRICS_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'fit'
+
+PT_PER_CM = 28.4528
+A4 = (21.0, 29.7)   # cm
+
+# Font size commands at the 10pt class size, in pt
+FONT_SIZES = {
+    'tiny': 5.0, 'scriptsize': 7.0, 'footnotesize': 8.0, 'small': 9.0, 'normalsize': 10.0,
+    'large': 12.0, 'Large': 14.4, 'LARGE': 17.28, 'huge': 20.74, 'Huge': 24.88,
+}
+SKIPS = {'smallskip': 3.0, 'medskip': 6.0, 'bigskip': 12.0}
+
+# Average glyph width in em of the body (sans) fonts the themes use
+GLYPH_WIDTHS = {'Lato': 0.45, 'Roboto': 0.47}
+DEFAULT_GLYPH_WIDTH = 0.47
+
+COLUMN_RATIO = 0.6   # \columnratio in cv_engine.header_section
+
+@dataclass(frozen=True)
+class Metrics:
+    """Page and font metrics of one variant, in pt."""
+    text_height: float
+    text_width: float
+    main_width: float
+    side_width: float
+    glyph_width: float          # average glyph width at 10pt
+    baseline: float = 12.0
+    name_size: float = FONT_SIZES['Huge']
+    section_size: float = FONT_SIZES['LARGE']
+    personalinfo_size: float = FONT_SIZES['footnotesize']
+    # Fraction of the column the estimate may fill, for estimation error
+    fill: float = 0.96
+    # Measured / estimated height of header plus column, from calibrate()
+    main_scale: float = 1.0
+    side_scale: float = 1.0
+
+    def chars_per_line(self, width: float, size: float = 10.0) -> float:
+        return max(width / (self.glyph_width * size / 10.0), 1.0)
+
+    def lines(self, text: Any, width: float, size: float = 10.0) -> int:
+        """Lines a paragraph of text wraps to at the given width and size."""
+        return max(math.ceil(len(str(text)) / self.chars_per_line(width, size)), 1)
+
+def _size_of(font: str, default: float) -> float:
+    """Font size of a font command such as '\\LARGE\\sffamily\\bfseries'."""
+    for command in re.findall(r'\\([A-Za-z]+)', font):
+        if command in FONT_SIZES:
+            return FONT_SIZES[command]
+    return default
+
+def _geometry(spec: VariantSpec) -> Dict[str, float]:
+    """The \\geometry lengths of the spec's preamble, in cm."""
+    geometry = re.search(r'\\geometry\{([^}]*)\}', spec.theme.preamble()).group(1)
+    return {k: float(v) for k, v in re.findall(r'(\w+)=([\d.]+)cm', geometry)}
+
+def derive_metrics(spec: VariantSpec) -> Metrics:
+    """Metrics from the spec's preamble geometry and theme fonts."""
+    theme = spec.theme
+    cm = _geometry(spec)
+    text_width = (A4[0] - cm['left'] - cm['right']) * PT_PER_CM
+    text_height = (A4[1] - cm['top'] - cm['bottom']) * PT_PER_CM
+    columns = text_width - cm.get('columnsep', 0.0) * PT_PER_CM
+
+    sans = [re.search(r'\{([^}]*)\}', f).group(1) for f in theme.unicode_fonts if 'setsansfont' in f]
+    glyph_em = GLYPH_WIDTHS.get(sans[0], DEFAULT_GLYPH_WIDTH) if sans else DEFAULT_GLYPH_WIDTH
+    return Metrics(
+        text_height=text_height,
+        text_width=text_width,
+        main_width=columns * COLUMN_RATIO,
+        side_width=columns * (1 - COLUMN_RATIO),
+        glyph_width=glyph_em * 10.0,
+        name_size=_size_of(theme.namefont, FONT_SIZES['Huge']),
+        section_size=_size_of(theme.cvsectionfont, FONT_SIZES['LARGE']),
+        personalinfo_size=_size_of(theme.personalinfofont, FONT_SIZES['footnotesize']),
+    )
+
+def _theme_key(spec: VariantSpec) -> str:
+    return hashlib.sha256(repr(spec.theme).encode('utf-8')).hexdigest()[:16]
+
+@lru_cache(maxsize=None)
+def metrics_for(spec: VariantSpec, metrics_dir: Optional[Path] = DEFAULT_METRICS_DIR) -> Metrics:
+    """The variant's metrics: from .cache/fit when present for this theme, else derived and stored."""
+    if metrics_dir is None:
+        return derive_metrics(spec)
+    path = Path(metrics_dir) / f"{spec.name}.json"
+    key = _theme_key(spec)
+    try:
+        stored = json.loads(path.read_text(encoding='utf-8'))
+        if stored.pop('theme') == key:
+            return Metrics(**stored)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    metrics = derive_metrics(spec)
+    store_metrics(spec, metrics, metrics_dir)
+    return metrics
+
+def store_metrics(spec: VariantSpec, metrics: Metrics, metrics_dir: Path = DEFAULT_METRICS_DIR) -> None:
+    path = Path(metrics_dir) / f"{spec.name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'theme': _theme_key(spec), **asdict(metrics)}, indent=2) + '\n', encoding='utf-8')
+
+# --- Block heights ----------------------------------------------------------
+
+def header_height(personal: Dict[str, Any], tagline_key: str, m: Metrics) -> float:
+    """\\makecvheader: name, tagline and the wrapped personal info line."""
+    info = [personal['email'], personal['phone'], personal['location'],
+            personal['website'], personal['linkedin'], personal['github']]
+    # Each item has an icon and separator worth about four glyphs
+    info_chars = sum(len(str(item)) + 4 for item in info)
+    info_lines = math.ceil(info_chars / m.chars_per_line(m.text_width, m.personalinfo_size))
+    tagline = personal['taglines'][tagline_key]
+    return (m.name_size * 1.2 + SKIPS['medskip']
+            + m.lines(tagline, m.text_width, FONT_SIZES['large']) * FONT_SIZES['large'] * 1.2 + SKIPS['medskip']
+            + info_lines * m.personalinfo_size * 1.5 + SKIPS['medskip'])
+
+def event_height(title: str, company: str, m: Metrics, width: float) -> float:
+    """\\cvevent: title, company, then the date/location line."""
+    return (m.lines(title, width, FONT_SIZES['large']) * FONT_SIZES['large'] * 1.2 + SKIPS['smallskip']
+            + m.lines(company, width) * m.baseline + SKIPS['smallskip']
+            + FONT_SIZES['small'] * 1.2 + SKIPS['medskip'])
+
+def items_height(items: List[str], m: Metrics, width: float) -> float:
+    """An itemize list (altacv: itemsep and after = 0.25 baselineskip)."""
+    item_width = width - 1.5 * 10.0
+    return sum(m.lines(item, item_width) * m.baseline + 0.25 * m.baseline for item in items) + 0.25 * m.baseline
+
+def divider_height(m: Metrics, skip: Optional[str] = None) -> float:
+    return m.baseline + SKIPS['medskip'] + SKIPS.get(skip, 0.0)
+
+def tags_height(items: List[str], m: Metrics, width: float) -> float:
+    """\\cvtag boxes flowing in rows; each box pads its text by 1ex per side."""
+    if not items:
+        return 0.0
+    rows, used = 1, 0.0
+    for item in items:
+        box = len(str(item)) * m.glyph_width + 2 * 4.3 + 3.3
+        if used and used + box > width:
+            rows, used = rows + 1, 0.0
+        used += box
+    return rows * 18.0
+
+def achievement_height(strength: Dict[str, Any], m: Metrics, width: float) -> float:
+    """\\cvachievement: icon column beside a bold title and description."""
+    text_width = width - 2.0 * 10.0 - 4.3
+    lines = m.lines(strength['title'], text_width) + m.lines(strength['description'], text_width)
+    return max(lines * m.baseline, FONT_SIZES['Large'] * 2) + SKIPS['smallskip']
+
+# --- Flexible elements ------------------------------------------------------
+
+@dataclass
+class Unit:
+    """A piece of content the solver may keep or drop."""
+    value: float
+    element: int               # position in the column
+    key: Tuple[int, ...]       # (entry,) or (entry, bullet)
+    requires: Optional[Tuple[int, Tuple[int, ...]]]
+    label: str
+
+# Relevance decay per position: later events/strengths/bullets/tags matter less
+ENTRY_DECAY = 0.85
+BULLET_DECAY = 0.8
+TAG_DECAY = 0.9
+
+# Elements the solver trims, and those that only structure a section
+FLEXIBLE = (Events, Achievements, Tags)
+LAYOUT = (Heading, Subheading, Spacer, Divider)
+
+@dataclass
+class ColumnPlan:
+    """Heights of one column's elements for the currently chosen units."""
+    elements: Tuple[Any, ...]
+    width: float
+    metrics: Metrics
+    data: Dict[str, Any]
+    chosen: Dict[int, Dict[Tuple[int, ...], bool]] = field(default_factory=dict)
+
+    def entries(self, i: int) -> List[Any]:
+        """Content an element could show, up to the spec's cap."""
+        element = self.elements[i]
+        if isinstance(element, Events):
+            index = tag_index(self.data['experience'])
+            return index.entries(compile_query(element.query)(index))[:element.limit]
+        if isinstance(element, Achievements):
+            return self.data['strengths'][:element.limit]
+        if isinstance(element, Tags):
+            items = self.data[element.section]
+            if element.key is not None:
+                items = items[element.key]
+            items = items[:element.limit] if element.limit is not None else items
+            return [item[element.field] if element.field else item for item in items]
+        return []
+
+    def sections(self) -> List[Tuple[int, ...]]:
+        """Element positions grouped by section: each Heading with what follows it up to the next."""
+        groups: List[List[int]] = [[]]
+        for i, element in enumerate(self.elements):
+            if isinstance(element, Heading) and groups[-1]:
+                groups.append([])
+            groups[-1].append(i)
+        return [tuple(group) for group in groups if group]
+
+    def hidden(self, section: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Elements of a section that would only lead into content that was all dropped.
+
+        A divider or subheading is hidden when every flexible element after it in its
+        section kept nothing. When that holds for the whole section, the heading goes
+        too, so the section's first unit pays for the heading and its dividers.
+        """
+        if any(not isinstance(self.elements[i], FLEXIBLE + LAYOUT) for i in section):
+            return ()
+        flexible = [i for i in section if isinstance(self.elements[i], FLEXIBLE)]
+        kept = [i for i in flexible if self.selection(i)[0]]
+        if not flexible:
+            return ()
+        if not kept:
+            return section
+        return tuple(i for i in section
+                     if isinstance(self.elements[i], LAYOUT) and kept[-1] < i < flexible[-1])
+
+    def section_height(self, section: Tuple[int, ...]) -> float:
+        hidden = self.hidden(section)
+        return sum(self.element_height(i) for i in section if i not in hidden)
+
+    def units(self) -> List[Unit]:
+        units = []
+        for i, element in enumerate(self.elements):
+            entries = self.entries(i)
+            if isinstance(element, Events):
+                cap = element.achievements
+                for r, job in enumerate(entries):
+                    bullets = cap[r] if isinstance(cap, tuple) else cap
+                    units.append(Unit(ENTRY_DECAY ** r, i, (r,), (i, (r - 1,)) if r else None, job['title']))
+                    for k in range(1, min(bullets, len(job['achievements']))):
+                        prev = (r,) if k == 1 else (r, k - 1)
+                        units.append(Unit(ENTRY_DECAY ** r * BULLET_DECAY ** k, i, (r, k), (i, prev),
+                                          f"{job['title']}: bullet {k + 1}"))
+            elif isinstance(element, Achievements):
+                for r, strength in enumerate(entries):
+                    units.append(Unit(ENTRY_DECAY ** r, i, (r,), (i, (r - 1,)) if r else None, strength['title']))
+            elif isinstance(element, Tags):
+                for r, item in enumerate(entries):
+                    units.append(Unit(TAG_DECAY ** r, i, (r,), (i, (r - 1,)) if r else None, str(item)))
+        return units
+
+    def selection(self, i: int) -> Tuple[int, Tuple[int, ...]]:
+        """(entries kept, bullets kept per entry) for element i."""
+        chosen = self.chosen.get(i, {})
+        kept = 0
+        while (kept,) in chosen:
+            kept += 1
+        bullets = []
+        for r in range(kept):
+            k = 1
+            while (r, k) in chosen:
+                k += 1
+            bullets.append(k)
+        return kept, tuple(bullets)
+
+    def element_height(self, i: int) -> float:
+        element, m, width, data = self.elements[i], self.metrics, self.width, self.data
+        if isinstance(element, Heading):
+            return SKIPS['bigskip'] + m.section_size * 1.2 + 2.0 + SKIPS['medskip']
+        if isinstance(element, Subheading):
+            return m.lines(element.title, width) * m.baseline
+        if isinstance(element, Spacer):
+            return SKIPS.get(element.command, 0.0)
+        if isinstance(element, Divider):
+            return divider_height(m, element.skip)
+        if isinstance(element, Profile):
+            strength = data['strengths'][element.index]
+            title = m.baseline if element.show_title else 0.0
+            return title + m.lines(strength['description'], width) * m.baseline
+        if isinstance(element, Education):
+            height = 0.0
+            for edu in data['education']:
+                height += event_height(edu['degree'], edu['institution'], m, width)
+                if edu.get('notes'):
+                    height += m.lines(edu['notes'], width) * m.baseline
+            return height
+
+        entries = self.entries(i)
+        kept, bullets = self.selection(i)
+        if isinstance(element, Events):
+            height = 0.0
+            for r in range(kept):
+                job = entries[r]
+                height += event_height(job['title'], job['company'], m, width)
+                height += items_height(job['achievements'][:bullets[r]], m, width)
+                if element.divider == 'always' or r != kept - 1:
+                    height += divider_height(m)
+            return height
+        if isinstance(element, Achievements):
+            height = sum(achievement_height(s, m, width) for s in entries[:kept])
+            dividers = kept if element.divider == 'always' else max(kept - 1, 0)
+            return height + dividers * divider_height(m)
+        if isinstance(element, Tags):
+            return tags_height(entries[:kept], m, width)
+        raise TypeError(f"No height estimate for {type(element).__name__}")
+
+    def height(self) -> float:
+        return sum(self.section_height(section) for section in self.sections())
+
+    def choose_all(self) -> None:
+        for unit in self.units():
+            self.chosen.setdefault(unit.element, {})[unit.key] = True
+
+    def solve(self, capacity: float) -> List[Unit]:
+        """Greedily keep the most relevant units that fit; return the dropped ones."""
+        units = sorted(self.units(), key=lambda u: -u.value)   # stable: ties keep document order
+        self.chosen = {}
+        dropped = []
+        sections = self.sections()
+        section_of = {i: section for section in sections for i in section}
+        heights = {section: self.section_height(section) for section in sections}
+        total = sum(heights.values())
+        for unit in units:
+            if unit.requires and unit.requires[1] not in self.chosen.get(unit.requires[0], {}):
+                dropped.append(unit)
+                continue
+            self.chosen.setdefault(unit.element, {})[unit.key] = True
+            section = section_of[unit.element]
+            height = self.section_height(section)
+            if total - heights[section] + height <= capacity:
+                total += height - heights[section]
+                heights[section] = height
+            else:
+                del self.chosen[unit.element][unit.key]
+                dropped.append(unit)
+        return dropped
+
+    def fitted(self) -> Tuple[Any, ...]:
+        """The column's elements with their caps set to the chosen content, minus empty sections."""
+        dropped = {i for section in self.sections() for i in self.hidden(section)}
+        elements = []
+        for i, element in enumerate(self.elements):
+            if i in dropped:
+                continue
+            kept, bullets = self.selection(i)
+            if isinstance(element, Events):
+                element = replace(element, limit=kept, achievements=bullets)
+            elif isinstance(element, (Achievements, Tags)):
+                element = replace(element, limit=kept)
+            elements.append(element)
+        return tuple(elements)
+
+@dataclass
+class FitReport:
+    """Estimated column heights before and after fitting, and each column's capacity, in pt."""
+    variant: str
+    main: Tuple[float, float, float]
+    sidebar: Tuple[float, float, float]
+    dropped: List[str]
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.dropped)
+
+    def summary(self) -> str:
+        lines = [f"{self.variant}: main {self.main[0]:.0f} -> {self.main[1]:.0f} of {self.main[2]:.0f}pt, "
+                 f"sidebar {self.sidebar[0]:.0f} -> {self.sidebar[1]:.0f} of {self.sidebar[2]:.0f}pt"]
+        lines += [f"  dropped: {label}" for label in self.dropped]
+        return '\n'.join(lines)
+
+def _columns(spec: VariantSpec, m: Metrics) -> List[Tuple[str, Tuple[Any, ...], float, float]]:
+    """(name, elements, width, scale) of both columns."""
+    return [('main', spec.main, m.main_width, m.main_scale),
+            ('sidebar', spec.sidebar, m.side_width, m.side_scale)]
+
+def fit_variant(spec: VariantSpec, data: Dict[str, Any],
+                metrics: Optional[Metrics] = None) -> Tuple[VariantSpec, FitReport]:
+    """Return spec with its caps lowered so both columns fit one page, and a report."""
+    m = metrics or metrics_for(spec)
+    header = header_height(data['personal'], spec.tagline or spec.name, m)
+
+    columns = {}
+    for name, elements, width, scale in _columns(spec, m):
+        # Calibrated: scale * (header + column) must stay within the page
+        capacity = m.text_height * m.fill / scale - header
+        plan = ColumnPlan(elements, width, m, data)
+        plan.choose_all()
+        before = plan.height()
+        dropped = plan.solve(capacity) if before > capacity else []
+        columns[name] = (plan, (before, plan.height(), capacity), [unit.label for unit in dropped])
+
+    report = FitReport(spec.name, columns['main'][1], columns['sidebar'][1],
+                       columns['main'][2] + columns['sidebar'][2])
+    if not report.trimmed:
+        return spec, report
+    return replace(spec, main=columns['main'][0].fitted(), sidebar=columns['sidebar'][0].fitted()), report
+
+def measure_columns(spec: VariantSpec, pdf_path: Path) -> Tuple[float, float]:
+    """How far down from the top margin each column's text reaches on a one-page PDF, in pt."""
+    from pypdf import PdfReader
+
+    pages = PdfReader(str(pdf_path)).pages
+    if len(pages) != 1:
+        raise ValueError(f"{pdf_path} has {len(pages)} pages; calibrate from a build that fits one page")
+    page = pages[0]
+    cm = _geometry(spec)
+    columns = A4[0] - cm['left'] - cm['right'] - cm.get('columnsep', 0.0)
+    top = float(page.mediabox.top) - cm['top'] * PT_PER_CM
+    split = float(page.mediabox.left) + (cm['left'] + columns * COLUMN_RATIO + cm.get('columnsep', 0.0) / 2) * PT_PER_CM
+    lowest = [top, top]   # main, sidebar
+
+    def visit(text: str, ctm: List[float], tm: List[float], font: Any, size: float) -> None:
+        if not text.strip():
+            return
+        x = tm[4] * ctm[0] + tm[5] * ctm[2] + ctm[4]
+        y = tm[4] * ctm[1] + tm[5] * ctm[3] + ctm[5]
+        descent = 0.25 * size * abs(tm[3] * ctm[3] or 1.0)
+        column = 1 if x >= split else 0
+        lowest[column] = min(lowest[column], y - descent)
+
+    page.extract_text(visitor_text=visit)
+    return top - lowest[0], top - lowest[1]
+
+def calibrate(spec: VariantSpec, data: Dict[str, Any], pdf_path: Path,
+              metrics_dir: Path = DEFAULT_METRICS_DIR) -> Metrics:
+    """Set each column's scale from a PDF of spec compiled from data, and store the metrics."""
+    m = replace(metrics_for(spec, metrics_dir), main_scale=1.0, side_scale=1.0)
+    header = header_height(data['personal'], spec.tagline or spec.name, m)
+    measured = measure_columns(spec, pdf_path)
+    scales = []
+    for (_, elements, width, _), used in zip(_columns(spec, m), measured):
+        plan = ColumnPlan(elements, width, m, data)
+        plan.choose_all()
+        scales.append(used / (header + plan.height()))
+    # A page that is known to fit must not be rejected by the safety margin
+    fill = max(m.fill, max(measured) / m.text_height)
+    m = replace(m, main_scale=scales[0], side_scale=scales[1], fill=fill)
+    store_metrics(spec, m, metrics_dir)
+    metrics_for.cache_clear()
+    return m
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate page fit of CV variants and show what --fit would drop')
+    parser.add_argument('--variant', help='Variant to check (default: all)')
+    parser.add_argument('--data-dir', type=Path, required=True, help='Directory containing YAML data files')
+    parser.add_argument('--job', type=Path, help='Job description; rank content by relevance to it first (see tailor.py)')
+    parser.add_argument('--calibrate', type=Path, metavar='PDF_DIR',
+                        help='First calibrate each variant from PDF_DIR/<variant>.pdf, compiled from the same (untailored) data')
+    args = parser.parse_args()
+
+    from generate import load_yaml_data
+    from tailor import read_job, tailor_data
+    from variants import VARIANTS
+
+    if args.variant and args.variant not in VARIANTS:
+        print(f"Error: Unknown variant: {args.variant}", file=sys.stderr)
+        return 1
+    try:
+        data = load_yaml_data(args.data_dir)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    names = [args.variant] if args.variant else list(VARIANTS)
+    if args.calibrate:
+        for name in names:
+            try:
+                m = calibrate(VARIANTS[name], data, args.calibrate / f"{name}.pdf")
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+            print(f"✓ Calibrated {name}: main x{m.main_scale:.2f}, sidebar x{m.side_scale:.2f}")
+    if args.job:
+        data = tailor_data(data, read_job(args.job))
+
+    for name in names:
+        _, report = fit_variant(VARIANTS[name], data)
+        print(("✂ " if report.trimmed else "✓ ") + report.summary())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for compiled PDFs.
+
+A cache key is the SHA-256 of everything that determines the PDF: the
+generated .tex bytes, the LaTeX class/config files it is compiled with and
+the compile command. Entries live under <cache_dir>/<key[:2]>/<key>.pdf;
+hits refresh the entry's mtime and eviction removes the least recently used
+entries once the cache grows past its size limit, down to EVICT_TO of it.
+"""
+
+import os
+import shutil
+import threading
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'pdf'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Eviction trims to this fraction of the limit, so a full cache is not rescanned on every put
+EVICT_TO = 0.9
+
+def cache_key(tex_path: Path, support_files: Iterable[Path], command: str = '') -> str:
+    """Hash the .tex source, its support files (by name and content) and the compile command."""
+    h = hashlib.sha256()
+    h.update(command.encode('utf-8'))
+    h.update(b'\0')
+    h.update(Path(tex_path).read_bytes())
+    for path in sorted(Path(p) for p in support_files):
+        h.update(b'\0' + path.name.encode('utf-8') + b'\0')
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+class PdfCache:
+    """Directory of PDFs keyed by content hash, with LRU eviction by total size.
+
+    The total size is scanned once and then tracked as entries are stored,
+    so put() only walks the directory when it has to evict. max_bytes=None
+    never evicts: batch runs store through unbounded() in their worker
+    processes and call evict() once at the end.
+    """
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # bytes stored, once scanned
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Sent to worker processes without the lock; they rescan if they evict
+        return {'cache_dir': self.cache_dir, 'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def unbounded(self) -> 'PdfCache':
+        """The same cache without eviction, for worker processes of a batch."""
+        return PdfCache(self.cache_dir, None)
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for entry in self.cache_dir.glob('*/*.pdf'):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue  # removed concurrently
+            entries.append((st.st_mtime, st.st_size, entry))
+        return entries
+
+    def get(self, key: str, dest: Path) -> bool:
+        """Copy the cached PDF for key to dest; return False on a miss."""
+        entry = self._entry(key)
+        try:
+            shutil.copyfile(entry, dest)
+        except FileNotFoundError:
+            return False
+        try:
+            os.utime(entry)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted after the copy
+        return True
+
+    def put(self, key: str, pdf_path: Path) -> None:
+        """Store pdf_path under key, evicting if that takes the cache past its size limit."""
+        entry = self._entry(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process and thread, so concurrent puts of one key never share a temp file
+        tmp = entry.with_name(f".{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(pdf_path, tmp)
+        size = tmp.stat().st_size
+        try:
+            replaced = entry.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, entry)
+        if self.max_bytes is None:
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(n for _, n, _ in self._scan())
+            else:
+                self._size += size - replaced
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries down to EVICT_TO of the limit; return bytes freed."""
+        if self.max_bytes is None:
+            return 0
+        entries = self._scan()
+        total = sum(n for _, n, _ in entries)
+        if total <= self.max_bytes:
+            with self._lock:
+                self._size = total
+            return 0
+
+        freed = 0
+        for _, size, entry in sorted(entries):
+            if total - freed <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                entry.unlink()
+                freed += size
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._size = total - freed
+        return freed
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Asyncio orchestrator for the generate -> compile -> test -> package pipeline.
+
+Each (candidate, variant) is a small DAG instead of a serial list of steps:
+
+    validate ─┬─> generate .tex ──> compile PDF ──> test PDF ──┐
+              └─> generate ATS .txt ─────────────────────────> package
+
+Every node runs as soon as its inputs are ready, so pdflatex for one
+variant overlaps with ATS generation and PDF checks for others, across
+candidates. Candidates are read from the store one at a time and at most
+--window of them are in flight, so memory stays flat however many the store
+holds. pdflatex and PDF text checks run on a shared process pool (--jobs);
+generation runs on threads. Transient compile failures are retried with
+exponential backoff, and a per-stage throughput report is printed at the end.
+
+Usage:
+    python3 scripts/pipeline.py --data-dir data --variants all
+    python3 scripts/pipeline.py --store cv.db --candidates all --jobs 8 --retries 2
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from candidate_store import CandidateStore, resolve_candidates
+from compile_latex import CompileError, compile_tex, prepare_formats, support_files
+from generate import resolve_variants, write_variant
+from generate_ats import VARIANT_CONFIG, generate_ats_cv
+from pdf_cache import PdfCache, DEFAULT_CACHE_DIR
+from latex_format import DEFAULT_FORMAT_DIR, format_name, preamble_of
+from schema import validate_candidate
+from test_data_completeness import PDF_BACKENDS, check_pdf, resolve_backend
+from yaml_loader import load_data_dir
+
+STAGES = ('validate', 'generate', 'format', 'compile', 'test', 'ats', 'package')
+
+# pdflatex log lines that point at the environment rather than the document
+TRANSIENT_MARKERS = (
+    "I can't write on file",
+    'No space left on device',
+    'Resource temporarily unavailable',
+    'Interrupted system call',
+)
+
+@dataclass
+class StageStats:
+    """Counts and timings for one pipeline stage."""
+    name: str
+    done: int = 0
+    failed: int = 0
+    retried: int = 0
+    busy: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+
+    def record(self, start: float, end: float, ok: bool) -> None:
+        self.busy += end - start
+        self.first_start = start if self.first_start is None else min(self.first_start, start)
+        self.last_end = end if self.last_end is None else max(self.last_end, end)
+        if ok:
+            self.done += 1
+        else:
+            self.failed += 1
+
+    def mark_retry(self) -> None:
+        """Count the last failed attempt as retried rather than failed."""
+        self.failed -= 1
+        self.retried += 1
+
+    @property
+    def throughput(self) -> float:
+        """Completed items per second of the stage's wall-clock span."""
+        if self.first_start is None:
+            return 0.0
+        span = self.last_end - self.first_start
+        return self.done / span if span > 0 else float('inf')
+
+@dataclass
+class CandidateResult:
+    candidate_id: str
+    errors: List[str] = field(default_factory=list)
+    artifacts: Dict[str, Path] = field(default_factory=dict)
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, CompileError):
+        return any(marker in error.log_tail for marker in TRANSIENT_MARKERS)
+    # A missing pdflatex will not appear on retry
+    return isinstance(error, (OSError, TimeoutError)) and not isinstance(error, FileNotFoundError)
+
+def sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+class Pipeline:
+    """Runs the per-candidate DAGs on one event loop and shared worker pools."""
+
+    def __init__(self, output_dir: Path, ats_dir: Path, class_dir: Path, cache: Optional[PdfCache],
+                 fmt_dir: Optional[Path], jobs: Optional[int], retries: int, retry_delay: float,
+                 backend: str, run_tests: bool, per_candidate_dirs: bool):
+        self.output_dir = output_dir
+        self.ats_dir = ats_dir
+        self.class_dir = class_dir
+        # Workers store without evicting; close() trims the cache once
+        self.cache = cache
+        self.worker_cache = cache.unbounded() if cache is not None else None
+        self.fmt_dir = fmt_dir
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.backend = backend
+        self.run_tests = run_tests
+        self.per_candidate_dirs = per_candidate_dirs
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        self.stats = {name: StageStats(name) for name in STAGES}
+        # Preamble formats already built (or tried) this run, and one lock per format being built
+        self.formats: Set[str] = set()
+        self.format_locks: Dict[str, asyncio.Lock] = {}
+
+    def close(self) -> None:
+        self.pool.shutdown()
+        if self.cache is not None:
+            self.cache.evict()
+
+    async def timed(self, stage: str, func: Any, *args: Any, pool: bool = False,
+                    succeeded: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Run func(*args) on the process pool or a thread, recording its timing under stage.
+
+        The item counts as failed if func raises or succeeded(result) is false.
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        ok = False
+        try:
+            if pool:
+                result = await loop.run_in_executor(self.pool, func, *args)
+            else:
+                result = await asyncio.to_thread(func, *args)
+            ok = succeeded(result) if succeeded else True
+            return result
+        finally:
+            self.stats[stage].record(start, time.perf_counter(), ok)
+
+    def dirs(self, candidate_id: str) -> Tuple[Path, Path]:
+        if self.per_candidate_dirs:
+            return self.output_dir / candidate_id, self.ats_dir / candidate_id
+        return self.output_dir, self.ats_dir
+
+    async def prepare_format(self, tex_path: Path) -> None:
+        """Build the precompiled format for tex_path's preamble, once per distinct preamble."""
+        preamble = preamble_of(tex_path)
+        if preamble is None:
+            return
+        name = format_name(preamble, support_files(self.class_dir))
+        async with self.format_locks.setdefault(name, asyncio.Lock()):
+            if name in self.formats:
+                return
+            # A format that fails to build is reported once; its documents compile without it
+            await self.timed('format', prepare_formats, [tex_path], self.class_dir, self.fmt_dir,
+                             pool=True, succeeded=bool)
+            self.formats.add(name)
+
+    async def compile(self, tex_path: Path) -> str:
+        if self.fmt_dir is not None:
+            await self.prepare_format(tex_path)
+        for attempt in range(self.retries + 1):
+            try:
+                return await self.timed('compile', compile_tex, tex_path, self.class_dir,
+                                        self.worker_cache, self.fmt_dir, pool=True)
+            except Exception as e:
+                if attempt == self.retries or not is_transient(e):
+                    raise
+                self.stats['compile'].mark_retry()
+                delay = self.retry_delay * 2 ** attempt
+                print(f"↻ {tex_path}: {e}; retrying in {delay:g}s")
+                await asyncio.sleep(delay)
+
+    async def latex_branch(self, candidate_id: str, data: Dict[str, Any],
+                           variant: str, result: CandidateResult) -> None:
+        """generate .tex -> compile -> test for one variant."""
+        latex_dir, _ = self.dirs(candidate_id)
+        tex_path = latex_dir / f"{variant}.tex"
+        await self.timed('generate', write_variant, variant, data, tex_path)
+        result.artifacts[f"{variant}.tex"] = tex_path
+
+        try:
+            status = await self.compile(tex_path)
+        except CompileError as e:
+            result.errors.append(f"{variant}: {e}")
+            print(f"❌ {candidate_id}/{variant}: {e}\n{e.log_tail}", file=sys.stderr)
+            return
+        pdf_path = tex_path.with_suffix('.pdf')
+        result.artifacts[f"{variant}.pdf"] = pdf_path
+        print(f"✓ {pdf_path} ({status})")
+
+        if self.run_tests:
+            issues = await self.timed('test', check_pdf, data, variant, pdf_path,
+                                      self.backend, pool=True, succeeded=lambda issues: not issues)
+            if issues:
+                result.errors.extend(f"{variant}: {issue}" for issue in issues)
+                print(f"❌ {candidate_id}/{variant}: {len(issues)} completeness issues")
+            else:
+                print(f"✅ {candidate_id}/{variant}: all YAML data found in PDF")
+
+    async def ats_branch(self, candidate_id: str, data: Dict[str, Any], variant: str,
+                         result: CandidateResult) -> None:
+        _, ats_dir = self.dirs(candidate_id)
+        txt_path = ats_dir / f"{variant}.txt"
+
+        def write_ats() -> None:
+            txt_path.parent.mkdir(parents=True, exist_ok=True)
+            txt_path.write_text(generate_ats_cv(data, variant), encoding='utf-8')
+
+        await self.timed('ats', write_ats)
+        result.artifacts[f"ats/{variant}.txt"] = txt_path
+
+    async def package(self, result: CandidateResult) -> None:
+        """Write the candidate's manifest of artifacts (with digests) and outcome."""
+        latex_dir, _ = self.dirs(result.candidate_id)
+
+        def write_manifest() -> None:
+            manifest = {
+                'candidate': result.candidate_id,
+                'ok': not result.errors,
+                'errors': result.errors,
+                'artifacts': {name: {'path': str(path), 'sha256': sha256_file(path)}
+                              for name, path in sorted(result.artifacts.items()) if path.exists()},
+            }
+            latex_dir.mkdir(parents=True, exist_ok=True)
+            with open(latex_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        await self.timed('package', write_manifest)
+
+    async def run_candidate(self, candidate_id: str, data: Dict[str, Any],
+                            variants: List[str]) -> CandidateResult:
+        result = CandidateResult(candidate_id)
+        start = time.perf_counter()
+        errors = validate_candidate(data, variants)
+        self.stats['validate'].record(start, time.perf_counter(), not errors)
+        if errors:
+            result.errors.extend(errors)
+            print(f"❌ Rejected {candidate_id}: {len(errors)} schema errors", file=sys.stderr)
+            for error in errors:
+                print(f"    {error}", file=sys.stderr)
+            return result
+
+        branches = [self.latex_branch(candidate_id, data, v, result) for v in variants]
+        branches += [self.ats_branch(candidate_id, data, v, result) for v in variants if v in VARIANT_CONFIG]
+        outcomes = await asyncio.gather(*branches, return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                result.errors.append(f"{type(outcome).__name__}: {outcome}")
+                print(f"❌ {candidate_id}: {type(outcome).__name__}: {outcome}", file=sys.stderr)
+
+        await self.package(result)
+        return result
+
+    async def run(self, candidates: Iterable[Tuple[str, Dict[str, Any]]], variants: List[str],
+                  window: int) -> Tuple[int, List[CandidateResult]]:
+        """Run every candidate, at most window at a time; return (candidates run, failed results).
+
+        The next candidate is only read once a slot is free, so candidates can be
+        a lazy store iterator.
+        """
+        slots = asyncio.Semaphore(window)
+        running: Set[asyncio.Task] = set()
+        failed: List[CandidateResult] = []
+
+        async def run_one(candidate_id: str, data: Dict[str, Any]) -> None:
+            try:
+                result = await self.run_candidate(candidate_id, data, variants)
+                if result.errors:
+                    failed.append(result)
+            finally:
+                slots.release()
+
+        total = 0
+        for candidate_id, data in candidates:
+            await slots.acquire()
+            task = asyncio.create_task(run_one(candidate_id, data))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            total += 1
+        await asyncio.gather(*running)
+        return total, failed
+
+    def report(self, wall: float) -> None:
+        print(f"\n{'stage':<10} {'done':>6} {'failed':>6} {'retried':>7} {'busy s':>8} {'items/s':>8}")
+        for stats in self.stats.values():
+            if stats.first_start is None:
+                continue
+            print(f"{stats.name:<10} {stats.done:>6} {stats.failed:>6} {stats.retried:>7} "
+                  f"{stats.busy:>8.2f} {stats.throughput:>8.1f}")
+        print(f"Total wall time: {wall:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run generate -> compile -> test -> package concurrently across candidates and variants'
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data-dir', type=Path, help='Directory containing YAML data files')
+    source.add_argument('--store', type=Path, help='Candidate store file (see candidate_store.py)')
+    parser.add_argument('--candidates', metavar='LIST',
+                        help="Candidate IDs from --store: 'all' or a comma-separated list")
+    parser.add_argument('--variants', metavar='LIST', default='all',
+                        help="'all' or a comma-separated list of variants (default: all)")
+    parser.add_argument('--output-dir', type=Path, default=Path('output/generated'),
+                        help='Directory for .tex/.pdf files (per-candidate subdirectories with --store)')
+    parser.add_argument('--ats-dir', type=Path, default=Path('output/ats'),
+                        help='Directory for ATS .txt files')
+    parser.add_argument('--class-dir', type=Path, default=Path('templates/altacv-class'),
+                        help='Directory with altacv.cls and .cfg files')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR, help='PDF cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Always run pdflatex')
+    parser.add_argument('--preload', action='store_true',
+                        help='Build a precompiled format per distinct preamble in --format-dir and compile against it')
+    parser.add_argument('--format-dir', type=Path, default=DEFAULT_FORMAT_DIR,
+                        help='Directory for precompiled .fmt files')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for pdflatex and PDF checks (default: number of CPUs)')
+    parser.add_argument('--window', type=int, default=None,
+                        help='Candidates in flight at once (default: twice the worker count)')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='Retries for transient compile failures (default: 2)')
+    parser.add_argument('--retry-delay', type=float, default=1.0,
+                        help='Initial retry backoff in seconds, doubled per attempt (default: 1)')
+    parser.add_argument('--pdf-backend', default='auto', choices=['auto'] + list(PDF_BACKENDS),
+                        help='Text extraction backend for the completeness test')
+    parser.add_argument('--skip-tests', action='store_true', help='Do not run the completeness test')
+    args = parser.parse_args()
+
+    if bool(args.store) != bool(args.candidates):
+        parser.error('--store and --candidates must be used together')
+    if args.window is not None and args.window < 1:
+        parser.error('--window must be at least 1')
+
+    store = None
+    try:
+        variants = resolve_variants(args.variants)
+        if args.store:
+            if not args.store.exists():
+                print(f"Error: Candidate store not found: {args.store}", file=sys.stderr)
+                return 1
+            store = CandidateStore(args.store)
+            candidate_ids = resolve_candidates(store, args.candidates)
+            candidates = store.iter_candidates(candidate_ids)
+        else:
+            if not args.data_dir.exists():
+                print(f"Error: Data directory not found: {args.data_dir}", file=sys.stderr)
+                return 1
+            candidate_ids = [args.data_dir.resolve().name]
+            candidates = iter([(candidate_ids[0], load_data_dir(args.data_dir))])
+        backend = 'auto' if args.skip_tests else resolve_backend(args.pdf_backend)
+    except (ValueError, RuntimeError) as e:
+        if store:
+            store.close()
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    cache = None if args.no_cache else PdfCache(args.cache_dir)
+    pipeline = Pipeline(
+        args.output_dir, args.ats_dir, args.class_dir, cache,
+        args.format_dir if args.preload else None, args.jobs, args.retries, args.retry_delay,
+        backend, not args.skip_tests, per_candidate_dirs=bool(args.store),
+    )
+    window = args.window or 2 * (args.jobs or os.cpu_count() or 1)
+    print(f"Running {len(candidate_ids)} candidates x {len(variants)} variants...")
+    start = time.perf_counter()
+    try:
+        total, failed = asyncio.run(pipeline.run(candidates, variants, window))
+    finally:
+        pipeline.close()
+        if store:
+            store.close()
+    pipeline.report(time.perf_counter() - start)
+
+    print(f"{total - len(failed)} of {total} candidates passed")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
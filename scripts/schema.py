@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Declarative schema for the data/*.yaml files.
+
+The schema is written with a few node types (Str, Scalar, ListOf, Record,
+MapOf) and compiled once into nested closures. A compiled validator walks a
+candidate's data and returns every error it finds, with its path, instead of
+stopping at the first one. That lets a batch be checked up front, so bad
+candidates are rejected before they reach generation and pdflatex.
+
+Usage:
+    python3 scripts/schema.py --data-dir data/
+    python3 scripts/schema.py --store cv.db --candidates all
+"""
+
+import sys
+import argparse
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# A compiled check appends "path: message" strings to errors
+Check = Callable[[Any, str, List[str]], None]
+
+def _type_name(value: Any) -> str:
+    return 'null' if value is None else type(value).__name__
+
+class Str:
+    """A string (optionally non-empty)."""
+
+    def __init__(self, allow_empty: bool = True):
+        self.allow_empty = allow_empty
+
+    def compile(self) -> Check:
+        allow_empty = self.allow_empty
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, str):
+                errors.append(f"{path}: expected string, got {_type_name(value)}")
+            elif not allow_empty and not value.strip():
+                errors.append(f"{path}: must not be empty")
+        return check
+
+class Scalar:
+    """A string, number or date (e.g. start_date: 2025 or "05/2026")."""
+
+    def compile(self) -> Check:
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if value is None or isinstance(value, (dict, list)):
+                errors.append(f"{path}: expected a scalar value, got {_type_name(value)}")
+        return check
+
+class ListOf:
+    """A list whose items all match item."""
+
+    def __init__(self, item: Any, min_items: int = 0):
+        self.item = item
+        self.min_items = min_items
+
+    def compile(self) -> Check:
+        item_check = self.item.compile()
+        min_items = self.min_items
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected list, got {_type_name(value)}")
+                return
+            if len(value) < min_items:
+                errors.append(f"{path}: expected at least {min_items} entries, got {len(value)}")
+            for i, item in enumerate(value):
+                item_check(item, f"{path}[{i}]", errors)
+        return check
+
+class Record:
+    """A mapping with required and optional fields."""
+
+    def __init__(self, required: Dict[str, Any], optional: Optional[Dict[str, Any]] = None):
+        self.required = required
+        self.optional = optional or {}
+
+    def compile(self) -> Check:
+        required = [(key, node.compile()) for key, node in self.required.items()]
+        optional = [(key, node.compile()) for key, node in self.optional.items()]
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected mapping, got {_type_name(value)}")
+                return
+            for key, key_check in required:
+                if key not in value:
+                    errors.append(f"{path}: missing required field '{key}'")
+                else:
+                    key_check(value[key], f"{path}.{key}", errors)
+            for key, key_check in optional:
+                if key in value and value[key] is not None:
+                    key_check(value[key], f"{path}.{key}", errors)
+        return check
+
+class MapOf:
+    """A mapping with arbitrary keys whose values all match value, plus required keys."""
+
+    def __init__(self, value: Any, required_keys: Sequence[str] = ()):
+        self.value = value
+        self.required_keys = list(required_keys)
+
+    def compile(self) -> Check:
+        value_check = self.value.compile()
+        required_keys = self.required_keys
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected mapping, got {_type_name(value)}")
+                return
+            for key in required_keys:
+                if key not in value:
+                    errors.append(f"{path}: missing required key '{key}'")
+            for key, item in value.items():
+                value_check(item, f"{path}.{key}", errors)
+        return check
+
+class Any_:
+    """Accepts any value (free-form sections)."""
+
+    def compile(self) -> Check:
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            pass
+        return check
+
+# Variants whose taglines personal.yaml must provide
+DEFAULT_VARIANTS = ('academic-researcher', 'industrial-scientist')
+
+# Skill categories the LaTeX variants render
+REQUIRED_SKILL_CATEGORIES = ('Scientific Expertise', 'Machine Learning & Statistics', 'Programming & Computation')
+
+def candidate_schema(variants: Sequence[str] = DEFAULT_VARIANTS) -> Dict[str, Tuple[Any, bool]]:
+    """Schema for one candidate: {file stem: (node, required)}."""
+    tags = ListOf(Str())
+    return {
+        'personal': (Record(
+            required={
+                'first_name': Str(allow_empty=False),
+                'last_name': Str(allow_empty=False),
+                'email': Str(),
+                'phone': Str(),
+                'location': Str(),
+                'website': Str(),
+                'linkedin': Str(),
+                'github': Str(),
+                'taglines': Record(required={variant: Str() for variant in variants}),
+            },
+        ), True),
+        'experience': (ListOf(Record(
+            required={
+                'title': Str(allow_empty=False),
+                'company': Str(),
+                'location': Str(),
+                'start_date': Scalar(),
+                'end_date': Scalar(),
+                'tags': tags,
+                'achievements': ListOf(Str()),
+            },
+        )), True),
+        'skills': (MapOf(ListOf(Str()), required_keys=REQUIRED_SKILL_CATEGORIES), True),
+        'strengths': (ListOf(Record(
+            required={
+                'title': Str(allow_empty=False),
+                'description': Str(),
+            },
+            optional={'tags': tags},
+        ), min_items=1), True),
+        'education': (ListOf(Record(
+            required={
+                'degree': Str(allow_empty=False),
+                'institution': Str(),
+                'location': Str(),
+                'start_date': Scalar(),
+                'end_date': Scalar(),
+            },
+            optional={'specialization': Str(), 'notes': Str()},
+        )), True),
+        'certifications': (ListOf(Record(
+            required={'name': Str(allow_empty=False)},
+            optional={'full_name': Str(), 'issuer': Str(), 'date': Scalar(), 'tags': tags},
+        )), True),
+        'cover-letter-template': (MapOf(Any_()), False),
+    }
+
+@lru_cache(maxsize=None)
+def compiled_validator(variants: Tuple[str, ...] = DEFAULT_VARIANTS) -> Callable[[Dict[str, Any]], List[str]]:
+    """Compile the candidate schema once per set of variants into a validator function."""
+    files = [(stem, node.compile(), required) for stem, (node, required) in candidate_schema(variants).items()]
+
+    def validate(data: Dict[str, Any]) -> List[str]:
+        errors: List[str] = []
+        for stem, check, required in files:
+            if stem not in data:
+                if required:
+                    errors.append(f"{stem}.yaml: file missing")
+                continue
+            check(data[stem], stem, errors)
+        return errors
+    return validate
+
+def validate_candidate(data: Dict[str, Any], variants: Sequence[str] = DEFAULT_VARIANTS) -> List[str]:
+    """Return every schema error in one candidate's data (empty if valid)."""
+    if not isinstance(data, dict):
+        return [f"data: expected mapping, got {_type_name(data)}"]
+    return compiled_validator(tuple(variants))(data)
+
+def validate_batch(candidates: Iterable[Tuple[str, Dict[str, Any]]],
+                   variants: Sequence[str] = DEFAULT_VARIANTS) -> Dict[str, List[str]]:
+    """Validate many candidates; return {candidate_id: errors} for the invalid ones."""
+    invalid = {}
+    for candidate_id, data in candidates:
+        errors = validate_candidate(data, variants)
+        if errors:
+            invalid[candidate_id] = errors
+    return invalid
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate CV data against the schema')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data-dir', type=Path, help='Directory containing YAML data files')
+    source.add_argument('--store', type=Path, help='Candidate store file (see candidate_store.py)')
+    parser.add_argument('--candidates', metavar='LIST', default='all',
+                        help="Candidate IDs from --store: 'all' or a comma-separated list")
+    parser.add_argument('--valid-ids', type=Path,
+                        help='Write the IDs of candidates that passed, one per line')
+    args = parser.parse_args()
+
+    from yaml_loader import load_data_dir
+    from candidate_store import CandidateStore, resolve_candidates
+
+    try:
+        if args.data_dir:
+            candidates = [(str(args.data_dir), load_data_dir(args.data_dir, snapshot_dir=None))]
+            invalid = validate_batch(candidates)
+            checked = [candidate_id for candidate_id, _ in candidates]
+        else:
+            with CandidateStore(args.store) as store:
+                checked = resolve_candidates(store, args.candidates)
+                invalid = validate_batch(store.iter_candidates(checked))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for candidate_id, errors in invalid.items():
+        print(f"❌ {candidate_id}: {len(errors)} errors")
+        for error in errors:
+            print(f"    {error}")
+
+    if args.valid_ids:
+        valid = [candidate_id for candidate_id in checked if candidate_id not in invalid]
+        args.valid_ids.write_text(''.join(f"{candidate_id}\n" for candidate_id in valid))
+
+    print(f"Validated {len(checked)} candidates: {len(checked) - len(invalid)} valid, {len(invalid)} invalid")
+    return 1 if invalid else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+CV render service - a long-running HTTP/JSON API for previews.
+
+Keeps everything a cold `generate.py` + `make` run pays for warm in one
+process: compiled variant specs, the ATS generator, precompiled Jinja2
+templates, the PDF cache and (with --preload) precompiled preamble formats.
+
+Endpoints:
+    GET  /health                      queue and worker state
+    GET  /variants                    variants per output format
+    POST /render                      {"variant": ..., "format": "tex"|"txt"|"pdf",
+                                       "data": {...} | "candidate": "<id in --store>"}
+    GET  /render?variant=..&format=..&candidate=..
+
+Renders (tex/txt) and pdflatex runs (pdf) go through separate bounded
+queues: at most --render-workers / --jobs run at once, at most --max-queued
+wait, and anything beyond that (or waiting longer than --queue-timeout) is
+rejected with 503 and Retry-After instead of piling up.
+
+Usage:
+    python3 scripts/serve.py --port 8765 --store cv.db --jobs 4 --preload
+    python3 scripts/serve.py --socket /tmp/cv.sock
+    curl -s localhost:8765/render -d '{"variant": "academic-researcher", "format": "pdf", "candidate": "mark"}' -o cv.pdf
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import traceback
+import socketserver
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from jinja2 import TemplateError
+
+from candidate_store import CandidateStore
+from compile_latex import CompileError, compile_tex, latex_env, support_files
+from generate import GENERATORS
+from generate_ats import VARIANT_CONFIG, generate_ats_cv
+from latex_format import FormatError, DEFAULT_FORMAT_DIR, ensure_format, split_preamble
+from pdf_cache import PdfCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from schema import validate_candidate
+from template_engine import TemplateEngine
+
+CONTENT_TYPES = {
+    'tex': 'application/x-tex; charset=utf-8',
+    'txt': 'text/plain; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+class Overloaded(Exception):
+    """The queue is full (or the wait timed out); the client should retry later."""
+
+class RequestError(Exception):
+    """A request the service cannot serve; carries the HTTP status and details."""
+
+    def __init__(self, status: int, message: str, details: Optional[List[str]] = None):
+        super().__init__(status, message, details)
+        self.status = status
+        self.message = message
+        self.details = details or []
+
+class WorkQueue:
+    """Admission control: at most concurrency jobs run and at most max_waiting wait."""
+
+    def __init__(self, name: str, concurrency: int, max_waiting: int, timeout: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.cond = threading.Condition()
+        self.running = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self.cond:
+            if self.running >= self.concurrency:
+                if self.waiting >= self.max_waiting:
+                    self.rejected += 1
+                    raise Overloaded(f"{self.name} queue full ({self.waiting} waiting)")
+                self.waiting += 1
+                try:
+                    ready = self.cond.wait_for(lambda: self.running < self.concurrency, self.timeout)
+                finally:
+                    self.waiting -= 1
+                if not ready:
+                    self.rejected += 1
+                    raise Overloaded(f"timed out after {self.timeout:g}s in the {self.name} queue")
+            self.running += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.running -= 1
+                self.completed += 1
+                self.cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            return {
+                'running': self.running,
+                'waiting': self.waiting,
+                'concurrency': self.concurrency,
+                'max_waiting': self.max_waiting,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+class RenderService:
+    """Warm render state shared by every request thread."""
+
+    def __init__(self, class_dir: Path, cache: Optional[PdfCache], fmt_dir: Optional[Path],
+                 store_path: Optional[Path], render_workers: int, compile_workers: int,
+                 max_queued: int, queue_timeout: float):
+        self.class_dir = class_dir
+        self.cache = cache
+        self.fmt_dir = fmt_dir
+        self.store_path = store_path
+        self.started = time.time()
+
+        self.templates = TemplateEngine()
+        # Layout name -> template, e.g. 'cloud-engineer' -> 'cloud-engineer/template.tex.j2'
+        self.layouts = {name.split('/')[0]: name for name in self.templates.precompile()
+                        if name.endswith('/template.tex.j2')}
+
+        self.render_queue = WorkQueue('render', render_workers, max_queued, queue_timeout)
+        self.compile_queue = WorkQueue('compile', compile_workers, max_queued, queue_timeout)
+
+        if fmt_dir is not None:
+            self.prepare_formats()
+
+    def prepare_formats(self) -> None:
+        """Dump each LaTeX variant's preamble into a format before serving."""
+        files = support_files(self.class_dir)
+        env = latex_env(self.class_dir)
+        for variant, generate in GENERATORS.items():
+            # The preamble is the first fragment and does not depend on the data
+            preamble = split_preamble(next(iter(generate({}))))[0]
+            try:
+                ensure_format(preamble, self.fmt_dir, self.class_dir, files, env)
+                print(f"✓ Preloaded format for {variant}")
+            except FormatError as e:
+                print(f"⚠️  {e}", file=sys.stderr)
+
+    def variants(self) -> Dict[str, List[str]]:
+        latex = list(GENERATORS) + sorted(self.layouts)
+        return {'tex': latex, 'pdf': latex, 'txt': sorted(VARIANT_CONFIG)}
+
+    def load(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Candidate data from the request body or the candidate store."""
+        if isinstance(request.get('data'), dict):
+            return request['data']
+        candidate_id = request.get('candidate')
+        if not candidate_id:
+            raise RequestError(400, "request needs 'data' or 'candidate'")
+        if not isinstance(candidate_id, str):
+            raise RequestError(400, "'candidate' must be a string")
+        if self.store_path is None:
+            raise RequestError(400, "'candidate' needs the server to run with --store")
+        # SQLite connections are per thread; opening one is cheap
+        with CandidateStore(self.store_path) as store:
+            try:
+                return store.load(candidate_id)
+            except ValueError as e:
+                raise RequestError(404, str(e))
+
+    def render_text(self, variant: str, fmt: str, data: Dict[str, Any]) -> str:
+        if fmt == 'txt':
+            if variant not in VARIANT_CONFIG:
+                raise RequestError(404, f"Unknown ATS variant: {variant}")
+        elif variant in self.layouts:
+            with self.render_queue.slot():
+                try:
+                    return self.templates.render(self.layouts[variant], data, variant)
+                except TemplateError as e:
+                    raise RequestError(422, f"Template {self.layouts[variant]} failed: {e}")
+        elif variant not in GENERATORS:
+            raise RequestError(404, f"Unknown variant: {variant}")
+
+        errors = validate_candidate(data, [variant])
+        if errors:
+            raise RequestError(400, f"{len(errors)} schema errors", errors)
+        with self.render_queue.slot():
+            if fmt == 'txt':
+                return generate_ats_cv(data, variant)
+            return ''.join(GENERATORS[variant](data))
+
+    def render(self, request: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Serve one render request; returns (body, extra headers)."""
+        variant = request.get('variant')
+        fmt = request.get('format', 'tex')
+        if not variant:
+            raise RequestError(400, "request needs 'variant'")
+        for field, value in (('variant', variant), ('format', fmt)):
+            if not isinstance(value, str):
+                raise RequestError(400, f"'{field}' must be a string")
+        if fmt not in CONTENT_TYPES:
+            raise RequestError(400, f"Unknown format: {fmt} (choose from: {', '.join(CONTENT_TYPES)})")
+
+        data = self.load(request)
+        text = self.render_text(variant, 'txt' if fmt == 'txt' else 'tex', data)
+        if fmt != 'pdf':
+            return text.encode('utf-8'), {}
+
+        with self.compile_queue.slot(), tempfile.TemporaryDirectory(prefix='cv-serve-') as workdir:
+            tex_path = Path(workdir) / f"{variant}.tex"
+            tex_path.write_text(text, encoding='utf-8')
+            try:
+                status = compile_tex(tex_path, self.class_dir, self.cache, self.fmt_dir)
+            except CompileError as e:
+                raise RequestError(422, str(e), e.log_tail.splitlines())
+            return tex_path.with_suffix('.pdf').read_bytes(), {'X-Compile-Status': status}
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            'status': 'ok',
+            'uptime_s': round(time.time() - self.started, 1),
+            'queues': {q.name: q.stats() for q in (self.render_queue, self.compile_queue)},
+        }
+
+class RenderHandler(BaseHTTPRequestHandler):
+    server_version = 'cv-render/1'
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_body(self, status: int, body: bytes, content_type: str,
+                  headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8') + b'\n'
+        self.send_body(status, body, 'application/json; charset=utf-8', headers)
+
+    def serve_render(self, request: Dict[str, Any]) -> None:
+        service = self.server.service
+        try:
+            body, headers = service.render(request)
+        except RequestError as e:
+            self.send_json(e.status, {'error': e.message, 'details': e.details})
+            return
+        except Overloaded as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': str(self.server.retry_after)})
+            return
+        except FileNotFoundError as e:
+            self.send_json(500, {'error': f"{e.filename or 'pdflatex'} not found - is TeX Live installed?"})
+            return
+        except Exception as e:
+            # Answer instead of dropping the connection; the traceback goes to the server log
+            traceback.print_exc()
+            self.send_json(500, {'error': f"Internal error: {type(e).__name__}: {e}"})
+            return
+        self.send_body(200, body, CONTENT_TYPES[request.get('format', 'tex')], headers)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self.send_json(200, self.server.service.health())
+        elif url.path == '/variants':
+            self.send_json(200, self.server.service.variants())
+        elif url.path == '/render':
+            self.serve_render({key: values[-1] for key, values in parse_qs(url.query).items()})
+        else:
+            self.send_json(404, {'error': f"Not found: {url.path}"})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > self.server.max_body:
+            self.send_json(413, {'error': f"Request body over {self.server.max_body} bytes"},
+                           {'Connection': 'close'})
+            self.close_connection = True
+            return
+        raw = self.rfile.read(length)
+        if url.path != '/render':
+            self.send_json(404, {'error': f"Not found: {url.path}"})
+            return
+        try:
+            request = json.loads(raw or b'{}')
+        except json.JSONDecodeError as e:
+            self.send_json(400, {'error': f"Invalid JSON: {e}"})
+            return
+        if not isinstance(request, dict):
+            self.send_json(400, {'error': 'Request body must be a JSON object'})
+            return
+        self.serve_render(request)
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def make_server(args: argparse.Namespace, service: RenderService) -> socketserver.BaseServer:
+    if args.socket:
+        if args.socket.exists():
+            args.socket.unlink()
+        server = UnixHTTPServer(str(args.socket), RenderHandler)
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), RenderHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.quiet = args.quiet
+    server.max_body = args.max_body_kb * 1024
+    server.retry_after = max(1, int(args.queue_timeout))
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='CV render service - HTTP/JSON API for .tex, .txt and PDF renders'
+    )
+    listen = parser.add_mutually_exclusive_group()
+    listen.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    listen.add_argument('--socket', type=Path, help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--host', default='127.0.0.1', help='TCP bind address (default: localhost only)')
+    parser.add_argument('--store', type=Path, help="Candidate store for requests by 'candidate' ID")
+    parser.add_argument('--class-dir', type=Path, default=Path('templates/altacv-class'),
+                        help='Directory with altacv.cls and .cfg files')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR, help='PDF cache directory')
+    parser.add_argument('--cache-size-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help='Maximum cache size before LRU eviction (MB)')
+    parser.add_argument('--no-cache', action='store_true', help='Always run pdflatex')
+    parser.add_argument('--preload', action='store_true',
+                        help='Precompile each variant preamble into a format at start-up')
+    parser.add_argument('--format-dir', type=Path, default=DEFAULT_FORMAT_DIR,
+                        help='Directory for precompiled .fmt files')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Concurrent pdflatex runs (default: number of CPUs)')
+    parser.add_argument('--render-workers', type=int, default=8,
+                        help='Concurrent .tex/.txt renders (default: 8)')
+    parser.add_argument('--max-queued', type=int, default=32,
+                        help='Requests allowed to wait per queue before answering 503 (default: 32)')
+    parser.add_argument('--queue-timeout', type=float, default=30.0,
+                        help='Seconds a request may wait for a worker before answering 503 (default: 30)')
+    parser.add_argument('--max-body-kb', type=int, default=1024, help='Largest accepted request body (KB)')
+    parser.add_argument('--quiet', action='store_true', help='Do not log each request')
+    args = parser.parse_args()
+
+    if args.store and not args.store.exists():
+        print(f"Error: Candidate store not found: {args.store}", file=sys.stderr)
+        return 1
+
+    cache = None if args.no_cache else PdfCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+    try:
+        service = RenderService(
+            args.class_dir, cache, args.format_dir if args.preload else None, args.store,
+            args.render_workers, args.jobs, args.max_queued, args.queue_timeout,
+        )
+        server = make_server(args, service)
+    except (OSError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    where = args.socket if args.socket else f"http://{args.host}:{args.port}"
+    print(f"✓ Serving CV renders on {where} ({len(GENERATORS)} LaTeX variants, "
+          f"{len(service.layouts)} template layouts, {args.jobs} pdflatex workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and args.socket.exists():
+            args.socket.unlink()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Inverted tag index over tagged CV entries (experience, strengths,
+certifications).
+
+Each entry list is scanned once to map tag -> bitset of entry positions
+(plain Python ints). Selecting content is then set algebra on those
+bitsets, and results always come back in the entries' original order:
+
+    index = tag_index(data['experience'])
+    index.any_of(['leadership', 'trust'])
+    index.query('academic-researcher AND NOT trust')
+
+Indexes are cached per entry list, so every variant (and every template
+filter call) rendered from the same loaded data shares one index.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from identity_cache import IdentityCache
+
+# Sections whose entries carry a 'tags' list
+TAGGED_SECTIONS = ('experience', 'strengths', 'certifications')
+
+class QueryError(ValueError):
+    """A tag query that could not be parsed."""
+
+class TagIndex:
+    """Tag -> entry bitset index over one list of tagged entries."""
+
+    def __init__(self, items: Iterable[Dict[str, Any]]):
+        self.items: List[Dict[str, Any]] = list(items)
+        self.all = (1 << len(self.items)) - 1
+        self.postings: Dict[str, int] = {}
+        for i, item in enumerate(self.items):
+            bit = 1 << i
+            for tag in item.get('tags', []):
+                self.postings[tag] = self.postings.get(tag, 0) | bit
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def tags(self) -> List[str]:
+        return sorted(self.postings)
+
+    def mask(self, tag: str) -> int:
+        """Bitset of the entries tagged with tag."""
+        return self.postings.get(tag, 0)
+
+    def entries(self, mask: int) -> List[Dict[str, Any]]:
+        """Entries selected by mask, in their original order."""
+        items = self.items
+        selected = []
+        while mask:
+            low = mask & -mask
+            selected.append(items[low.bit_length() - 1])
+            mask ^= low
+        return selected
+
+    def select(self, any_of: Sequence[str] = (), all_of: Sequence[str] = (),
+               none_of: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """Entries with at least one of any_of (if given), every tag in all_of
+        and none of none_of."""
+        mask = self.all
+        if any_of:
+            mask = 0
+            for tag in any_of:
+                mask |= self.mask(tag)
+        for tag in all_of:
+            mask &= self.mask(tag)
+        for tag in none_of:
+            mask &= ~self.mask(tag)
+        return self.entries(mask)
+
+    def any_of(self, tags: Sequence[str]) -> List[Dict[str, Any]]:
+        return self.select(any_of=tags)
+
+    def query(self, expression: str) -> List[Dict[str, Any]]:
+        """Entries matching a boolean tag expression, e.g. 'research AND NOT trust'."""
+        return self.entries(compile_query(expression)(self))
+
+# ---------------------------------------------------------------------------
+# Query expressions: tags combined with AND, OR, NOT and parentheses.
+# NOT binds tightest, then AND, then OR.
+
+_TOKEN = re.compile(r'\(|\)|[^\s()]+')
+
+Query = Callable[[TagIndex], int]
+
+def _parse_or(tokens: List[str], pos: int) -> Tuple[Query, int]:
+    left, pos = _parse_and(tokens, pos)
+    while pos < len(tokens) and tokens[pos] == 'OR':
+        right, pos = _parse_and(tokens, pos + 1)
+        left = (lambda a, b: lambda index: a(index) | b(index))(left, right)
+    return left, pos
+
+def _parse_and(tokens: List[str], pos: int) -> Tuple[Query, int]:
+    left, pos = _parse_not(tokens, pos)
+    while pos < len(tokens) and tokens[pos] == 'AND':
+        right, pos = _parse_not(tokens, pos + 1)
+        left = (lambda a, b: lambda index: a(index) & b(index))(left, right)
+    return left, pos
+
+def _parse_not(tokens: List[str], pos: int) -> Tuple[Query, int]:
+    if pos >= len(tokens):
+        raise QueryError('unexpected end of query')
+    token = tokens[pos]
+    if token == 'NOT':
+        operand, pos = _parse_not(tokens, pos + 1)
+        return (lambda index: index.all & ~operand(index)), pos
+    if token == '(':
+        inner, pos = _parse_or(tokens, pos + 1)
+        if pos >= len(tokens) or tokens[pos] != ')':
+            raise QueryError("missing ')'")
+        return inner, pos + 1
+    if token in (')', 'AND', 'OR'):
+        raise QueryError(f"unexpected '{token}'")
+    return (lambda index: index.mask(token)), pos + 1
+
+_QUERIES: Dict[str, Query] = {}
+
+def compile_query(expression: str) -> Query:
+    """Parse a tag expression once into a function of a TagIndex returning a bitset."""
+    query = _QUERIES.get(expression)
+    if query is None:
+        tokens = _TOKEN.findall(expression)
+        query, pos = _parse_or(tokens, 0)
+        if pos != len(tokens):
+            raise QueryError(f"unexpected '{tokens[pos]}' in query: {expression}")
+        _QUERIES[expression] = query
+    return query
+
+# ---------------------------------------------------------------------------
+# Per-data cache. Entry lists are dicts' values (or deptrack proxies), so
+# indexes are cached by identity (see identity_cache.py).
+
+CACHE_SIZE = 64
+_INDEXES: 'IdentityCache[TagIndex]' = IdentityCache(TagIndex, CACHE_SIZE)
+
+def tag_index(items: Iterable[Dict[str, Any]]) -> TagIndex:
+    """Return the (cached) index for one list of tagged entries."""
+    return _INDEXES(items)
+
+def candidate_index(data: Dict[str, Any]) -> Dict[str, TagIndex]:
+    """Indexes for every tagged section present in a candidate's data."""
+    return {section: tag_index(data[section]) for section in TAGGED_SECTIONS if section in data}
+
+def clear_cache() -> None:
+    _INDEXES.clear()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Job-description tailoring: rank a candidate's content against a posting.
+
+A TailorIndex is built once per candidate. Every achievement, strength and
+skill becomes a TF-IDF vector over the candidate's own vocabulary, stored
+in an inverted index (token -> [(document, weight)]). Scoring a posting
+only visits the postings of the tokens it shares with the candidate, so
+one index can rank thousands of job descriptions cheaply.
+
+tailor_data() returns a reordered copy of the data: achievements within
+each job, strengths and the skills within each category are sorted by
+relevance (ties keep their original order). The generators' fixed slices
+such as achievements[:4] and strengths[:4] then pick the most relevant
+content. Job order is left chronological.
+
+Usage:
+    python3 scripts/tailor.py --data-dir data --job posting.txt
+    python3 scripts/tailor.py --data-dir data --job postings/*.txt --output-dir tailored/
+    python3 scripts/generate.py --variant academic-researcher --data-dir data --job posting.txt --output cv.tex
+"""
+
+import re
+import sys
+import math
+import argparse
+import yaml
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from identity_cache import IdentityCache
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset('''
+a about above across after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each either etc few for
+from further had has have having he her here hers him his how i if in into is it its itself just
+least less made make many may me more most much must my no nor not now of off on once one only or
+other our ours out over own per plus same she should so some such than that the their theirs them
+then there these they this those through to too under until up upon us using very via was we well
+were what when where which while who whom why will with within without would you your yours
+ability able experience strong work working year years including include includes role team
+'''.split())
+
+def _stem(token: str) -> str:
+    """Fold simple English plurals (simulations -> simulation, studies -> study)."""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stopword-free, plural-folded tokens; keeps 'c++', 'x-ray', 'ci/cd'."""
+    return [_stem(t) for t in TOKEN_RE.findall(str(text).lower()) if t not in STOPWORDS]
+
+def surface_forms(text: str) -> Dict[str, str]:
+    """Map each token to its first spelling in text ('kubernete' -> 'kubernetes')."""
+    forms: Dict[str, str] = {}
+    for t in TOKEN_RE.findall(str(text).lower()):
+        if t not in STOPWORDS:
+            forms.setdefault(_stem(t), t)
+    return forms
+
+@dataclass(frozen=True)
+class Ranked:
+    """One scored piece of content; path locates it in the data."""
+    score: float
+    kind: str
+    path: Tuple[Any, ...]
+    text: str
+
+class TailorIndex:
+    """TF-IDF inverted index over one candidate's achievements, strengths and skills."""
+
+    def __init__(self, data: Dict[str, Any]):
+        # (kind, path, text) per document
+        self.docs: List[Tuple[str, Tuple[Any, ...], str]] = []
+        for i, job in enumerate(data.get('experience', [])):
+            for j, achievement in enumerate(job.get('achievements', [])):
+                self.docs.append(('achievement', ('experience', i, 'achievements', j), achievement))
+        for i, strength in enumerate(data.get('strengths', [])):
+            self.docs.append(('strength', ('strengths', i), f"{strength['title']} {strength['description']}"))
+        for category, skills in data.get('skills', {}).items():
+            for j, skill in enumerate(skills):
+                self.docs.append(('skill', ('skills', category, j), skill))
+
+        counts = [Counter(tokenize(text)) for _, _, text in self.docs]
+        df = Counter(token for c in counts for token in c)
+        n = len(self.docs)
+        self.idf: Dict[str, float] = {t: math.log((1 + n) / (1 + d)) + 1 for t, d in df.items()}
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_id, c in enumerate(counts):
+            vector = {t: (1 + math.log(tf)) * self.idf[t] for t, tf in c.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            for t, w in vector.items():
+                self.postings.setdefault(t, []).append((doc_id, w / norm))
+
+    def query_vector(self, text: str) -> Dict[str, float]:
+        """Normalized TF-IDF vector of a posting, restricted to the candidate's vocabulary."""
+        c = Counter(t for t in tokenize(text) if t in self.idf)
+        vector = {t: (1 + math.log(tf)) * self.idf[t] for t, tf in c.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {t: w / norm for t, w in vector.items()}
+
+    def scores(self, text: str) -> List[float]:
+        """Cosine similarity of every document to the posting."""
+        scores = [0.0] * len(self.docs)
+        for t, qw in self.query_vector(text).items():
+            for doc_id, dw in self.postings[t]:
+                scores[doc_id] += qw * dw
+        return scores
+
+    def rank(self, text: str) -> List[Ranked]:
+        """All documents, best match first."""
+        ranked = [Ranked(score, kind, path, doc) for score, (kind, path, doc) in zip(self.scores(text), self.docs)]
+        return sorted(ranked, key=lambda r: -r.score)
+
+    def matched_terms(self, text: str, limit: int = 15) -> List[str]:
+        """The posting's highest-weighted terms that the candidate's data also uses."""
+        vector = self.query_vector(text)
+        return sorted(vector, key=lambda t: -vector[t])[:limit]
+
+# Recent indexes, keyed by data identity (see identity_cache.py)
+CACHE_SIZE = 64
+_INDEXES: 'IdentityCache[TailorIndex]' = IdentityCache(TailorIndex, CACHE_SIZE)
+
+def tailor_index(data: Dict[str, Any]) -> TailorIndex:
+    """Return the (cached) index for one candidate's data."""
+    return _INDEXES(data)
+
+def _by_score(items: List[Any], scores: List[float]) -> List[Any]:
+    order = sorted(range(len(items)), key=lambda i: -scores[i])  # stable: ties keep input order
+    return [items[i] for i in order]
+
+def tailor_data(data: Dict[str, Any], job_text: str) -> Dict[str, Any]:
+    """Copy of data with achievements, strengths and skills ordered by relevance to job_text.
+
+    The input is not modified; untouched sections are shared with it.
+    """
+    index = tailor_index(data)
+    score_of = {doc[1]: score for score, doc in zip(index.scores(job_text), index.docs)}
+
+    tailored = dict(data)
+    if 'experience' in data:
+        tailored['experience'] = [
+            {**job, 'achievements': _by_score(job['achievements'], [
+                score_of[('experience', i, 'achievements', j)] for j in range(len(job['achievements']))
+            ])} if job.get('achievements') else job
+            for i, job in enumerate(data['experience'])
+        ]
+    if 'strengths' in data:
+        strengths = data['strengths']
+        tailored['strengths'] = _by_score(strengths, [score_of[('strengths', i)] for i in range(len(strengths))])
+    if 'skills' in data:
+        tailored['skills'] = {
+            category: _by_score(skills, [score_of[('skills', category, j)] for j in range(len(skills))])
+            for category, skills in data['skills'].items()
+        }
+    return tailored
+
+def read_job(path: Path) -> str:
+    return Path(path).read_text(encoding='utf-8')
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rank CV content against job descriptions and write tailored data'
+    )
+    parser.add_argument('--data-dir', type=Path, required=True, help='Directory containing YAML data files')
+    parser.add_argument('--job', type=Path, nargs='+', required=True, help='Job description text file(s)')
+    parser.add_argument('--output-dir', type=Path,
+                        help='Write tailored YAML to DIR/<job name>/ (feed to any generator via --data-dir)')
+    parser.add_argument('--top', type=int, default=5, help='Matches to show per posting (default: 5)')
+    args = parser.parse_args()
+
+    from yaml_loader import load_data_dir
+
+    if not args.data_dir.exists():
+        print(f"Error: Data directory not found: {args.data_dir}", file=sys.stderr)
+        return 1
+    missing = [str(job) for job in args.job if not job.exists()]
+    if missing:
+        print(f"Error: Job description not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    data = load_data_dir(args.data_dir)
+    index = tailor_index(data)
+    print(f"Indexed {len(index.docs)} items ({len(index.idf)} terms) from {args.data_dir}")
+
+    for job in args.job:
+        text = read_job(job)
+        ranked = [r for r in index.rank(text) if r.score > 0]
+        print(f"\n{job}: {len(ranked)} matching items")
+        print(f"  Matched terms: {', '.join(index.matched_terms(text)) or '(none)'}")
+        for r in ranked[:args.top]:
+            snippet = r.text if len(r.text) <= 80 else r.text[:77] + '...'
+            print(f"  {r.score:.3f}  {r.kind:<11} {snippet}")
+
+        if args.output_dir:
+            out = args.output_dir / job.stem
+            out.mkdir(parents=True, exist_ok=True)
+            for name, body in tailor_data(data, text).items():
+                with open(out / f"{name}.yaml", 'w', encoding='utf-8') as f:
+                    yaml.safe_dump(body, f, allow_unicode=True, sort_keys=False)
+            print(f"✓ Tailored data written to {out}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
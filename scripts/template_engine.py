@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Jinja2 template engine for the templates/*/template*.tex.j2 layouts.
+
+One long-lived Environment per template directory, with:
+- a FileSystemBytecodeCache, so a template's compiled code is reused across
+  processes and only recompiled when its source changes;
+- auto_reload off, so a loaded Template is reused for every candidate in a
+  batch without re-checking its source;
+- precompile(), which compiles every template ahead of time (e.g. in CI or
+  before a batch) to fill the bytecode cache.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from latex_escape import escape_latex
+from tag_index import tag_index
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = REPO_ROOT / 'templates'
+DEFAULT_BYTECODE_DIR = REPO_ROOT / '.cache' / 'jinja'
+
+TEMPLATE_GLOB = '*.tex.j2'
+
+def filter_by_tags(items, tags):
+    """Filter items by tags for variant.
+
+    Args:
+        items: List of items (jobs, strengths, etc.) with 'tags' field
+        tags: List of tags to filter by
+
+    Returns:
+        List of items that have at least one matching tag
+    """
+    if not tags:
+        return items
+    return tag_index(items).any_of(tags)
+
+class TemplateEngine:
+    """A reusable Jinja2 environment rooted at one template directory."""
+
+    def __init__(self, root: Path = TEMPLATES_DIR, bytecode_dir: Optional[Path] = DEFAULT_BYTECODE_DIR):
+        self.root = Path(root).resolve()
+        bytecode_cache = None
+        if bytecode_dir is not None:
+            Path(bytecode_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+        self.env = Environment(
+            loader=FileSystemLoader(str(self.root)),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+        )
+        self.env.filters['escape_latex'] = escape_latex
+        self.env.filters['filter_by_tags'] = filter_by_tags
+
+    def template_names(self) -> List[str]:
+        """All templates under root, as loader names (e.g. 'cloud-engineer/template.tex.j2')."""
+        return sorted(p.relative_to(self.root).as_posix() for p in self.root.rglob(TEMPLATE_GLOB))
+
+    def get(self, name: str) -> Template:
+        """Load (or reuse) a compiled template by loader name."""
+        return self.env.get_template(name)
+
+    def name_of(self, template_file: Path) -> str:
+        """Loader name for a template file under root."""
+        return Path(template_file).resolve().relative_to(self.root).as_posix()
+
+    def precompile(self) -> List[str]:
+        """Compile every template now, filling the in-memory and bytecode caches."""
+        names = self.template_names()
+        for name in names:
+            self.get(name)
+        return names
+
+    def render(self, name: str, data: Dict[str, Any], variant: str) -> str:
+        """Render one candidate's data; the compiled template is shared between calls."""
+        return self.get(name).render(**data, variant=variant)
+
+_ENGINES: Dict[Path, TemplateEngine] = {}
+
+def engine_for(template_file: Path, bytecode_dir: Optional[Path] = DEFAULT_BYTECODE_DIR) -> TemplateEngine:
+    """The shared engine for the templates/ tree, or for a template stored elsewhere."""
+    template_file = Path(template_file).resolve()
+    root = TEMPLATES_DIR if TEMPLATES_DIR in template_file.parents else template_file.parent
+    engine = _ENGINES.get(root)
+    if engine is None:
+        engine = _ENGINES[root] = TemplateEngine(root, bytecode_dir)
+    return engine
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script to verify page fitting leaves the repository's data unchanged.
+
+The data in data/ fits one page in every variant. Each variant is calibrated
+from its compiled PDF (see page_fit.calibrate), then fit_variant must return
+the spec as it is: nothing dropped. Run it after the PDFs are built, as
+make test does.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+from generate import load_yaml_data
+from page_fit import calibrate, fit_variant
+from variants import VARIANTS
+
+def test_variant(variant: str, data: dict, output_dir: Path) -> bool:
+    """Calibrate one variant from its PDF and check that fitting keeps all its content."""
+    pdf_path = output_dir / f"{variant}.pdf"
+    if not pdf_path.exists():
+        print(f"❌ {variant}: PDF not found: {pdf_path}")
+        return False
+    try:
+        metrics = calibrate(VARIANTS[variant], data, pdf_path)
+    except ValueError as e:
+        print(f"❌ {variant}: {e}")
+        return False
+
+    spec, report = fit_variant(VARIANTS[variant], data, metrics)
+    if spec is not VARIANTS[variant]:
+        print(f"❌ {report.summary()}")
+        return False
+    print(f"✅ {variant}: fits as is (main x{metrics.main_scale:.2f}, sidebar x{metrics.side_scale:.2f})")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Test that page fitting keeps all of the repository data')
+    parser.add_argument('--variant', help='Test specific variant only')
+    parser.add_argument('--output-dir', type=Path,
+                        help='Directory containing the generated PDFs (default: output/generated)')
+    args = parser.parse_args()
+
+    root_dir = Path(__file__).parent.parent
+    output_dir = args.output_dir or root_dir / 'output' / 'generated'
+    if args.variant and args.variant not in VARIANTS:
+        print(f"Error: Unknown variant: {args.variant}")
+        return 1
+
+    print("Page Fit Test")
+    print("="*60)
+    data = load_yaml_data(root_dir / 'data')
+    results = {v: test_variant(v, data, output_dir) for v in ([args.variant] if args.variant else VARIANTS)}
+
+    print("="*60)
+    if all(results.values()):
+        print("🎉 All variants fit unchanged!")
+        return 0
+    print("⚠️  Fitting would drop content from the repository data")
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+CV variant definitions.
+
+Each variant is declared as a VariantSpec and rendered by cv_engine. To add a
+variant, add a spec to VARIANTS and its tagline to personal.yaml; generate.py
+(and its schema check) picks it up from here, and listing it in the
+Makefile's VARIANTS builds it by default.
+"""
+
+from typing import Dict
+
+from cv_engine import (Achievements, Divider, Education, Events, Heading, Profile,
+                       Spacer, Subheading, Tags, Theme, VariantSpec)
+
+INDUSTRIAL_SCIENTIST = VariantSpec(
+    name='industrial-scientist',
+    theme=Theme(
+        comment='INDUSTRIAL SCIENTIST: Innovation & Creativity (Restored Psychology)',
+        unicode_fonts=(r'\setmainfont{Roboto Slab}', r'\setsansfont{Lato}'),
+        pdftex_fonts=(r'\usepackage[rm]{roboto}', r'\usepackage[defaultsans]{lato}'),
+        colors=(
+            ('SlateGrey', '2E2E2E'),
+            ('LightGrey', '666666'),
+            ('EnergeticOrange', 'ff6b35'),
+            ('FriendlyTeal', '00d9ff'),
+            ('CommunityPurple', '7c3aed'),
+        ),
+        roles=(
+            ('name', 'EnergeticOrange'),
+            ('tagline', 'CommunityPurple'),
+            ('heading', 'EnergeticOrange'),
+            ('headingrule', 'FriendlyTeal'),
+            ('subheading', 'CommunityPurple'),
+            ('accent', 'FriendlyTeal'),
+            ('emphasis', 'SlateGrey'),
+            ('body', 'LightGrey'),
+        ),
+        namefont=r'\Huge\sffamily\bfseries',
+        personalinfofont=r'\small',
+        cvsectionfont=r'\Large\sffamily\bfseries',
+        cvsubsectionfont=r'\large\sffamily',
+        linkedin_note='Override linkedin to show "LinkedIn" text with clickable link',
+    ),
+    main=(
+        Heading('Scientific Profile'),
+        Profile(show_title=True),
+        Spacer('medskip'),
+        # Research entries, minus those that are primarily leadership/trust
+        Heading('Research & Projects'),
+        Events('(academic-researcher OR industrial-scientist) AND NOT leadership AND NOT trust',
+               limit=3, achievements=4),
+        # Fewer achievements for leadership to save space
+        Heading('Leadership & Impact'),
+        Events('leadership OR volunteer OR trust', limit=2, achievements=2, divider='between'),
+    ),
+    sidebar=(
+        Heading('Core Strengths'),
+        Achievements(limit=4, icon='faTrophy'),
+        Heading('Scientific Expertise'),
+        Tags('skills', key='Scientific Expertise'),
+        Divider('medskip'),
+        Heading('Computation & ML'),
+        Tags('skills', key='Machine Learning & Statistics'),
+        Divider('smallskip'),
+        Tags('skills', key='Programming & Computation'),
+        Heading('Education'),
+        Education(show_specialization=True),
+        Heading('Certifications'),
+        Tags('certifications', field='name', limit=4),
+    ),
+)
+
+ACADEMIC_RESEARCHER = VariantSpec(
+    name='academic-researcher',
+    theme=Theme(
+        comment='ACADEMIC RESEARCHER: Stability & Precision (Restored Psychology)',
+        unicode_fonts=(r'\setmainfont{Roboto}', r'\setsansfont{Roboto}', r'\setmonofont{Roboto Mono}'),
+        pdftex_fonts=(r'\usepackage{roboto}', r'\usepackage[T1]{fontenc}'),
+        colors=(
+            ('SlateGrey', '2E2E2E'),
+            ('LightGrey', '666666'),
+            ('SteelBlue', '4682b4'),
+            ('IndustrialGrey', '6c757d'),
+            ('SystemGreen', '059669'),
+        ),
+        roles=(
+            ('name', 'SlateGrey'),
+            ('tagline', 'SteelBlue'),
+            ('heading', 'SteelBlue'),
+            ('headingrule', 'IndustrialGrey'),
+            ('subheading', 'SteelBlue'),
+            ('accent', 'SystemGreen'),
+            ('emphasis', 'SlateGrey'),
+            ('body', 'LightGrey'),
+        ),
+        namefont=r'\Huge\sffamily\bfseries',
+        personalinfofont=r'\footnotesize\ttfamily',
+        cvsectionfont=r'\LARGE\sffamily\bfseries',
+        cvsubsectionfont=r'\large\sffamily\bfseries',
+    ),
+    main=(
+        Heading('Technical Profile'),
+        Profile(),
+        Spacer('medskip'),
+        Heading('Research & Infrastructure'),
+        Events('academic-researcher AND NOT trust', limit=3, achievements=4),
+        Heading('Leadership & Trust'),
+        Events('trust OR leadership', limit=2, achievements=2, divider='between'),
+    ),
+    sidebar=(
+        Heading('Core Competencies'),
+        Achievements(limit=3, icon='faCogs', divider='always'),
+        Heading('Scattering Expertise'),
+        Tags('skills', key='Scientific Expertise'),
+        Divider('smallskip'),
+        Subheading('Computational & ML Stack'),
+        Tags('skills', key='Machine Learning & Statistics'),
+        Divider('smallskip'),
+        Tags('skills', key='Programming & Computation'),
+        Heading('Education'),
+        Education(show_specialization=False),
+        Heading('Certifications'),
+        Tags('certifications', field='name', limit=4),
+    ),
+)
+
+# Variant name -> spec, in the order batch mode generates them
+VARIANTS: Dict[str, VariantSpec] = {
+    spec.name: spec for spec in (INDUSTRIAL_SCIENTIST, ACADEMIC_RESEARCHER)
+}
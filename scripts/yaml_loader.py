@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Fast YAML loading for the CV scripts.
+
+safe_load() uses libyaml's CSafeLoader when PyYAML was built with it and
+falls back to the pure-Python SafeLoader otherwise; both accept the same
+documents.
+
+load_data_dir() additionally keeps a snapshot of the loaded (and validated)
+data directory as a pickle keyed by the SHA-256 of every YAML file plus the
+validator's name and the source files the caller says it depends on (e.g.
+schema.py), so an unchanged data directory skips parsing and validation on
+later runs. The least recently used snapshots are evicted beyond
+DEFAULT_MAX_SNAPSHOTS.
+"""
+
+import os
+import pickle
+import hashlib
+import yaml
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from instrument import count, span
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'yaml'
+DEFAULT_MAX_SNAPSHOTS = 64
+
+def safe_load(stream: Any) -> Any:
+    """yaml.safe_load using the C loader when available."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+@lru_cache(maxsize=None)
+def _validator_tag(validate: Optional[Callable[[Dict[str, Any]], None]], sources: Tuple[Path, ...]) -> bytes:
+    """Identify a validator by name and the source files it depends on (read once per process)."""
+    if validate is None:
+        return b'none'
+    tag = f"{validate.__module__}.{validate.__qualname__}".encode('utf-8')
+    for path in sorted(sources):
+        tag += b'\0' + path.name.encode('utf-8') + b'\0' + path.read_bytes()
+    return tag
+
+def snapshot_key(files: Dict[str, bytes], validate: Optional[Callable[[Dict[str, Any]], None]],
+                 sources: Sequence[Path] = ()) -> str:
+    h = hashlib.sha256(_validator_tag(validate, tuple(sources)))
+    for name in sorted(files):
+        h.update(b'\0' + name.encode('utf-8') + b'\0')
+        h.update(hashlib.sha256(files[name]).digest())
+    return h.hexdigest()
+
+def evict_snapshots(snapshot_dir: Path, max_snapshots: int) -> int:
+    """Remove the least recently used snapshots beyond max_snapshots; return how many."""
+    entries = []
+    for entry in Path(snapshot_dir).glob('*.pickle'):
+        try:
+            entries.append((entry.stat().st_mtime, entry))
+        except FileNotFoundError:
+            continue  # evicted by a concurrent run
+    entries.sort(reverse=True)
+    for _, entry in entries[max_snapshots:]:
+        entry.unlink(missing_ok=True)
+    return max(len(entries) - max_snapshots, 0)
+
+def load_data_dir(data_dir: Path, validate: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  sources: Sequence[Path] = (),
+                  snapshot_dir: Optional[Path] = DEFAULT_SNAPSHOT_DIR,
+                  max_snapshots: Optional[int] = DEFAULT_MAX_SNAPSHOTS) -> Dict[str, Any]:
+    """Load every *.yaml file in data_dir into {stem: data}, then validate it.
+
+    If snapshot_dir is set, a snapshot matching the current file contents
+    (and validator) is returned instead of parsing. sources lists the files
+    the validator's behaviour depends on; editing any of them invalidates
+    the snapshots taken with it. Validation errors are
+    never cached, so invalid data fails the same way on every run. Hits
+    mark a snapshot as recently used; after a new snapshot is written, all
+    but the max_snapshots most recently used are removed (None keeps all).
+    """
+    files = {path.stem: path.read_bytes() for path in Path(data_dir).glob('*.yaml')}
+
+    snapshot = None
+    if snapshot_dir is not None:
+        snapshot = Path(snapshot_dir) / f"{snapshot_key(files, validate, sources)}.pickle"
+        try:
+            with span('yaml.snapshot', dir=str(data_dir)), open(snapshot, 'rb') as f:
+                data = pickle.load(f)
+            count('yaml.snapshot_hits')
+            try:
+                os.utime(snapshot)  # mark as recently used
+            except FileNotFoundError:
+                pass  # evicted after the load
+            return data
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            pass
+
+    with span('yaml.parse', dir=str(data_dir), files=len(files)):
+        data = {stem: safe_load(content) for stem, content in files.items()}
+    if validate is not None:
+        with span('yaml.validate', dir=str(data_dir)):
+            validate(data)
+
+    if snapshot is not None:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp = snapshot.with_name(f".{snapshot.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snapshot)
+        if max_snapshots is not None:
+            evict_snapshots(snapshot.parent, max_snapshots)
+    return data